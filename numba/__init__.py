@@ -93,6 +93,12 @@ from numba.np.ufunc import (vectorize, guvectorize, threading_layer,
                             set_parallel_chunksize, get_parallel_chunksize,
                             get_thread_id)
 
+# Re-export the bulk compilation function
+from numba.core.dispatcher import compile_many
+
+# Re-export the compilation profiler
+from numba.misc.compile_profile import profile_compilation
+
 # Re-export Numpy helpers
 from numba.np.numpy_support import carray, farray, from_dtype
 
@@ -119,6 +125,7 @@ def test(argv, **kwds):
 
 __all__ = """
     cfunc
+    compile_many
     from_dtype
     guvectorize
     jit
@@ -128,6 +135,7 @@ __all__ = """
     jit_module
     typeof
     prange
+    profile_compilation
     gdb
     gdb_breakpoint
     gdb_init
@@ -390,9 +390,19 @@ else                                                            \
 
 #endif
 
+/* Critical sections are only needed on free-threaded builds, where they
+   protect a dispatcher's overload tables and inline cache. */
+#ifndef Py_BEGIN_CRITICAL_SECTION
+#define Py_BEGIN_CRITICAL_SECTION(op) {
+#define Py_END_CRITICAL_SECTION() }
+#endif
+
 typedef std::vector<Type> TypeTable;
 typedef std::vector<PyObject*> Functions;
 
+/* Number of entries of the inline cache of resolved overloads */
+#define INLINE_CACHE_SIZE 4
+
 /* The Dispatcher class is the base class of all dispatchers in the CPU and
    CUDA targets. Its main responsibilities are:
 
@@ -436,6 +446,23 @@ public:
     /* A flattened array of argument types to all overloads
      * (invariant: sizeof(overloads) == argct * sizeof(functions)) */
     TypeTable overloads;
+    /* The vectorcall entry point (PEP 590) */
+    vectorcallfunc vectorcall;
+    /* The inline cache, mapping the argument types of the last resolved
+       calls to the overload called, so that monomorphic and moderately
+       polymorphic call sites skip the overload search.  ic_types holds
+       the argct argument types of each of the ic_size entries, and
+       ic_functions the (borrowed) callables. */
+    TypeTable ic_types;
+    PyObject *ic_functions[INLINE_CACHE_SIZE];
+    int ic_size;
+    /* The entry to replace next when the cache is full */
+    int ic_next;
+    /* The value of can_compile the cached resolutions were made with */
+    char ic_can_compile;
+    /* Inline cache statistics */
+    Py_ssize_t ic_hits;
+    Py_ssize_t ic_misses;
 
     /* Add a new overload. Parameters:
 
@@ -447,6 +474,46 @@ public:
             overloads.push_back(args[i]);
         }
         functions.push_back(callable);
+        /* A new overload may be a better match */
+        clearInlineCache();
+    }
+
+    /* Return the callable cached for the argument types sig, or NULL. */
+    PyObject* lookupInlineCache(Type sig[]) {
+        if (ic_can_compile != can_compile) {
+            /* Resolution rules changed (see Dispatcher_call) */
+            clearInlineCache();
+            ic_can_compile = can_compile;
+        }
+        for (int k = 0; k < ic_size; ++k) {
+            const Type *types = &ic_types[k * argct];
+            int i = 0;
+            while (i < argct && types[i] == sig[i])
+                ++i;
+            if (i == argct) {
+                ++ic_hits;
+                return ic_functions[k];
+            }
+        }
+        ++ic_misses;
+        return NULL;
+    }
+
+    /* Cache the callable resolved for the argument types sig, replacing
+       the oldest entry if the cache is full. */
+    void addInlineCache(Type sig[], PyObject *callable) {
+        int k = ic_next;
+        ic_next = (ic_next + 1) % INLINE_CACHE_SIZE;
+        if (ic_size < INLINE_CACHE_SIZE)
+            ++ic_size;
+        for (int i = 0; i < argct; ++i)
+            ic_types[k * argct + i] = sig[i];
+        ic_functions[k] = callable;
+    }
+
+    void clearInlineCache() {
+        ic_size = 0;
+        ic_next = 0;
     }
 
     /* Given a list of types, find the overloads that have a matching signature.
@@ -491,11 +558,19 @@ public:
     void clear() {
         functions.clear();
         overloads.clear();
+        clearInlineCache();
     }
 
 };
 
 
+static PyObject*
+Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws);
+
+static PyObject*
+Dispatcher_vectorcall(PyObject *callable, PyObject *const *args,
+                      size_t nargsf, PyObject *kwnames);
+
 static int
 Dispatcher_traverse(Dispatcher *self, visitproc visit, void *arg)
 {
@@ -544,13 +619,31 @@ Dispatcher_init(Dispatcher *self, PyObject *args, PyObject *kwds)
     self->fallbackdef = NULL;
     self->has_stararg = has_stararg;
     self->exact_match_required = exact_match_required;
+    self->vectorcall = Dispatcher_vectorcall;
+    self->ic_types.resize(argct * INLINE_CACHE_SIZE);
+    self->ic_size = 0;
+    self->ic_next = 0;
+    self->ic_can_compile = self->can_compile;
+    self->ic_hits = 0;
+    self->ic_misses = 0;
+#if (PY_MAJOR_VERSION == 3) && (PY_MINOR_VERSION < 12)
+    /* Before Python 3.12, the vectorcall flag isn't inherited by classes
+       defined in Python, set it if the subclass doesn't override
+       __call__. */
+    if (!PyType_HasFeature(Py_TYPE(self), Py_TPFLAGS_HAVE_VECTORCALL)
+        && Py_TYPE(self)->tp_call == (ternaryfunc) Dispatcher_call) {
+        Py_TYPE(self)->tp_flags |= Py_TPFLAGS_HAVE_VECTORCALL;
+    }
+#endif
     return 0;
 }
 
 static PyObject *
 Dispatcher_clear(Dispatcher *self, PyObject *args)
 {
+    Py_BEGIN_CRITICAL_SECTION(self);
     self->clear();
+    Py_END_CRITICAL_SECTION();
     Py_RETURN_NONE;
 }
 
@@ -594,12 +687,14 @@ Dispatcher_Insert(Dispatcher *self, PyObject *args, PyObject *kwds)
 
     /* The reference to cfunc is borrowed; this only works because the
        derived Python class also stores an (owned) reference to cfunc. */
+    Py_BEGIN_CRITICAL_SECTION(self);
     self->addDefinition(sig, cfunc);
 
     /* Add pure python fallback */
     if (!self->fallbackdef && objectmode){
         self->fallbackdef = cfunc;
     }
+    Py_END_CRITICAL_SECTION();
 
     delete[] sig;
 
@@ -1293,12 +1388,52 @@ find_named_args(Dispatcher *self, PyObject **pargs, PyObject **pkws)
     return 0;
 }
 
+/* Resolve the definition to call for the argument typecodes *tys*, trying
+   the inline cache first if *use_inline_cache* is true.  The number of
+   matches is returned in *matches*; if there is exactly one, a new
+   reference to the definition is returned, otherwise NULL.
+
+   The lookup runs in the dispatcher's critical section so that it is safe
+   against concurrent insertions on free-threaded builds.  The reference
+   keeps the definition alive if the dispatcher is cleared meanwhile. */
+static PyObject *
+resolve_definition(Dispatcher *self, int *tys, int &matches,
+                   int use_inline_cache, int exact_match_required)
+{
+    PyObject *cfunc = NULL;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    if (use_inline_cache)
+        cfunc = self->lookupInlineCache(tys);
+    if (cfunc != NULL) {
+        matches = 1;
+    }
+    else {
+        /* We only allow unsafe conversions if compilation of new
+           specializations has been disabled. */
+        cfunc = self->resolve(tys, matches, !self->can_compile,
+                              exact_match_required);
+        if (matches == 1 && use_inline_cache)
+            self->addInlineCache(tys, cfunc);
+    }
+    if (matches == 1)
+        Py_INCREF(cfunc);
+    else
+        cfunc = NULL;
+    Py_END_CRITICAL_SECTION();
+    return cfunc;
+}
+
+/* Resolve and call the overload for the given arguments, compiling a new
+   one if needed.  *args* and *kws* must have been folded already, if the
+   dispatcher folds arguments. */
 static PyObject*
-Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
+Dispatcher_dispatch(Dispatcher *self, PyObject *args, PyObject *kws)
 {
     PyObject *tmptype, *retval = NULL;
     int *tys = NULL;
     int argct;
+    int use_inline_cache;
     int i;
     int prealloc[24];
     int matches;
@@ -1317,18 +1452,12 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
 #endif
         locals = PyEval_GetLocals();
         if (locals == NULL) {
-            goto CLEANUP;
-        }
-    }
-    if (self->fold_args) {
-        if (find_named_args(self, &args, &kws))
             return NULL;
+        }
     }
-    else
-        Py_INCREF(args);
-    /* Now we own a reference to args */
 
     argct = PySequence_Fast_GET_SIZE(args);
+    use_inline_cache = argct > 0 && argct == self->argct;
 
     if (argct < (Py_ssize_t) (sizeof(prealloc) / sizeof(int)))
         tys = prealloc;
@@ -1342,19 +1471,16 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
             if (self->can_fallback){
                 /* We will clear the exception if fallback is allowed. */
                 PyErr_Clear();
+                /* Don't cache resolutions involving unknown types */
+                use_inline_cache = 0;
             } else {
                 goto CLEANUP;
             }
         }
     }
 
-    /* We only allow unsafe conversions if compilation of new specializations
-       has been disabled.
-
-       Note that the number of matches is returned in matches by resolve, which
-       accepts it as a reference. */
-    cfunc = self->resolve(tys, matches, !self->can_compile,
-                          exact_match_required);
+    cfunc = resolve_definition(self, tys, matches, use_inline_cache,
+                               exact_match_required);
 
     if (matches == 0 && !self->can_compile) {
         /*
@@ -1368,14 +1494,19 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
             goto CLEANUP;
         }
         if (res > 0) {
-            /* Retry with the newly registered conversions */
-            cfunc = self->resolve(tys, matches, !self->can_compile,
-                                  exact_match_required);
+            /* Retry with the newly registered conversions, which may
+               change the cached resolutions too */
+            Py_BEGIN_CRITICAL_SECTION(self);
+            self->clearInlineCache();
+            Py_END_CRITICAL_SECTION();
+            cfunc = resolve_definition(self, tys, matches, use_inline_cache,
+                                       exact_match_required);
         }
     }
     if (matches == 1) {
         /* Definition is found */
         retval = call_cfunc(self, cfunc, args, kws, locals);
+        Py_DECREF(cfunc);
     } else if (matches == 0) {
         /* No matching definition */
         if (self->can_compile) {
@@ -1400,11 +1531,172 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
 CLEANUP:
     if (tys != prealloc)
         delete[] tys;
+
+    return retval;
+}
+
+static PyObject*
+Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
+{
+    PyObject *retval;
+
+    if (self->fold_args) {
+        if (find_named_args(self, &args, &kws))
+            return NULL;
+    }
+    else
+        Py_INCREF(args);
+    /* Now we own a reference to args */
+
+    retval = Dispatcher_dispatch(self, args, kws);
     Py_DECREF(args);
+    return retval;
+}
 
+/* The vectorcall (PEP 590) entry point.  When all the parameters are passed
+   positionally, the arguments tuple is built directly from the argument
+   array, which saves the intermediate tuple and the folding of
+   Dispatcher_call. */
+static PyObject*
+Dispatcher_vectorcall(PyObject *callable, PyObject *const *args,
+                      size_t nargsf, PyObject *kwnames)
+{
+    Dispatcher *self = (Dispatcher *) callable;
+    Py_ssize_t nargs = PyVectorcall_NARGS(nargsf);
+    Py_ssize_t nkwargs = (kwnames == NULL) ? 0 : PyTuple_GET_SIZE(kwnames);
+    Py_ssize_t func_args = PyTuple_GET_SIZE(self->argnames);
+    Py_ssize_t defaults = PyTuple_GET_SIZE(self->defargs);
+    PyObject *argtuple, *kws = NULL, *retval;
+    Py_ssize_t i;
+
+    if (nkwargs == 0 && self->fold_args && !self->has_stararg
+        && nargs <= func_args && nargs >= func_args - defaults) {
+        /* Only positional arguments, possibly followed by default values:
+           fold them directly */
+        argtuple = PyTuple_New(func_args);
+        if (argtuple == NULL)
+            return NULL;
+        for (i = 0; i < nargs; i++) {
+            Py_INCREF(args[i]);
+            PyTuple_SET_ITEM(argtuple, i, args[i]);
+        }
+        for (; i < func_args; i++) {
+            PyObject *value = PyTuple_GET_ITEM(self->defargs,
+                                               i - (func_args - defaults));
+            Py_INCREF(value);
+            PyTuple_SET_ITEM(argtuple, i, value);
+        }
+        retval = Dispatcher_dispatch(self, argtuple, NULL);
+        Py_DECREF(argtuple);
+        return retval;
+    }
+
+    argtuple = PyTuple_New(nargs);
+    if (argtuple == NULL)
+        return NULL;
+    for (i = 0; i < nargs; i++) {
+        Py_INCREF(args[i]);
+        PyTuple_SET_ITEM(argtuple, i, args[i]);
+    }
+    if (nkwargs) {
+        kws = PyDict_New();
+        if (kws == NULL) {
+            Py_DECREF(argtuple);
+            return NULL;
+        }
+        for (i = 0; i < nkwargs; i++) {
+            if (PyDict_SetItem(kws, PyTuple_GET_ITEM(kwnames, i),
+                               args[nargs + i])) {
+                Py_DECREF(argtuple);
+                Py_DECREF(kws);
+                return NULL;
+            }
+        }
+    }
+    retval = Dispatcher_call(self, argtuple, kws);
+    Py_DECREF(argtuple);
+    Py_XDECREF(kws);
     return retval;
 }
 
+/* Call the dispatcher with each tuple of arguments of an iterable, and
+   return the list of results, or store them into the given output
+   sequence.  This saves the interpreter loop and the call protocol for
+   each call. */
+static PyObject*
+Dispatcher_starmap(Dispatcher *self, PyObject *args)
+{
+    PyObject *iterable, *out = Py_None;
+    PyObject *iter, *item, *argtuple, *res, *results = NULL;
+    Py_ssize_t i = 0, outlen = 0;
+
+    if (!PyArg_ParseTuple(args, "O|O", &iterable, &out))
+        return NULL;
+    if (out != Py_None) {
+        outlen = PyObject_Length(out);
+        if (outlen < 0)
+            return NULL;
+    }
+    iter = PyObject_GetIter(iterable);
+    if (iter == NULL)
+        return NULL;
+    if (out == Py_None) {
+        results = PyList_New(0);
+        if (results == NULL)
+            goto FAIL;
+    }
+    while ((item = PyIter_Next(iter)) != NULL) {
+        argtuple = PySequence_Tuple(item);
+        Py_DECREF(item);
+        if (argtuple == NULL)
+            goto FAIL;
+        if (self->fold_args && !self->has_stararg
+            && PyTuple_GET_SIZE(argtuple) == PyTuple_GET_SIZE(self->argnames))
+            /* Nothing to fold */
+            res = Dispatcher_dispatch(self, argtuple, NULL);
+        else
+            res = Dispatcher_call(self, argtuple, NULL);
+        Py_DECREF(argtuple);
+        if (res == NULL)
+            goto FAIL;
+        if (results != NULL) {
+            if (PyList_Append(results, res)) {
+                Py_DECREF(res);
+                goto FAIL;
+            }
+        }
+        else if (i >= outlen) {
+            Py_DECREF(res);
+            PyErr_Format(PyExc_ValueError,
+                         "more results than the output length %zd", outlen);
+            goto FAIL;
+        }
+        else if (PySequence_SetItem(out, i, res)) {
+            Py_DECREF(res);
+            goto FAIL;
+        }
+        Py_DECREF(res);
+        i++;
+    }
+    if (PyErr_Occurred())
+        goto FAIL;
+    Py_DECREF(iter);
+    if (results != NULL)
+        return results;
+    if (i != outlen) {
+        PyErr_Format(PyExc_ValueError,
+                     "%zd results for an output of length %zd", i, outlen);
+        return NULL;
+    }
+    Py_INCREF(out);
+    return out;
+
+FAIL:
+    Py_DECREF(iter);
+    Py_XDECREF(results);
+    return NULL;
+}
+
 /* Based on Dispatcher_call above, with the following differences:
    1. It does not invoke the definition of the function.
    2. It returns the definition, instead of a value returned by the function.
@@ -1466,10 +1758,7 @@ Dispatcher_cuda_call(Dispatcher *self, PyObject *args, PyObject *kws)
         }
     }
 
-    /* We only allow unsafe conversions if compilation of new specializations
-       has been disabled. */
-    cfunc = self->resolve(tys, matches, !self->can_compile,
-                          exact_match_required);
+    cfunc = resolve_definition(self, tys, matches, 0, exact_match_required);
 
     if (matches == 0 && !self->can_compile) {
         /*
@@ -1484,15 +1773,14 @@ Dispatcher_cuda_call(Dispatcher *self, PyObject *args, PyObject *kws)
         }
         if (res > 0) {
             /* Retry with the newly registered conversions */
-            cfunc = self->resolve(tys, matches, !self->can_compile,
-                                  exact_match_required);
+            cfunc = resolve_definition(self, tys, matches, 0,
+                                       exact_match_required);
         }
     }
 
     if (matches == 1) {
-        /* Definition is found */
+        /* Definition is found; we already own a reference to it */
         retval = cfunc;
-        Py_INCREF(retval);
     } else if (matches == 0) {
         /* No matching definition */
         if (self->can_compile) {
@@ -1545,12 +1833,16 @@ static PyMethodDef Dispatcher_methods[] = {
       "insert new definition"},
     { "_cuda_call", (PyCFunction)Dispatcher_cuda_call,
       METH_VARARGS | METH_KEYWORDS, "CUDA call resolution" },
+    { "_starmap", (PyCFunction)Dispatcher_starmap, METH_VARARGS,
+      "call with each tuple of arguments of an iterable" },
     { NULL },
 };
 
 static PyMemberDef Dispatcher_members[] = {
     {(char*)"_can_compile", T_BOOL, offsetof(Dispatcher, can_compile), 0, NULL },
     {(char*)"_enable_sysmon", T_BOOL, offsetof(Dispatcher, enable_sysmon), 0, NULL },
+    {(char*)"_inline_cache_hits", T_PYSSIZET, offsetof(Dispatcher, ic_hits), READONLY, NULL },
+    {(char*)"_inline_cache_misses", T_PYSSIZET, offsetof(Dispatcher, ic_misses), READONLY, NULL },
     {NULL}  /* Sentinel */
 };
 
@@ -1561,7 +1853,7 @@ static PyTypeObject DispatcherType = {
     sizeof(Dispatcher),                          /* tp_basicsize */
     0,                                           /* tp_itemsize */
     (destructor)Dispatcher_dealloc,              /* tp_dealloc */
-    0,                                           /* tp_vectorcall_offset */
+    offsetof(Dispatcher, vectorcall),            /* tp_vectorcall_offset */
     0,                                           /* tp_getattr */
     0,                                           /* tp_setattr */
     0,                                           /* tp_as_async */
@@ -1575,7 +1867,8 @@ static PyTypeObject DispatcherType = {
     0,                                           /* tp_getattro*/
     0,                                           /* tp_setattro*/
     0,                                           /* tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /* tp_flags*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC
+        | Py_TPFLAGS_HAVE_VECTORCALL,            /* tp_flags*/
     "Dispatcher object",                         /* tp_doc */
     (traverseproc) Dispatcher_traverse,          /* tp_traverse */
     0,                                           /* tp_clear */
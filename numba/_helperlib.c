@@ -374,8 +374,18 @@ numba_adapt_buffer(Py_buffer *buf, arystruct_t *arystruct)
         *p = buf->shape[i];
         arystruct->nitems *= buf->shape[i];
     }
-    for (i = 0; i < buf->ndim; i++, p++) {
-        *p = buf->strides[i];
+    if (buf->strides != NULL) {
+        for (i = 0; i < buf->ndim; i++, p++) {
+            *p = buf->strides[i];
+        }
+    }
+    else {
+        /* The exporter may omit the strides of a C-contiguous buffer */
+        npy_intp stride = buf->itemsize;
+        for (i = buf->ndim - 1; i >= 0; i--) {
+            p[i] = stride;
+            stride *= buf->shape[i];
+        }
     }
     arystruct->meminfo = NULL;
 }
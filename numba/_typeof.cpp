@@ -576,9 +576,21 @@ int typecode_fallback_keep_ref(PyObject *dispatcher, PyObject *val) {
 }
 
 
-/* A cache mapping fingerprints (string_writer_t *) to typecodes (int). */
+/* A cache mapping fingerprints (string_writer_t *) to typecodes (int).
+ * On free-threaded builds, it is protected by fingerprint_lock; the lock
+ * is never held while calling into Python.
+ */
 static _Numba_hashtable_t *fingerprint_hashtable = NULL;
 
+#ifdef Py_GIL_DISABLED
+static PyMutex fingerprint_lock = {0};
+#define FINGERPRINT_LOCK() PyMutex_Lock(&fingerprint_lock)
+#define FINGERPRINT_UNLOCK() PyMutex_Unlock(&fingerprint_lock)
+#else
+#define FINGERPRINT_LOCK()
+#define FINGERPRINT_UNLOCK()
+#endif
+
 static Py_uhash_t
 hash_writer(const void *key)
 {
@@ -615,7 +627,7 @@ compare_writer(const void *key, const _Numba_hashtable_entry_t *entry)
 static int
 typecode_using_fingerprint(PyObject *dispatcher, PyObject *val)
 {
-    int typecode;
+    int typecode, found, err;
     string_writer_t w;
 
     string_writer_init(&w);
@@ -630,7 +642,10 @@ typecode_using_fingerprint(PyObject *dispatcher, PyObject *val)
         }
         return -1;
     }
-    if (_Numba_HASHTABLE_GET(fingerprint_hashtable, &w, typecode) > 0) {
+    FINGERPRINT_LOCK();
+    found = _Numba_HASHTABLE_GET(fingerprint_hashtable, &w, typecode);
+    FINGERPRINT_UNLOCK();
+    if (found > 0) {
         /* Cache hit */
         string_writer_clear(&w);
         return typecode;
@@ -642,6 +657,7 @@ typecode_using_fingerprint(PyObject *dispatcher, PyObject *val)
      */
     typecode = typecode_fallback_keep_ref(dispatcher, val);
     if (typecode >= 0) {
+        int cached;
         string_writer_t *key = (string_writer_t *) malloc(sizeof(string_writer_t));
         if (key == NULL) {
             string_writer_clear(&w);
@@ -652,8 +668,21 @@ typecode_using_fingerprint(PyObject *dispatcher, PyObject *val)
          * to the hash table.
          */
         string_writer_move(key, &w);
-        if (_Numba_HASHTABLE_SET(fingerprint_hashtable, key, typecode)) {
-            string_writer_clear(&w);
+        FINGERPRINT_LOCK();
+        /* Another thread may have cached the same fingerprint while
+         * typeof() was running. */
+        found = _Numba_HASHTABLE_GET(fingerprint_hashtable, key, cached);
+        err = found ? 0 : _Numba_HASHTABLE_SET(fingerprint_hashtable, key,
+                                               typecode);
+        FINGERPRINT_UNLOCK();
+        if (found) {
+            string_writer_clear(key);
+            free(key);
+            return cached;
+        }
+        if (err) {
+            string_writer_clear(key);
+            free(key);
             PyErr_NoMemory();
             return -1;
         }
@@ -4,6 +4,12 @@
 #ifndef NUMBA_DICT_COMMON_H
 #define NUMBA_DICT_COMMON_H
 
+/* Thread safety: a dict has no lock of its own.  Iterators hand out
+ * pointers into the entry table, which a concurrent insertion may
+ * reallocate.  Callers must not mutate a dict while another thread accesses
+ * it; concurrent readers are fine.
+ */
+
 typedef struct {
     /* Uses Py_ssize_t instead of Py_hash_t to guarantee word size alignment */
     Py_ssize_t  hash;
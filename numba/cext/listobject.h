@@ -14,6 +14,13 @@
 #ifndef NUMBA_LIST_H
 #define NUMBA_LIST_H
 
+/* Thread safety: a list has no lock of its own.  Compiled code reads items
+ * and the size directly (see numba_list_base_ptr() and
+ * numba_list_size_address()), so a lock here could not protect those reads
+ * against a concurrent resize.  Callers must not mutate a list while another
+ * thread accesses it; concurrent readers are fine.
+ */
+
 #include "cext.h"
 
 typedef void (*list_refcount_op_t)(const void*);
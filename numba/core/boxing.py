@@ -435,7 +435,10 @@ def box_array(typ, val, c):
     if c.context.enable_nrt:
         np_dtype = numpy_support.as_dtype(typ.dtype)
         dtypeptr = c.env_manager.read_const(c.env_manager.add_const(np_dtype))
-        newary = c.pyapi.nrt_adapt_ndarray_to_python(typ, val, dtypeptr)
+        pytypeptr = c.env_manager.read_const(
+            c.env_manager.add_const(typ.box_type))
+        newary = c.pyapi.nrt_adapt_ndarray_to_python(typ, val, dtypeptr,
+                                                     pytypeptr)
         # Steals NRT ref
         c.context.nrt.decref(c.builder, typ, val)
         return newary
@@ -471,6 +474,24 @@ def unbox_buffer(typ, obj, c):
     return NativeValue(c.builder.load(aryptr), is_error=is_error,
                        cleanup=cleanup)
 
+
+@box(types.Buffer)
+def box_buffer(typ, val, c):
+    """
+    Convert a native buffer structure to a memoryview sharing its memory.
+    """
+    layout = typ.layout if typ.layout in 'CF' else 'A'
+    arrty = types.Array(typ.dtype, typ.ndim, layout,
+                        readonly=not typ.mutable)
+    # The array keeps the memory alive, see NRT_adapt_buffer_from_python()
+    aryobj = box_array(arrty, val, c)
+    res = cgutils.alloca_once_value(c.builder, c.pyapi.get_null_object())
+    with c.pyapi.if_object_ok(aryobj):
+        c.builder.store(c.pyapi.memoryview_from_object(aryobj), res)
+        c.pyapi.decref(aryobj)
+    return c.builder.load(res)
+
+
 @unbox(types.Array)
 def unbox_array(typ, obj, c):
     """
@@ -674,7 +695,24 @@ def _python_list_to_native(typ, obj, c, size, listptr, errorptr):
     """
     Construct a new native list from a Python list.
     """
-    def check_element_type(nth, itemobj, expected_typobj):
+    # The Numba type of these scalars only depends on their Python type
+    # (out-of-range integers fail unboxing instead), so the costly typeof()
+    # call can be skipped for items of the same Python type as the first.
+    skip_same_pytype = typ.dtype in (types.boolean, types.int64,
+                                     types.float64, types.complex128)
+
+    def check_element_type(nth, itemobj, expected_typobj, expected_pytype):
+        if skip_same_pytype:
+            pytype = c.pyapi.get_type(itemobj)
+            same_pytype = c.builder.icmp_unsigned('==', pytype,
+                                                  expected_pytype)
+            with c.builder.if_then(c.builder.not_(same_pytype),
+                                   likely=False):
+                _check_element_typeof(nth, itemobj, expected_typobj)
+        else:
+            _check_element_typeof(nth, itemobj, expected_typobj)
+
+    def _check_element_typeof(nth, itemobj, expected_typobj):
         typobj = nth.typeof(itemobj)
         # Check if *typobj* is NULL
         with c.builder.if_then(
@@ -708,10 +746,13 @@ def _python_list_to_native(typ, obj, c, size, listptr, errorptr):
                 # Traverse Python list and unbox objects into native list
                 with _NumbaTypeHelper(c) as nth:
                     # Note: *expected_typobj* can't be NULL
-                    expected_typobj = nth.typeof(c.pyapi.list_getitem(obj, zero))
+                    firstobj = c.pyapi.list_getitem(obj, zero)
+                    expected_typobj = nth.typeof(firstobj)
+                    expected_pytype = c.pyapi.get_type(firstobj)
                     with cgutils.for_range(c.builder, size) as loop:
                         itemobj = c.pyapi.list_getitem(obj, loop.index)
-                        check_element_type(nth, itemobj, expected_typobj)
+                        check_element_type(nth, itemobj, expected_typobj,
+                                           expected_pytype)
                         # XXX we don't call native cleanup for each
                         # list element, since that would require keeping
                         # of which unboxings have been successful.
@@ -4,17 +4,27 @@ Caching mechanism for compiled functions.
 
 
 from abc import ABCMeta, abstractmethod
+import ast
+import atexit
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
 import errno
 import hashlib
 import importlib
 import inspect
 import itertools
+import json
 from math import floor
+import mmap
 import os
 import pickle
+import struct
 import sys
 import tempfile
+import threading
+import time
+import types as pytypes
 import uuid
 import warnings
 
@@ -22,12 +32,18 @@ from numba.misc.appdirs import AppDirs
 import zipfile
 from pathlib import Path
 
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
 import numba
 from numba.core.errors import NumbaWarning
 from numba.core.base import BaseContext
 from numba.core.codegen import CodeLibrary
 from numba.core.compiler import CompileResult
-from numba.core import config, compiler
+from numba.core import config, compiler, sigutils, types
+from numba.core.compiler_lock import global_compiler_lock
 from numba.core.serialize import dumps
 
 
@@ -37,6 +53,39 @@ def _cache_log(msg, *args):
         print(msg)
 
 
+def _mark_used(path, mtime_ns):
+    """
+    Record an access to the cache file *path* for the LRU eviction of the
+    cache, preserving its modification time *mtime_ns*.
+    """
+    try:
+        os.utime(path, ns=(time.time_ns(), mtime_ns))
+    except OSError:
+        # e.g. a read-only cache directory
+        pass
+
+
+@contextlib.contextmanager
+def _open_for_write(filepath):
+    """
+    Open *filepath* for writing in a race condition-free way (hopefully).
+    uuid4 is used to try and avoid name collisions on a shared filesystem.
+    """
+    uid = uuid.uuid4().hex[:16]  # avoid long paths
+    tmpname = '%s.tmp.%s' % (filepath, uid)
+    try:
+        with open(tmpname, "wb") as f:
+            yield f
+        os.replace(tmpname, filepath)
+    except Exception:
+        # In case of error, remove dangling tmp file
+        try:
+            os.unlink(tmpname)
+        except OSError:
+            pass
+        raise
+
+
 class _Cache(metaclass=ABCMeta):
 
     @property
@@ -105,6 +154,10 @@ class _CacheLocator(metaclass=ABCMeta):
     A filesystem locator for caching a given function.
     """
 
+    # Whether the source stamp must be computed on first use of the cache
+    # rather than when the function is decorated.
+    defer_source_stamp = False
+
     def ensure_cache_path(self):
         path = self.get_cache_path()
         os.makedirs(path, exist_ok=True)
@@ -365,6 +418,142 @@ class ZipCacheLocator(_SourceFileBackedLocatorMixin, _CacheLocator):
             return None
         return cls(py_func, py_file)
 
+
+def _const_repr(const):
+    # The iteration order of sets of strings depends on hash randomization
+    if isinstance(const, (set, frozenset)):
+        return 'frozenset(%s)' % sorted(map(_const_repr, const))
+    if isinstance(const, (tuple, list)):
+        return '(%s)' % ', '.join(map(_const_repr, const))
+    if isinstance(const, dict):
+        return '{%s}' % ', '.join(sorted('%s: %s' % (_const_repr(k),
+                                                     _const_repr(v))
+                                         for k, v in const.items()))
+    return repr(const)
+
+
+def _hash_function_content(py_func, strict=False):
+    """
+    Return a hash of the code of *py_func*, of its closure variables and
+    default arguments, and of the globals it refers to.  Referenced Python
+    and jitted functions are hashed transitively, including the jitted
+    functions accessed as attributes of referenced modules.  The target
+    options of jitted functions (e.g. ``error_model`` or ``fastmath``) are
+    hashed along with their code.
+
+    Values which can't be pickled are hashed by type, unless *strict* is
+    true, in which case ValueError is raised.
+    """
+    hasher = hashlib.sha256()
+    seen = set()
+
+    def update(*parts):
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8')
+            hasher.update(part)
+            hasher.update(b'\0')
+
+    def visit_value(value):
+        func = getattr(value, 'py_func', value)
+        if isinstance(func, pytypes.FunctionType):
+            options = getattr(value, 'targetoptions', None)
+            if isinstance(options, dict):
+                update('targetoptions', _const_repr(options))
+            visit_function(func)
+        elif isinstance(value, pytypes.ModuleType):
+            update('module', value.__name__)
+        elif isinstance(value, type):
+            update('type', value.__module__, value.__qualname__)
+        elif isinstance(value, (set, frozenset)):
+            update(_const_repr(frozenset(value)))
+        else:
+            try:
+                update(dumps(value))
+            except Exception:
+                if strict:
+                    raise ValueError("cannot hash %r by content" % (value,))
+                update('object', type(value).__qualname__)
+
+    def visit_code(code, func_globals):
+        update(code.co_code, repr(code.co_names), repr(code.co_varnames))
+        for const in code.co_consts:
+            if isinstance(const, pytypes.CodeType):
+                visit_code(const, func_globals)
+            else:
+                update(_const_repr(const))
+        modules = []
+        for name in code.co_names:
+            if name in func_globals:
+                update('global', name)
+                value = func_globals[name]
+                visit_value(value)
+                if isinstance(value, pytypes.ModuleType):
+                    modules.append(value)
+        for mod in modules:
+            for name in code.co_names:
+                value = vars(mod).get(name)
+                func = getattr(value, 'py_func', None)
+                if isinstance(func, pytypes.FunctionType):
+                    update('attribute', mod.__name__, name)
+                    visit_value(value)
+
+    def visit_function(func):
+        if func in seen:
+            update('seen', func.__module__, func.__qualname__)
+            return
+        seen.add(func)
+        update('function', func.__module__, func.__qualname__)
+        visit_code(func.__code__, func.__globals__)
+        for cell in func.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                # Empty cell
+                continue
+            visit_value(contents)
+        for default in func.__defaults__ or ():
+            visit_value(default)
+
+    visit_function(py_func)
+    return hasher.hexdigest()
+
+
+class _ContentHashLocatorMixin(object):
+    """
+    A cache locator mixin keying the freshness of the cache on a hash of the
+    function's content (bytecode, closure variables, referenced globals and
+    transitively called functions) instead of the source file's timestamp.
+    The cache then survives a rewrite of the source file with identical
+    content (e.g. a checkout or an image rebuild) and can be shared between
+    hosts.
+    """
+
+    # Globals, and functions called, may be defined after the function
+    defer_source_stamp = True
+
+    def __init__(self, py_func, py_file):
+        super(_ContentHashLocatorMixin, self).__init__(py_func, py_file)
+        self._py_func = py_func
+
+    def get_source_stamp(self):
+        return _hash_function_content(self._py_func)
+
+
+class InTreeContentHashCacheLocator(_ContentHashLocatorMixin,
+                                    InTreeCacheLocator):
+    """
+    Like InTreeCacheLocator, but keyed on the content of the function.
+    """
+
+
+class UserProvidedContentHashCacheLocator(_ContentHashLocatorMixin,
+                                          UserProvidedCacheLocator):
+    """
+    Like UserProvidedCacheLocator, but keyed on the content of the function.
+    """
+
+
 class CacheImpl(metaclass=ABCMeta):
     """
     Provides the core machinery for caching.
@@ -423,6 +612,13 @@ class CacheImpl(metaclass=ABCMeta):
             raise RuntimeError("cannot cache function %r: no locator available "
                                "for file %r" % (qualname, source_path))
         self._locator = locator
+        # The shared tier uses the same layout as UserProvidedCacheLocator
+        if config.CACHE_SHARED_DIR:
+            cache_subpath = locator.get_suitable_cache_subpath(source_path)
+            self._shared_cache_path = os.path.join(config.CACHE_SHARED_DIR,
+                                                   cache_subpath)
+        else:
+            self._shared_cache_path = None
         # Use filename base name as module name to avoid conflict between
         # foo/__init__.py and foo/foo.py
         filename = inspect.getfile(py_func)
@@ -430,6 +626,11 @@ class CacheImpl(metaclass=ABCMeta):
         fullname = "%s.%s" % (modname, qualname)
         abiflags = getattr(sys, 'abiflags', '')
         self._filename_base = self.get_filename_base(fullname, abiflags)
+        # All functions of a module share a single archive, if enabled
+        self._archive_name = '%s.py%d%d%s.nba' % (modname,
+                                                  sys.version_info[0],
+                                                  sys.version_info[1],
+                                                  abiflags)
 
     def get_filename_base(self, fullname, abiflags):
         # '<' and '>' can appear in the qualname (e.g. '<locals>') but
@@ -443,10 +644,36 @@ class CacheImpl(metaclass=ABCMeta):
     def filename_base(self):
         return self._filename_base
 
+    def make_cache_file(self, cache_path, source_stamp):
+        """
+        Create the object implementing the on-disk format of the cache, as
+        selected by the NUMBA_CACHE_FORMAT env variable.
+        """
+        cache_format = config.CACHE_FORMAT
+        if cache_format == 'index':
+            return IndexDataCacheFile(cache_path=cache_path,
+                                      filename_base=self._filename_base,
+                                      source_stamp=source_stamp)
+        elif cache_format == 'archive':
+            return ArchiveCacheFile(cache_path=cache_path,
+                                    filename_base=self._filename_base,
+                                    archive_name=self._archive_name,
+                                    source_stamp=source_stamp)
+        else:
+            raise RuntimeError(f"Unknown cache format: '{cache_format}' "
+                               "specified via NUMBA_CACHE_FORMAT env variable")
+
     @property
     def locator(self):
         return self._locator
 
+    @property
+    def shared_cache_path(self):
+        """
+        The directory of the read-only shared cache tier, or None.
+        """
+        return self._shared_cache_path
+
     @abstractmethod
     def reduce(self, data):
         "Returns the serialized form the data"
@@ -564,6 +791,12 @@ class IndexDataCacheFile(object):
             self._save_index(overloads)
         self._save_data(data_name, data)
 
+    def keys(self):
+        """
+        Return the keys of the fresh entries in the cache.
+        """
+        return list(self._load_index())
+
     def load(self, key):
         """
         Load a cache entry with *key*.
@@ -615,6 +848,7 @@ class IndexDataCacheFile(object):
         path = self._data_path(name)
         with open(path, "rb") as f:
             data = f.read()
+            _mark_used(path, os.fstat(f.fileno()).st_mtime_ns)
         tup = pickle.loads(data)
         _cache_log("[cache] data loaded from %r", path)
         return tup
@@ -635,25 +869,361 @@ class IndexDataCacheFile(object):
     def _dump(self, obj):
         return dumps(obj)
 
-    @contextlib.contextmanager
     def _open_for_write(self, filepath):
+        return _open_for_write(filepath)
+
+
+_ARCHIVE_MAGIC = b'NUMBAAR2'
+# magic, offset of the latest table of contents record
+_ARCHIVE_HEADER = struct.Struct('<8sQ')
+# offset of the previous table of contents record (0 for none), size of the
+# pickled version, size of the pickled table of contents
+_ARCHIVE_RECORD = struct.Struct('<QQQ')
+
+# Opened archives, shared by all the functions of a module
+_archive_readers = {}
+_archive_lock = threading.RLock()
+
+
+@contextlib.contextmanager
+def _archive_file_lock(path):
+    """
+    Hold an exclusive lock on the archive at *path*, shared with the other
+    processes through the file "<path>.lock", while the archive is updated.
+    Reading the archive doesn't need the lock.
+    """
+    with open(path + '.lock', 'wb') as f:
+        if os.name == 'nt':
+            # LK_LOCK blocks, retrying once per second, and gives up with
+            # EDEADLOCK after 10 attempts: try again then
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    if e.errno != errno.EDEADLOCK:
+                        raise
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _write_toc_record(f, prev_offset, version, toc):
+    """
+    Write to *f* a table of contents record chained to the record at
+    *prev_offset*.
+    """
+    version_data = pickle.dumps(version, protocol=-1)
+    data = dumps(toc)
+    f.write(_ARCHIVE_RECORD.pack(prev_offset, len(version_data), len(data)))
+    f.write(version_data)
+    f.write(data)
+
+
+def _write_archive(path, version, contents):
+    """
+    Write a new archive at *path* with the *contents*, a dictionary mapping
+    each function's filename base to its source stamp and to a dictionary
+    of its entries' data.
+    """
+    toc = {}
+    with _open_for_write(path) as f:
+        f.write(_ARCHIVE_HEADER.pack(_ARCHIVE_MAGIC, 0))
+        for filename_base, (stamp, entries) in contents.items():
+            locations = {}
+            for key, data in entries.items():
+                locations[key] = (f.tell(), len(data))
+                f.write(data)
+            toc[filename_base] = (stamp, locations)
+        toc_offset = f.tell()
+        _write_toc_record(f, 0, version, toc)
+        f.seek(0)
+        f.write(_ARCHIVE_HEADER.pack(_ARCHIVE_MAGIC, toc_offset))
+    _cache_log("[cache] archive saved to %r", path)
+
+
+def _compact_archive(path, version):
+    """
+    Rewrite the archive at *path* without the data and the table of
+    contents records that were superseded by later updates.  Return whether
+    the archive was rewritten.
+    """
+    with _archive_lock, _archive_file_lock(path):
+        reader = _ArchiveReader.open(path, version)
+        if reader.depth <= 1:
+            return False
+        _write_archive(path, version, reader.contents())
+        return True
+
+
+class _ArchiveReader(object):
+    """
+    A read-only view of a cache archive.  The table of contents is loaded
+    eagerly, the entries are only unpickled when requested.
+
+    Updates are appended to the archive, each with a table of contents
+    record holding the new entries of one function and chained to the
+    previous record.  The header points to the latest record, it is only
+    rewritten once the record is complete.
+    """
+    def __init__(self, stat_key=None, buf=b'', toc=None, toc_offset=0,
+                 depth=0):
+        self.stat_key = stat_key
+        self._buf = buf
+        self.toc = toc if toc is not None else {}
+        # Offset of the latest table of contents record (0 if the archive
+        # is missing or unusable) and length of the chain of records
+        self.toc_offset = toc_offset
+        self.depth = depth
+
+    @classmethod
+    def open(cls, path, version, current=None):
         """
-        Open *filepath* for writing in a race condition-free way (hopefully).
-        uuid4 is used to try and avoid name collisions on a shared filesystem.
+        Open the archive at *path*, reusing *current* if the archive didn't
+        change since it was opened, or only reading the table of contents
+        records appended since then.
         """
-        uid = uuid.uuid4().hex[:16]  # avoid long paths
-        tmpname = '%s.tmp.%s' % (filepath, uid)
         try:
-            with open(tmpname, "wb") as f:
-                yield f
-            os.replace(tmpname, filepath)
-        except Exception:
-            # In case of error, remove dangling tmp file
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return cls()
+        with f:
+            st = os.fstat(f.fileno())
+            stat_key = st.st_ino, st.st_size, st.st_mtime_ns
+            header = f.read(_ARCHIVE_HEADER.size)
+            if len(header) < _ARCHIVE_HEADER.size:
+                return cls(stat_key)
+            magic, toc_offset = _ARCHIVE_HEADER.unpack(header)
+            if magic != _ARCHIVE_MAGIC:
+                return cls(stat_key)
+            # The header is checked as well, the modification time may be
+            # too coarse to tell updates apart.
+            if (current is not None and current.stat_key == stat_key and
+                    current.toc_offset == toc_offset):
+                return current
+            if os.name == 'nt':
+                # A mapped file cannot be replaced on Windows
+                f.seek(0)
+                buf = f.read()
+            else:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        base = None
+        if (current is not None and current.toc_offset and
+                current.stat_key[0] == st.st_ino and
+                current.size <= len(buf) and
+                current.read(current.toc_offset, _ARCHIVE_RECORD.size) ==
+                buf[current.toc_offset:
+                    current.toc_offset + _ARCHIVE_RECORD.size]):
+            # The archive was appended to, the records of *current* are
+            # still there.
+            base = current
+        try:
             try:
-                os.unlink(tmpname)
-            except OSError:
-                pass
-            raise
+                toc, depth = cls._load_toc(buf, toc_offset, version,
+                                           base.toc_offset if base else 0)
+            except Exception:
+                if base is None:
+                    raise
+                # Not an extension of *current* after all
+                base = None
+                toc, depth = cls._load_toc(buf, toc_offset, version)
+        except Exception:
+            # A damaged archive, e.g. by a crash while it was written
+            _cache_log("[cache] archive %r is damaged", path)
+            return cls(stat_key)
+        if toc is None:
+            return cls(stat_key)
+        if base is not None:
+            toc = {**base.toc, **toc}
+            depth += base.depth
+        # Drop the functions whose entries were all flushed
+        toc = {k: v for k, v in toc.items() if v[1]}
+        _cache_log("[cache] archive loaded from %r", path)
+        return cls(stat_key, buf, toc, toc_offset, depth)
+
+    @staticmethod
+    def _load_toc(buf, offset, version, stop_offset=0):
+        """
+        Merge the chain of table of contents records from *offset* back to
+        *stop_offset* (excluded), the latest record of each function taking
+        precedence.  Return the merged records and their number, or
+        (None, 0) if the archive was written by another version.
+        """
+        toc = {}
+        depth = 0
+        while offset != stop_offset:
+            prev_offset, version_size, size = \
+                _ARCHIVE_RECORD.unpack_from(buf, offset)
+            start = offset + _ARCHIVE_RECORD.size
+            if pickle.loads(buf[start:start + version_size]) != version:
+                # This is another version.  Avoid trying to unpickling the
+                # rest of the records, as that may fail.
+                return None, 0
+            start += version_size
+            for filename_base, item in pickle.loads(
+                    buf[start:start + size]).items():
+                toc.setdefault(filename_base, item)
+            if prev_offset >= offset or prev_offset < stop_offset:
+                raise ValueError("invalid archive record offset")
+            offset = prev_offset
+            depth += 1
+        return toc, depth
+
+    @property
+    def size(self):
+        return self.stat_key[1] if self.stat_key is not None else 0
+
+    def live_size(self):
+        """
+        Return the size of the entries referred to by the table of contents.
+        """
+        return sum(size for _, entries in self.toc.values()
+                   for _, size in entries.values())
+
+    def needs_compaction(self):
+        """
+        Whether the archive should be rewritten rather than appended to:
+        its chain of table of contents records is long compared to its
+        number of functions, which slows down opening it, or most of it is
+        superseded data.  As the archive grows geometrically between
+        compactions, the total amount of data written stays linear in its
+        size.
+        """
+        live = self.live_size()
+        return (self.depth > len(self.toc) // 4 + 16
+                or self.size - live > max(live, 1 << 20))
+
+    def contents(self):
+        """
+        Return the data of all the entries, in the form taken by
+        ``_write_archive()``.
+        """
+        return {filename_base: (stamp, {key: self.read(*loc)
+                                        for key, loc in entries.items()})
+                for filename_base, (stamp, entries) in self.toc.items()}
+
+    def read(self, offset, size):
+        return self._buf[offset:offset + size]
+
+    def load(self, offset, size):
+        return pickle.loads(self.read(offset, size))
+
+
+class ArchiveCacheFile(IndexDataCacheFile):
+    """
+    Implements the logic for a cache archive.  A single archive file holds
+    the entries of all the functions of a source module, which spares
+    opening an index and a data file per function at startup.
+
+    The archive is memory-mapped and its table of contents, mapping each
+    function's filename base to its source stamp and to the location of its
+    entries, is read once per process.  Entries are only unpickled when
+    loaded.  Saving an entry appends it to the archive along with a small
+    table of contents record, under a lock shared by all the processes; the
+    archive is compacted now and then (see
+    ``_ArchiveReader.needs_compaction()``) and by ``CacheManager.gc()``.
+    """
+    def __init__(self, cache_path, filename_base, archive_name, source_stamp):
+        super(ArchiveCacheFile, self).__init__(cache_path, filename_base,
+                                               source_stamp)
+        self._filename_base = filename_base
+        self._archive_path = os.path.join(cache_path, archive_name)
+
+    def flush(self):
+        self._update_archive(None, None)
+
+    def save(self, key, data):
+        """
+        Save a new cache entry with *key* and *data*.
+        """
+        self._update_archive(key, self._dump(data))
+
+    def keys(self):
+        """
+        Return the keys of the fresh entries in the cache.
+        """
+        with _archive_lock:
+            return list(self._entries(self._refresh_reader()))
+
+    def load(self, key):
+        """
+        Load a cache entry with *key*.
+        """
+        with _archive_lock:
+            reader = _archive_readers.get(self._archive_path)
+            if reader is None or key not in self._entries(reader):
+                # The archive may have been updated since it was opened
+                reader = self._refresh_reader()
+            location = self._entries(reader).get(key)
+        if location is None:
+            return
+        data = reader.load(*location)
+        _cache_log("[cache] data loaded from %r", self._archive_path)
+        return data
+
+    def _entries(self, reader):
+        """
+        Return the entries of this function in the archive (empty if they
+        are obsolete).
+        """
+        stamp, entries = reader.toc.get(self._filename_base, (None, {}))
+        if stamp != self._source_stamp:
+            return {}
+        return entries
+
+    def _refresh_reader(self):
+        current = _archive_readers.get(self._archive_path)
+        reader = _ArchiveReader.open(self._archive_path, self._version,
+                                     current)
+        if reader is not current and reader.toc:
+            _mark_used(self._archive_path, reader.stat_key[2])
+        _archive_readers[self._archive_path] = reader
+        return reader
+
+    def _update_archive(self, key, data):
+        """
+        Add the entry *key* with *data* to the entries of this function in
+        the archive, or remove all of them if *key* is None.  The entries of
+        the other functions are kept.
+        """
+        with _archive_lock, _archive_file_lock(self._archive_path):
+            # The archive can't change while the lock is held
+            reader = self._refresh_reader()
+            entries = dict(self._entries(reader)) if key is not None else {}
+            if reader.toc_offset and not reader.needs_compaction():
+                self._append_archive(reader, entries, key, data)
+            else:
+                contents = reader.contents()
+                own = {k: reader.read(*loc) for k, loc in entries.items()}
+                if key is not None:
+                    own[key] = data
+                    contents[self._filename_base] = (self._source_stamp, own)
+                else:
+                    contents.pop(self._filename_base, None)
+                _write_archive(self._archive_path, self._version, contents)
+
+    def _append_archive(self, reader, entries, key, data):
+        with open(self._archive_path, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            if key is not None:
+                entries[key] = (f.tell(), len(data))
+                f.write(data)
+            toc_offset = f.tell()
+            toc = {self._filename_base: (self._source_stamp, entries)}
+            _write_toc_record(f, reader.toc_offset, self._version, toc)
+            # Only publish the record once it is complete
+            f.flush()
+            f.seek(0)
+            f.write(_ARCHIVE_HEADER.pack(_ARCHIVE_MAGIC, toc_offset))
+        _cache_log("[cache] archive updated in %r", self._archive_path)
 
 
 class Cache(_Cache):
@@ -673,6 +1243,15 @@ class Cache(_Cache):
     Separate index and data files per Python version avoid pickle
     compatibility problems.
 
+    Alternatively (NUMBA_CACHE_FORMAT=archive), the entries of all the
+    functions of a source module are stored in a single archive file
+    ("module_name.pyXY.nba"), see ``ArchiveCacheFile``.
+
+    If NUMBA_CACHE_SHARED_DIR is set, a read-only shared tier of the cache
+    (e.g. baked into an image or on a network share) is consulted first.
+    Entries missing from it are compiled and saved into the writable cache
+    directory found by the locator.
+
     Note:
     This contains the driver logic only.  The core logic is provided
     by a subclass of ``CacheImpl`` specified as *_impl_class* in the subclass.
@@ -681,17 +1260,16 @@ class Cache(_Cache):
     # The following class variables must be overridden by subclass.
     _impl_class = None
 
-    def __init__(self, py_func):
+    def __init__(self, py_func, targetoptions=None):
         self._name = repr(py_func)
         self._py_func = py_func
+        self._targetoptions = targetoptions or {}
         self._impl = self._impl_class(py_func)
         self._cache_path = self._impl.locator.get_cache_path()
-        # This may be a bit strict but avoids us maintaining a magic number
-        source_stamp = self._impl.locator.get_source_stamp()
-        filename_base = self._impl.filename_base
-        self._cache_file = IndexDataCacheFile(cache_path=self._cache_path,
-                                              filename_base=filename_base,
-                                              source_stamp=source_stamp)
+        self._cache_file_obj = None
+        self._shared_cache_file_obj = None
+        if not self._impl.locator.defer_source_stamp:
+            self._make_cache_files()
         self.enable()
 
     def __repr__(self):
@@ -701,6 +1279,31 @@ class Cache(_Cache):
     def cache_path(self):
         return self._cache_path
 
+    def _make_cache_files(self):
+        # This may be a bit strict but avoids us maintaining a magic number
+        source_stamp = self._impl.locator.get_source_stamp()
+        self._cache_file_obj = self._impl.make_cache_file(self._cache_path,
+                                                          source_stamp)
+        shared_path = self._impl.shared_cache_path
+        if shared_path is not None and shared_path != self._cache_path:
+            self._shared_cache_file_obj = \
+                self._impl.make_cache_file(shared_path, source_stamp)
+
+    @property
+    def _cache_file(self):
+        if self._cache_file_obj is None:
+            self._make_cache_files()
+        return self._cache_file_obj
+
+    @property
+    def _shared_cache_file(self):
+        """
+        The read-only shared cache tier, None if not configured.
+        """
+        if self._cache_file_obj is None:
+            self._make_cache_files()
+        return self._shared_cache_file_obj
+
     def enable(self):
         self._enabled = True
 
@@ -722,13 +1325,58 @@ class Cache(_Cache):
         # None returned if the `with` block swallows an exception
 
     def _load_overload(self, sig, target_context):
+        data = self.load_overload_data(sig, target_context)
+        if data is not None:
+            data = self.rebuild_overload(target_context, data)
+        return data
+
+    def load_overload_data(self, sig, target_context):
+        """
+        Load the serialized data of the overload for the given signature,
+        None if not found in the cache.  Unlike load_overload(), this doesn't
+        rebuild the overload and doesn't need the compiler lock.
+        """
         if not self._enabled:
             return
         key = self._index_key(sig, target_context.codegen())
-        data = self._cache_file.load(key)
-        if data is not None:
-            data = self._impl.rebuild(target_context, data)
-        return data
+        shared_cache_file = self._shared_cache_file
+        if shared_cache_file is not None:
+            data = shared_cache_file.load(key)
+            if data is not None:
+                return data
+        return self._cache_file.load(key)
+
+    def rebuild_overload(self, target_context, data):
+        """
+        Recreate the cached object from the *data* returned by
+        load_overload_data().
+        """
+        return self._impl.rebuild(target_context, data)
+
+    def scan_index(self, target_context):
+        """
+        Return the signatures found in the cache index as two lists: the
+        signatures loadable with the *target_context*, and the stale ones
+        (saved for another version of the function's code or another CPU).
+        """
+        fresh = []
+        stale = []
+        if not self._enabled:
+            return fresh, stale
+        keys = []
+        with self._guard_against_spurious_io_errors():
+            keys = self._cache_file.keys()
+            if self._shared_cache_file is not None:
+                keys += self._shared_cache_file.keys()
+        keys = list(dict.fromkeys(keys))
+        codegen = target_context.codegen()
+        for key in keys:
+            sig = key[0]
+            if key == self._index_key(sig, codegen):
+                fresh.append(sig)
+            else:
+                stale.append(sig)
+        return fresh, stale
 
     def save_overload(self, sig, data):
         """
@@ -765,8 +1413,8 @@ class Cache(_Cache):
         """
         Compute index key for the given signature and codegen.
         It includes a description of the OS, target architecture and hashes of
-        the bytecode for the function and, if the function has a __closure__,
-        a hash of the cell_contents.
+        the bytecode for the function, of its target options and, if the
+        function has a __closure__, a hash of the cell_contents.
         """
         codebytes = self._py_func.__code__.co_code
         if self._py_func.__closure__ is not None:
@@ -777,9 +1425,12 @@ class Cache(_Cache):
         else:
             cvarbytes = b''
 
+        optionbytes = _const_repr(self._targetoptions).encode('utf-8')
+
         hasher = lambda x: hashlib.sha256(x).hexdigest()
         return (sig, codegen.magic_tuple(), (hasher(codebytes),
-                                             hasher(cvarbytes),))
+                                             hasher(cvarbytes),
+                                             hasher(optionbytes),))
 
 
 class FunctionCache(Cache):
@@ -789,6 +1440,434 @@ class FunctionCache(Cache):
     _impl_class = CompileResultCacheImpl
 
 
+class CacheManager(object):
+    """
+    Maintenance of a cache directory (searched recursively):
+
+    - removal of the files no longer usable, i.e. data files which their
+      index doesn't refer to, index files and archives written by another
+      Numba version and leftover temporary files;
+    - compaction of the archives, dropping their superseded data;
+    - eviction of the least recently used entries to bound the size of the
+      cache.  Loading an entry updates the access time of its data file or
+      archive.
+    """
+    # Age in seconds after which a temporary file is considered leftover
+    _tmp_file_age = 3600
+
+    def __init__(self, path):
+        self._path = path
+
+    @property
+    def path(self):
+        return self._path
+
+    def _scan(self):
+        """
+        Return a dictionary mapping the path of each cache file to its stat
+        result.
+        """
+        files = {}
+        for dirpath, _, filenames in os.walk(self._path):
+            for fn in filenames:
+                if not (fn.endswith(('.nbi', '.nbc', '.nba'))
+                        or '.tmp.' in fn):
+                    continue
+                path = os.path.join(dirpath, fn)
+                try:
+                    files[path] = os.stat(path)
+                except FileNotFoundError:
+                    pass
+        return files
+
+    def size(self):
+        """
+        Return the total size in bytes of the cache files.
+        """
+        return sum(st.st_size for st in self._scan().values())
+
+    @staticmethod
+    def _index_path(data_path):
+        # "<filename_base>.<number>.nbc" -> "<filename_base>.nbi"
+        base = data_path[:-len('.nbc')].rsplit('.', 1)[0]
+        return base + '.nbi'
+
+    @staticmethod
+    def _load_index_names(index_path):
+        """
+        Return the set of data file names referred to by the index, or None
+        if the index can't be read by this process.  Indexes written by
+        another Numba version don't refer to any usable data file.
+        """
+        try:
+            with open(index_path, "rb") as f:
+                version = pickle.load(f)
+                data = f.read()
+        except FileNotFoundError:
+            return set()
+        except Exception:
+            return None
+        if version != numba.__version__:
+            return set()
+        try:
+            _, overloads = pickle.loads(data)
+        except Exception:
+            # e.g. written by another Python version
+            return None
+        return set(overloads.values())
+
+    def _remove(self, path, removed):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return
+        _cache_log("[cache] removed %r", path)
+        removed.append(path)
+
+    def remove_obsolete(self):
+        """
+        Remove the cache files no longer usable.  Return the list of the
+        removed paths.
+        """
+        removed = []
+        now = time.time()
+        index_names = {}
+        for path, st in sorted(self._scan().items()):
+            if '.tmp.' in os.path.basename(path):
+                if now - st.st_mtime > self._tmp_file_age:
+                    self._remove(path, removed)
+            elif path.endswith('.nbi'):
+                names = self._load_index_names(path)
+                index_names[path] = names
+                if names is not None and not names:
+                    self._remove(path, removed)
+            elif path.endswith('.nbc'):
+                index_path = self._index_path(path)
+                if index_path not in index_names:
+                    index_names[index_path] = \
+                        self._load_index_names(index_path)
+                names = index_names[index_path]
+                if names is not None and os.path.basename(path) not in names:
+                    self._remove(path, removed)
+            elif path.endswith('.nba'):
+                reader = _ArchiveReader.open(path, numba.__version__)
+                if not reader.toc:
+                    self._remove(path, removed)
+                elif _compact_archive(path, numba.__version__):
+                    _cache_log("[cache] compacted %r", path)
+        return removed
+
+    def evict(self, max_size):
+        """
+        Remove the least recently used entries until the cache is no larger
+        than *max_size* bytes.  Return the list of the removed paths.
+        """
+        removed = []
+        files = self._scan()
+        total = sum(st.st_size for st in files.values())
+        if total <= max_size:
+            return removed
+        data_counts = collections.Counter(
+            self._index_path(path) for path in files if path.endswith('.nbc'))
+
+        def last_used(path):
+            st = files[path]
+            return max(st.st_atime, st.st_mtime)
+
+        entries = [path for path in files if path.endswith(('.nbc', '.nba'))]
+        for path in sorted(entries, key=last_used):
+            if total <= max_size:
+                break
+            self._remove(path, removed)
+            total -= files[path].st_size
+            if path.endswith('.nbc'):
+                # Remove the index along with its last data file
+                index_path = self._index_path(path)
+                data_counts[index_path] -= 1
+                if data_counts[index_path] == 0 and index_path in files:
+                    self._remove(index_path, removed)
+                    total -= files[index_path].st_size
+        return removed
+
+    def gc(self, max_size=None):
+        """
+        Remove the obsolete cache files then, if *max_size* is given, evict
+        the least recently used entries to bound the size of the cache.
+        Return the list of the removed paths.
+        """
+        removed = self.remove_obsolete()
+        if max_size is not None:
+            removed.extend(self.evict(max_size))
+        return removed
+
+
+WarmupReport = collections.namedtuple('WarmupReport',
+                                      ('hits', 'misses', 'stale'))
+
+
+def warmup(modules, workers=None):
+    """
+    Load all the cached overloads of the jitted functions found in the
+    given *modules* (module objects or names), so that their first calls
+    don't pay for loading them from the cache.
+
+    The cache entries are read and unpickled on a pool of *workers* threads
+    (by default, as many as ``concurrent.futures.ThreadPoolExecutor``
+    chooses), the overloads are then installed into their dispatchers.
+
+    Returns a ``WarmupReport`` whose *hits*, *misses* and *stale* fields are
+    lists of ``(dispatcher, signature)`` pairs, for respectively the loaded
+    overloads, the overloads whose data couldn't be loaded and the index
+    entries that don't match the current code or CPU.
+    """
+    from numba.core.dispatcher import Dispatcher
+
+    dispatchers = {}
+    for mod in modules:
+        if isinstance(mod, str):
+            mod = importlib.import_module(mod)
+        for obj in vars(mod).values():
+            if (isinstance(obj, Dispatcher) and isinstance(obj._cache, Cache)
+                    and obj._can_compile):
+                dispatchers[id(obj)] = obj
+
+    report = WarmupReport([], [], [])
+    pending = []
+    for disp in dispatchers.values():
+        disp.targetctx.refresh()
+        fresh, stale = disp._cache.scan_index(disp.targetctx)
+        report.stale.extend((disp, sig) for sig in stale)
+        for sig in fresh:
+            args, _ = sigutils.normalize_signature(sig)
+            if tuple(args) not in disp.overloads:
+                pending.append((disp, sig))
+
+    def load(item):
+        disp, sig = item
+        return disp._cache.load_overload_data(sig, disp.targetctx)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (disp, sig), data in zip(pending, executor.map(load, pending)):
+            if data is None:
+                _cache_log("[cache] warmup miss for %r %s", disp, sig)
+                report.misses.append((disp, sig))
+                continue
+            with global_compiler_lock:
+                args, _ = sigutils.normalize_signature(sig)
+                if tuple(args) not in disp.overloads:
+                    cres = disp._cache.rebuild_overload(disp.targetctx, data)
+                    disp._add_cached_overload(sig, cres)
+            report.hits.append((disp, sig))
+    return report
+
+
+_type_profile_version = 2
+
+# The active TypeProfileRecorder instances.
+_type_profile_recorders = []
+
+
+class TypeProfileRecorder(object):
+    """
+    Record the argument types of the overloads compiled or loaded from the
+    cache by jitted functions, so that they can be compiled ahead of time
+    by ``precompile()``.  Use as a context manager, or call ``start()`` and
+    ``stop()``; the profile is written to *path* when recording stops.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def record(self, disp, args):
+        """
+        Record the overload of dispatcher *disp* for the argument types
+        *args*.
+        """
+        py_func = disp.py_func
+        key = py_func.__module__, py_func.__qualname__, tuple(args)
+        with self._lock:
+            self._entries.setdefault(key, None)
+
+    def entries(self):
+        """
+        Return the recorded (module name, qualified name, argument types)
+        triples, in recording order.
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def save(self):
+        """
+        Write the recorded entries to the profile file.  Functions which
+        can't be imported by name, such as closures, are left out.
+        """
+        entries = []
+        for modname, qualname, args in self.entries():
+            if modname == '__main__' or '<locals>' in qualname:
+                continue
+            signature = _format_profile_types(args)
+            if signature is None:
+                warnings.warn("the argument types %s of %s.%s can't be "
+                              "stored in a type profile"
+                              % (args, modname, qualname), NumbaWarning)
+                continue
+            entries.append({
+                'module': modname,
+                'qualname': qualname,
+                'signature': signature,
+            })
+        profile = {'version': _type_profile_version,
+                   'numba_version': numba.__version__,
+                   'entries': entries}
+        tmpname = '%s.tmp.%s' % (self._path, uuid.uuid4().hex)
+        with open(tmpname, 'w') as f:
+            json.dump(profile, f, indent=1)
+        os.replace(tmpname, self._path)
+
+    def start(self):
+        _type_profile_recorders.append(self)
+
+    def stop(self):
+        _type_profile_recorders.remove(self)
+        self.save()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def record_type_profile(disp, args):
+    """
+    Notify the active recorders of the overload of *disp* for *args*.
+    """
+    for recorder in _type_profile_recorders:
+        recorder.record(disp, args)
+
+
+def _format_profile_types(args):
+    """
+    Spell the argument types *args* as an expression of Numba type names
+    and constructors, which ``_parse_profile_types()`` reads back.  Return
+    None if some of the types have no such spelling.
+    """
+    text = '(%s)' % ''.join('%r, ' % ty for ty in args)
+    try:
+        if _parse_profile_types(text) == tuple(args):
+            return text
+    except Exception:
+        pass
+    return None
+
+
+def _parse_profile_types(text):
+    """
+    Parse the argument types spelled by ``_format_profile_types()``.
+
+    Type profiles may come from untrusted places, so unlike
+    ``sigutils.normalize_signature()`` on a string this doesn't eval()
+    *text*: only Numba type names, constants, tuples, lists, dicts and
+    calls to Numba type classes are accepted.
+    """
+    def convert(node):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            value = vars(types).get(node.id)
+            if (isinstance(value, types.Type) or
+                    (isinstance(value, type) and
+                     issubclass(value, types.Type))):
+                return value
+            raise ValueError("unknown type name %r" % (node.id,))
+        if isinstance(node, ast.Tuple):
+            return tuple(convert(elt) for elt in node.elts)
+        if isinstance(node, ast.List):
+            return [convert(elt) for elt in node.elts]
+        if isinstance(node, ast.Dict) and None not in node.keys:
+            return {convert(k): convert(v)
+                    for k, v in zip(node.keys, node.values)}
+        if isinstance(node, ast.Call):
+            cls = convert(node.func)
+            if not isinstance(cls, type):
+                raise ValueError("%r is not a type class" % (cls,))
+            if any(kw.arg is None for kw in node.keywords):
+                raise ValueError("unsupported syntax '**'")
+            args = [convert(arg) for arg in node.args]
+            kws = {kw.arg: convert(kw.value) for kw in node.keywords}
+            return cls(*args, **kws)
+        raise ValueError("unsupported syntax %r" % (type(node).__name__,))
+
+    args, _ = sigutils.normalize_signature(
+        convert(ast.parse(text, mode='eval').body))
+    return tuple(args)
+
+
+def load_type_profile(path):
+    """
+    Return the (module name, qualified name, argument types) triples
+    recorded in the profile file *path*.
+    """
+    with open(path) as f:
+        profile = json.load(f)
+    if profile.get('version') != _type_profile_version:
+        raise ValueError("unsupported type profile version in %r" % (path,))
+    items = []
+    for entry in profile['entries']:
+        modname, qualname = entry['module'], entry['qualname']
+        try:
+            args = _parse_profile_types(entry['signature'])
+        except Exception as e:
+            raise ValueError("invalid signature %r for %s.%s in type "
+                             "profile %r: %s"
+                             % (entry['signature'], modname, qualname,
+                                path, e)) from e
+        items.append((modname, qualname, args))
+    return items
+
+
+def precompile(path, workers=None):
+    """
+    Compile the overloads recorded in the type profile file *path* and save
+    them to the cache, so that running the same workload later doesn't
+    trigger any compilation.  The compilations are distributed over
+    *workers* processes, see ``numba.compile_many()``.
+
+    Returns the list of ``(dispatcher, argument types)`` pairs compiled.
+    Functions not built with ``cache=True`` are skipped with a warning.
+    """
+    from numba.core.dispatcher import compile_many, _find_dispatcher
+
+    items = []
+    for modname, qualname, args in load_type_profile(path):
+        disp = _find_dispatcher(modname, qualname)
+        if isinstance(disp._cache, NullCache):
+            warnings.warn("%s.%s is not cached, its overloads can't be "
+                          "precompiled" % (modname, qualname), NumbaWarning)
+            continue
+        items.append((disp, args))
+    compile_many(items, workers=workers)
+    return items
+
+
+def _setup_type_profile_exit_handler():
+    """
+    Record the type profile of the whole process into the file named by
+    NUMBA_TYPE_PROFILE.
+    """
+    recorder = TypeProfileRecorder(config.TYPE_PROFILE)
+    recorder.start()
+    # The output file is not multi-process safe.
+    atexit.register(recorder.stop)
+
+
+if config.TYPE_PROFILE:
+    _setup_type_profile_exit_handler()
+
+
 # Remember used cache filename prefixes.
 _lib_cache_prefixes = set([''])
 
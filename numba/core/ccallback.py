@@ -57,7 +57,8 @@ class CFunc(object):
         self._cache_hits = 0
 
     def enable_caching(self):
-        self._cache = FunctionCache(self._pyfunc)
+        self._cache = FunctionCache(self._pyfunc,
+                                    self._compiler.targetoptions)
 
     @global_compiler_lock
     def compile(self):
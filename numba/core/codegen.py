@@ -1003,6 +1003,18 @@ class JITCodeLibrary(CPUCodeLibrary):
         else:
             return self._codegen._engine.get_function_address(name)
 
+    def get_pointer_to_global(self, name):
+        """
+        Like get_pointer_to_function(), but for the global variable named
+        *name*.
+        """
+        self._ensure_finalized()
+        ee = self._codegen._engine
+        if not ee.is_symbol_defined(name):
+            return 0
+        else:
+            return ee.get_global_value_address(name)
+
     def _finalize_specific(self):
         self._codegen._scan_and_fix_unresolved_refs(self._final_module)
         with self._recorded_timings.record_legacy("Finalize object"):
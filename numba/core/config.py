@@ -267,6 +267,9 @@ class _EnvReloader(object):
         # Enable NRT statistics counters
         NRT_STATS = _readenv("NUMBA_NRT_STATS", int, 0)
 
+        # Count the calls to code compiled in object mode
+        COUNT_OBJMODE_CALLS = _readenv("NUMBA_COUNT_OBJMODE_CALLS", int, 0)
+
         # How many recently deserialized functions to retain regardless
         # of external references
         FUNCTION_CACHE_SIZE = _readenv("NUMBA_FUNCTION_CACHE_SIZE", int, 128)
@@ -288,6 +291,23 @@ class _EnvReloader(object):
         # see _locator_classes in caching submodule
         CACHE_LOCATOR_CLASSES = _readenv("NUMBA_CACHE_LOCATOR_CLASSES", str, "")
 
+        # Read-only shared cache directory, consulted before the cache
+        # directory found by the cache locators (same layout as CACHE_DIR)
+        CACHE_SHARED_DIR = _readenv("NUMBA_CACHE_SHARED_DIR", str, "")
+
+        # On-disk format of the cache, either "index" (one index file and
+        # one data file per overload) or "archive" (a single memory-mappable
+        # archive per source module)
+        CACHE_FORMAT = _readenv("NUMBA_CACHE_FORMAT", str, "index")
+
+        # Path of the file recording the argument types of the compiled
+        # overloads, for ahead-of-time compilation with numba --precompile
+        TYPE_PROFILE = _readenv("NUMBA_TYPE_PROFILE", str, "")
+
+        # Share the compile results between dispatchers compiling functions
+        # with identical content (e.g. after reloading a module)
+        COMPILE_MEMO = _readenv("NUMBA_COMPILE_MEMO", int, 0)
+
         # Enable tracing support
         TRACE = _readenv("NUMBA_TRACE", int, 0)
 
@@ -414,6 +434,19 @@ class _EnvReloader(object):
         )
         THREADING_LAYER = _readenv("NUMBA_THREADING_LAYER", str, 'default')
 
+        # CPUs to pin the threads of the threading layer to, "compact",
+        # "scatter" or a list such as "0,2,4-7", empty to leave them unpinned
+        THREAD_AFFINITY = _readenv("NUMBA_THREAD_AFFINITY", str, "")
+
+        # Number of times an idle workqueue thread polls for work before
+        # parking, 0 parks straight away
+        WORKQUEUE_SPIN_COUNT = _readenv("NUMBA_WORKQUEUE_SPIN_COUNT", int, 0)
+
+        # Parallel regions with fewer iterations than this run serially on
+        # the calling thread, 0 disables the check
+        PARALLEL_MIN_ITERATIONS = _readenv(
+            "NUMBA_PARALLEL_MIN_ITERATIONS", int, 0)
+
         # CUDA Configs
 
         # Whether to warn about kernel launches where a host array
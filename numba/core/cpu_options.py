@@ -64,12 +64,18 @@ class FastMathOptions(AbstractOptionValue):
         return NotImplemented
 
 
+# Policies for distributing the iterations of parallel loops among threads,
+# in the order of the PARALLEL_SCHEDULE_* values of gufunc_scheduler.h.
+PARALLEL_SCHEDULES = ('static', 'dynamic', 'guided')
+
+
 class ParallelOptions(AbstractOptionValue):
     """
     Options for controlling auto parallelization.
     """
     __slots__ = ("enabled", "comprehension", "reduction", "inplace_binop",
-                 "setitem", "numpy", "stencil", "fusion", "prange")
+                 "setitem", "numpy", "stencil", "fusion", "prange",
+                 "schedule")
 
     def __init__(self, value):
         if isinstance(value, bool):
@@ -82,6 +88,7 @@ class ParallelOptions(AbstractOptionValue):
             self.stencil = value
             self.fusion = value
             self.prange = value
+            self.schedule = 'static'
         elif isinstance(value, dict):
             self.enabled = True
             self.comprehension = value.pop('comprehension', True)
@@ -92,6 +99,11 @@ class ParallelOptions(AbstractOptionValue):
             self.stencil = value.pop('stencil', True)
             self.fusion = value.pop('fusion', True)
             self.prange = value.pop('prange', True)
+            self.schedule = value.pop('schedule', 'static')
+            if self.schedule not in PARALLEL_SCHEDULES:
+                msg = ("Unrecognized parallel schedule %r, expected one of "
+                       "%s" % (self.schedule, PARALLEL_SCHEDULES))
+                raise ValueError(msg)
             if value:
                 msg = "Unrecognized parallel options: %s" % value.keys()
                 raise NameError(msg)
@@ -105,6 +117,7 @@ class ParallelOptions(AbstractOptionValue):
             self.stencil = value.stencil
             self.fusion = value.fusion
             self.prange = value.prange
+            self.schedule = value.schedule
         else:
             msg = "Expect parallel option to be either a bool or a dict"
             raise ValueError(msg)
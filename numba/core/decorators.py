@@ -81,6 +81,14 @@ def jit(signature_or_function=None, locals=MappingProxyType({}), cache=False,
                 NOTE: This inlining is performed at the Numba IR level and is in
                 no way related to LLVM inlining.
 
+            compile: str
+                Controls when calls requiring a new specialization are
+                compiled. 'sync' (default) compiles the specialization before
+                running the call. 'background' compiles it on a worker thread;
+                until it is ready, such calls run a previously compiled
+                overload the arguments safely convert to, or else the pure
+                Python function.
+
             boundscheck: bool or None
                 Set to True to enable bounds checking for array indices. Out
                 of bounds accesses will raise IndexError. The default is to
@@ -151,6 +159,10 @@ def jit(signature_or_function=None, locals=MappingProxyType({}), cache=False,
     if nopython is True and forceobj:
         raise ValueError("Only one of 'nopython' or 'forceobj' can be True.")
     target = options.pop('_target', 'cpu')
+    compile_mode = options.pop('compile', 'sync')
+    if compile_mode not in ('sync', 'background'):
+        raise ValueError("compile option must be 'sync' or 'background', "
+                         f"got {compile_mode!r}")
 
     if nopython is False:
         msg = ("The keyword argument 'nopython=False' was supplied. From "
@@ -189,14 +201,17 @@ def jit(signature_or_function=None, locals=MappingProxyType({}), cache=False,
     if pipeline_class is not None:
         dispatcher_args['pipeline_class'] = pipeline_class
     wrapper = _jit(sigs, locals=locals, target=target, cache=cache,
-                   targetoptions=options, **dispatcher_args)
+                   targetoptions=options,
+                   background_compile=compile_mode == 'background',
+                   **dispatcher_args)
     if pyfunc is not None:
         return wrapper(pyfunc)
     else:
         return wrapper
 
 
-def _jit(sigs, locals, target, cache, targetoptions, **dispatcher_args):
+def _jit(sigs, locals, target, cache, targetoptions, background_compile=False,
+         **dispatcher_args):
 
     from numba.core.target_extension import resolve_dispatcher_from_str
     dispatcher = resolve_dispatcher_from_str(target)
@@ -225,6 +240,8 @@ def _jit(sigs, locals, target, cache, targetoptions, **dispatcher_args):
                           **dispatcher_args)
         if cache:
             disp.enable_caching()
+        if background_compile:
+            disp.enable_background_compilation()
         if sigs is not None:
             # Register the Dispatcher to the type inference mechanism,
             # even though the decorator hasn't returned yet.
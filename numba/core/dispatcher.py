@@ -2,8 +2,14 @@
 
 
 import collections
+import ctypes
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import functools
+import importlib
+import multiprocessing
+import os
 import sys
+import threading
 import types as pytypes
 import uuid
 import weakref
@@ -19,7 +25,11 @@ from numba.core.typeconv.rules import default_type_manager
 from numba.core.typing.templates import fold_arguments
 from numba.core.typing.typeof import Purpose, typeof
 from numba.core.bytecode import get_code_object
-from numba.core.caching import NullCache, FunctionCache
+from numba.core.pylowering import get_call_counter_name
+from numba.core.caching import (
+    NullCache, FunctionCache, record_type_profile, _hash_function_content,
+    _const_repr
+)
 from numba.core import entrypoints
 import numba.core.event as ev
 
@@ -163,8 +173,165 @@ class _GeneratedFunctionCompiler(_FunctionCompiler):
         return impl
 
 
+_background_executor = None
+_background_executor_lock = threading.Lock()
+
+
+def _get_background_executor():
+    """
+    Return the executor running background compilations.  A single worker
+    is enough, as compilation is serialized by the compiler lock anyway.
+    """
+    global _background_executor
+    with _background_executor_lock:
+        if _background_executor is None:
+            _background_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='numba-compile')
+        return _background_executor
+
+
+def _find_dispatcher(modname, qualname):
+    """
+    Return the object named *qualname* in the module *modname*.
+    """
+    obj = importlib.import_module(modname)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _compile_for_cache(tasks):
+    """
+    Compile the (modname, qualname, signatures) *tasks* in a worker process.
+    The results are only of interest through the disk cache they populate.
+    """
+    for modname, qualname, sigs in tasks:
+        disp = _find_dispatcher(modname, qualname)
+        for sig in sigs:
+            disp.compile(sig)
+
+
+def _worker_task_key(disp):
+    """
+    Return the key grouping the compilations of *disp* into worker tasks,
+    or None if *disp* cannot be compiled by a worker process.  A worker must
+    be able to import the dispatcher and save its overloads to the disk
+    cache, from which they are then loaded in this process.
+    """
+    if isinstance(disp._cache, NullCache):
+        return None
+    modname = disp.py_func.__module__
+    qualname = disp.py_func.__qualname__
+    if modname == '__main__' or '<locals>' in qualname:
+        return None
+    try:
+        if _find_dispatcher(modname, qualname) is not disp:
+            return None
+    except (ImportError, AttributeError):
+        return None
+    if config.CACHE_FORMAT == 'archive':
+        # All functions of a module share the archive file, which must
+        # only be rewritten by one worker at a time.
+        return modname
+    return modname, qualname
+
+
+def compile_many(items, workers=None):
+    """
+    Compile each of the ``(dispatcher, signature)`` pairs in *items* and
+    return the list of entry points, in the same order.
+
+    The compilations of distinct dispatchers built with ``cache=True`` and
+    defined at the top level of an importable module are distributed over
+    *workers* processes (default: the number of CPUs), which populate the
+    disk cache.  All other compilations, and those a worker failed at, are
+    performed in this process.
+    """
+    items = list(items)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = collections.defaultdict(list)
+    keys = {}
+    for disp, sig in items:
+        args, _ = sigutils.normalize_signature(sig)
+        if tuple(args) in disp.overloads:
+            continue
+        if id(disp) not in keys:
+            keys[id(disp)] = _worker_task_key(disp)
+        key = keys[id(disp)]
+        if key is not None:
+            py_func = disp.py_func
+            tasks[key].append((py_func.__module__,
+                               py_func.__qualname__, [sig]))
+    if workers > 1 and len(tasks) > 1:
+        ctx = multiprocessing.get_context('spawn')
+        nworkers = min(workers, len(tasks))
+        with ProcessPoolExecutor(nworkers, mp_context=ctx) as executor:
+            futures = [executor.submit(_compile_for_cache, task)
+                       for task in tasks.values()]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:
+                    # Compiling again below reports the error
+                    pass
+    return [disp.compile(sig) for disp, sig in items]
+
+
+# The compile results shared between dispatchers compiling functions with
+# identical content, in least recently used order.
+_compile_memo = collections.OrderedDict()
+_compile_memo_size = 1000
+
+
+def _memoize_compile_result(key, cres):
+    """
+    Remember *cres* under *key* in the compile memo, evicting the least
+    recently used results beyond the memo size.  The compiler lock must be
+    held.
+    """
+    if key is None or cres.objectmode or cres.lifted:
+        return
+    _compile_memo[key] = cres
+    while len(_compile_memo) > _compile_memo_size:
+        _compile_memo.popitem(last=False)
+
+
+def _lookup_compile_memo(key):
+    """
+    Return the compile result remembered under *key*, or None.  The
+    compiler lock must be held.
+    """
+    cres = _compile_memo.get(key)
+    if cres is not None:
+        _compile_memo.move_to_end(key)
+    return cres
+
+
 _CompileStats = collections.namedtuple(
-    '_CompileStats', ('cache_path', 'cache_hits', 'cache_misses'))
+    '_CompileStats', ('cache_path', 'cache_hits', 'cache_misses',
+                      'inline_cache_hits', 'inline_cache_misses'))
+
+
+def _read_call_counter(cres):
+    """
+    Return the number of calls to the object mode compile result *cres*,
+    or None if they are not counted.
+    """
+    if not cres.objectmode:
+        return None
+    get_pointer = getattr(cres.library, 'get_pointer_to_global', None)
+    if get_pointer is None:
+        return None
+    addr = get_pointer(get_call_counter_name(cres.fndesc))
+    if not addr:
+        return None
+    return ctypes.c_ssize_t.from_address(addr).value
+
+
+ObjectModeRegion = collections.namedtuple(
+    'ObjectModeRegion', ('kind', 'qualname', 'filename', 'line', 'signature',
+                         'objectmode', 'calls', 'detail'))
 
 
 class CompilingCounter(object):
@@ -196,6 +363,11 @@ class _DispatcherBase(_dispatcher.Dispatcher):
 
     __numba__ = "py_func"
 
+    _background_compile = False
+
+    # The kind of region reported by object_mode_report()
+    _region_kind = 'function'
+
     def __init__(self, arg_count, py_func, pysig, can_fallback,
                  exact_match_required):
         self._tm = default_type_manager
@@ -334,6 +506,39 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         args, return_type = sigutils.normalize_signature(sig)
         return self.overloads[tuple(args)].entry_point
 
+    def bind(self, sig):
+        """
+        Return the compiled function for the given signature, compiling it
+        if needed.  Calling it skips argument typing and overload
+        selection: all the arguments must be passed positionally, and are
+        converted to the signature's types or raise an error.
+        """
+        args, return_type = sigutils.normalize_signature(sig)
+        existing = self.overloads.get(tuple(args))
+        if existing is not None:
+            return existing.entry_point
+        if not self._can_compile:
+            raise TypeError("No matching definition for signature %s"
+                            % (sig,))
+        return self.compile(sig)
+
+    def starmap(self, iterable, out=None):
+        """
+        Call the dispatcher with each tuple of arguments from *iterable*,
+        like ``itertools.starmap()``, and return the list of results.  If
+        *out* is given, the results are stored into it instead and it is
+        returned; its length must match the number of calls.
+        """
+        return self._starmap(iterable, out)
+
+    def map(self, *iterables, out=None):
+        """
+        Call the dispatcher with arguments taken from each of *iterables*,
+        like the builtin ``map()``, and return the list of results.  See
+        ``starmap()`` for the meaning of *out*.
+        """
+        return self._starmap(zip(*iterables), out)
+
     @property
     def is_compiling(self):
         """
@@ -371,6 +576,11 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             else:
                 argtypes.append(self.typeof_pyval(a))
 
+        if self._background_compile:
+            fallback = self._compile_in_background(tuple(argtypes))
+            if fallback is not None:
+                return fallback
+
         return_val = None
         try:
             return_val = self.compile(tuple(argtypes))
@@ -445,6 +655,71 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             self._types_active_call.clear()
         return return_val
 
+    def enable_background_compilation(self):
+        """
+        Compile new specializations on a worker thread instead of blocking
+        the call which requires them.  Until the specialization is ready,
+        such calls run a previously compiled overload the arguments safely
+        convert to, or else the pure Python function.
+        """
+        # Pending background compilations by argument types
+        self._background_futures = {}
+        # Argument types whose background compilation failed
+        self._background_failures = set()
+        self._background_lock = threading.RLock()
+        self._background_compile = True
+
+    def _compile_in_background(self, argtypes):
+        """
+        Schedule the compilation of the specialization for *argtypes* if
+        needed, and return a callable to use until it is ready, or None if
+        the compilation has finished.  The outcome of a finished compilation
+        (the new overload, or the error) is then obtained by compiling
+        synchronously.  After a failure, the specialization is always
+        compiled synchronously, which retries it and raises the error.
+        """
+        with self._background_lock:
+            if argtypes in self._background_failures:
+                return None
+            future = self._background_futures.get(argtypes)
+            if future is None:
+                executor = _get_background_executor()
+                future = executor.submit(self.compile, argtypes)
+                self._background_futures[argtypes] = future
+                future.add_done_callback(
+                    functools.partial(self._background_done, argtypes))
+        if future.done():
+            return None
+        try:
+            idx = self._tm.select_overload(argtypes, list(self.overloads),
+                                           allow_unsafe=False,
+                                           exact_match_required=False)
+        except TypeError:
+            # No compatible overload
+            return self._call_py_func
+        return list(self.overloads.values())[idx].entry_point
+
+    def _background_done(self, argtypes, future):
+        # On success, the new overload is found by the C dispatcher from now
+        # on.  The failed futures aren't kept, as they hold the exception
+        # and its traceback.
+        with self._background_lock:
+            self._background_futures.pop(argtypes, None)
+            if future.exception() is not None:
+                self._background_failures.add(argtypes)
+
+    def _call_py_func(self, *args):
+        """
+        Call the pure Python function with the arguments folded by the
+        dispatcher.
+        """
+        args = [a.value if isinstance(a, OmittedArg) else a for a in args]
+        if self._compiler.pysig.parameters:
+            lastarg = list(self._compiler.pysig.parameters.values())[-1]
+            if lastarg.kind == lastarg.VAR_POSITIONAL:
+                args = args[:-1] + list(args[-1])
+        return self.py_func(*args)
+
     def inspect_llvm(self, signature=None):
         """Get the LLVM intermediate representation generated by compilation.
 
@@ -635,6 +910,62 @@ class _DispatcherBase(_dispatcher.Dispatcher):
             out[key] = ta.annotate_raw()[key]
         return out
 
+    def object_mode_report(self, signature=None):
+        """
+        Report the regions of the function compiled for *signature* (or for
+        all compiled signatures) that may cost Python-level execution.
+
+        Returns a list of ObjectModeRegion tuples, one for:
+
+        - the function itself if it was compiled in object mode
+          (kind ``'function'``);
+        - each loop lifted out of an object mode function (``'lifted_loop'``),
+          each ``with`` block lifted out as a separate function, e.g. by
+          ``call_context`` (``'lifted_with'``), and each ``with objmode``
+          block (``'objmode_block'``), recursively.  ``signature`` and
+          ``objectmode`` are None if the region was not compiled yet;
+        - each argument converted to a reflected list or set, which is
+          unboxed and reflected back on every call (``'reflected_list'``
+          and ``'reflected_set'``; ``detail`` names the argument).
+
+        ``calls`` counts the entries in the region if it was compiled in
+        object mode while NUMBA_COUNT_OBJMODE_CALLS was set, and is None
+        otherwise.
+        """
+        signatures = self.signatures if signature is None else [signature]
+        regions = []
+        for sig in signatures:
+            self._add_object_mode_regions(self.overloads[sig], regions)
+        return regions
+
+    def _get_region_location(self):
+        return self.func_code.co_filename, self.func_code.co_firstlineno
+
+    def _add_object_mode_regions(self, cres, regions):
+        qualname = cres.fndesc.qualname
+        filename, line = self._get_region_location()
+        if cres.objectmode or self._region_kind != 'function':
+            regions.append(ObjectModeRegion(
+                self._region_kind, qualname, filename, line, cres.signature,
+                cres.objectmode, _read_call_counter(cres), None))
+        for name, ty in zip(cres.fndesc.args, cres.signature.args):
+            if isinstance(ty, (types.List, types.Set)) and ty.reflected:
+                kind = ('reflected_list' if isinstance(ty, types.List)
+                        else 'reflected_set')
+                regions.append(ObjectModeRegion(
+                    kind, qualname, filename, line, cres.signature,
+                    cres.objectmode, None, "argument %r" % (name,)))
+        for lifted in cres.lifted:
+            if lifted.overloads:
+                for sig in lifted.signatures:
+                    lifted._add_object_mode_regions(lifted.overloads[sig],
+                                                    regions)
+            else:
+                filename, line = lifted._get_region_location()
+                regions.append(ObjectModeRegion(
+                    lifted._region_kind, qualname, filename, line, None, None,
+                    None, None))
+
     def _explain_ambiguous(self, *args, **kws):
         """
         Callback for the C _Dispatcher object.
@@ -808,7 +1139,7 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
         return types.Dispatcher(self)
 
     def enable_caching(self):
-        self._cache = FunctionCache(self.py_func)
+        self._cache = FunctionCache(self.py_func, self.targetoptions)
 
     def __get__(self, obj, objtype=None):
         '''Allow a JIT function to be bound as a method to an object'''
@@ -888,16 +1219,21 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                 # Try to load from disk cache
                 cres = self._cache.load_overload(sig, self.targetctx)
                 if cres is not None:
-                    self._cache_hits[sig] += 1
-                    # XXX fold this in add_overload()? (also see compiler.py)
-                    if not cres.objectmode:
-                        self.targetctx.insert_user_function(cres.entry_point,
-                                                            cres.fndesc,
-                                                            [cres.library])
-                    self.add_overload(cres)
+                    self._add_cached_overload(sig, cres)
+                    record_type_profile(self, args)
                     return cres.entry_point
 
                 self._cache_misses[sig] += 1
+                # Reuse the result of compiling identical content
+                memo_key = self._compile_memo_key(args, return_type)
+                # (not bound to cres, whose timers are already recorded)
+                memoized = _lookup_compile_memo(memo_key)
+                if memoized is not None:
+                    self.add_overload(memoized)
+                    self._cache.save_overload(sig, memoized)
+                    record_type_profile(self, args)
+                    return memoized.entry_point
+
                 ev_details = dict(
                     dispatcher=self,
                     args=args,
@@ -912,9 +1248,40 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                                                                       kws)[1]
                         raise e.bind_fold_arguments(folded)
                     self.add_overload(cres)
+                _memoize_compile_result(memo_key, cres)
                 self._cache.save_overload(sig, cres)
+                record_type_profile(self, args)
                 return cres.entry_point
 
+    def _compile_memo_key(self, args, return_type):
+        """
+        Return the key of the compilation for *args* and *return_type* in
+        the compile memo, or None if the memo is disabled or the function's
+        content can't be hashed.
+        """
+        if not config.COMPILE_MEMO:
+            return None
+        try:
+            content = _hash_function_content(self.py_func, strict=True)
+        except ValueError:
+            return None
+        return (content, self.targetdescr, self._compiler.pipeline_class,
+                _const_repr(self.targetoptions),
+                repr(sorted(self.locals.items())), tuple(args), return_type)
+
+    def _add_cached_overload(self, sig, cres):
+        """
+        Install the compile result *cres* loaded from the disk cache for
+        the signature *sig*.  The compiler lock must be held.
+        """
+        self._cache_hits[sig] += 1
+        # XXX fold this in add_overload()? (also see compiler.py)
+        if not cres.objectmode:
+            self.targetctx.insert_user_function(cres.entry_point,
+                                                cres.fndesc,
+                                                [cres.library])
+        self.add_overload(cres)
+
     def get_compile_result(self, sig):
         """Compile (if needed) and return the compilation result with the
         given signature.
@@ -956,6 +1323,8 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
             cache_path=self._cache.cache_path,
             cache_hits=self._cache_hits,
             cache_misses=self._cache_misses,
+            inline_cache_hits=self._inline_cache_hits,
+            inline_cache_misses=self._inline_cache_misses,
         )
 
     def parallel_diagnostics(self, signature=None, level=1):
@@ -1072,6 +1441,9 @@ class LiftedCode(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
         """
         return self.func_ir.loc.line
 
+    def _get_region_location(self):
+        return self.func_ir.loc.filename, self.func_ir.loc.line
+
     def _pre_compile(self, args, return_type, flags):
         """Pre-compile actions
         """
@@ -1090,6 +1462,8 @@ class LiftedCode(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
 
 
 class LiftedLoop(LiftedCode):
+    _region_kind = 'lifted_loop'
+
     def _pre_compile(self, args, return_type, flags):
         assert not flags.enable_looplift, "Enable looplift flags is on"
 
@@ -1173,6 +1547,7 @@ class LiftedLoop(LiftedCode):
 
 
 class LiftedWith(LiftedCode):
+    _region_kind = 'lifted_with'
 
     can_cache = True
 
@@ -1265,6 +1640,8 @@ class LiftedWith(LiftedCode):
 
 
 class ObjModeLiftedWith(LiftedWith):
+    _region_kind = 'objmode_block'
+
     def __init__(self, *args, **kwargs):
         self.output_types = kwargs.pop('output_types', None)
         super(LiftedWith, self).__init__(*args, **kwargs)
@@ -10,7 +10,7 @@ from functools import cached_property
 
 import llvmlite.ir
 
-from numba.core import types, utils, ir, generators, cgutils
+from numba.core import types, utils, ir, generators, cgutils, config
 from numba.core.errors import (ForbiddenConstruct, LoweringError,
                                NumbaNotImplementedError)
 from numba.core.lowering import BaseLower
@@ -32,6 +32,14 @@ class _Undefined:
 _UNDEFINED = _Undefined()
 
 
+def get_call_counter_name(fndesc):
+    """
+    Return the name of the global variable counting the calls to the
+    object mode function *fndesc* (see NUMBA_COUNT_OBJMODE_CALLS).
+    """
+    return ".NumbaObjModeCalls." + fndesc.mangled_name
+
+
 # Map operators to methods on the PythonAPI class
 PYTHON_BINOPMAP = {
     operator.add: ("number_add", False),
@@ -89,6 +97,22 @@ class PyLower(BaseLower):
     def pre_lower(self):
         super(PyLower, self).pre_lower()
         self.init_pyapi()
+        if config.COUNT_OBJMODE_CALLS:
+            self.count_call()
+
+    def count_call(self):
+        """
+        Increment the function's call counter (generators count each
+        resumption).
+        """
+        name = get_call_counter_name(self.fndesc)
+        counter = self.module.globals.get(name)
+        if counter is None:
+            counter = llvmlite.ir.GlobalVariable(self.module, cgutils.intp_t,
+                                                 name=name)
+            counter.initializer = cgutils.intp_t(0)
+        self.builder.atomic_rmw('add', counter, cgutils.intp_t(1),
+                                'monotonic')
 
     def post_lower(self):
         pass
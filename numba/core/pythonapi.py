@@ -1216,12 +1216,16 @@ class PythonAPI(object):
     # NRT (Numba runtime) APIs
     #
 
-    def nrt_adapt_ndarray_to_python(self, aryty, ary, dtypeptr):
+    def nrt_adapt_ndarray_to_python(self, aryty, ary, dtypeptr,
+                                    pytypeptr=None):
         assert self.context.enable_nrt, "NRT required"
 
         intty = ir.IntType(32)
-        # Embed the Python type of the array (maybe subclass) in the LLVM IR.
-        serial_aryty_pytype = self.unserialize(self.serialize_object(aryty.box_type))
+        if pytypeptr is None:
+            # Embed the Python type of the array (maybe subclass) in the
+            # LLVM IR.
+            pytypeptr = self.unserialize(
+                self.serialize_object(aryty.box_type))
 
         fnty = ir.FunctionType(self.pyobj,
                                [self.voidptr, self.pyobj, intty, intty, self.pyobj])
@@ -1234,7 +1238,7 @@ class PythonAPI(object):
         aryptr = cgutils.alloca_once_value(self.builder, ary)
         return self.builder.call(fn, [self.builder.bitcast(aryptr,
                                                            self.voidptr),
-                                      serial_aryty_pytype,
+                                      pytypeptr,
                                       ndim, writable, dtypeptr])
 
     def nrt_meminfo_new_from_pyobject(self, data, pyobj):
@@ -1561,6 +1565,11 @@ class PythonAPI(object):
         fn = self._get_function(fnty, name="numba_release_buffer")
         return self.builder.call(fn, [pbuf])
 
+    def memoryview_from_object(self, obj):
+        fnty = ir.FunctionType(self.pyobj, [self.pyobj])
+        fn = self._get_function(fnty, name="PyMemoryView_FromObject")
+        return self.builder.call(fn, [obj])
+
     def extract_np_datetime(self, obj):
         fnty = ir.FunctionType(ir.IntType(64), [self.pyobj])
         fn = self._get_function(fnty, name="numba_extract_np_datetime")
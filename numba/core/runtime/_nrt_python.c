@@ -138,6 +138,18 @@ MemInfo_dealloc(MemInfoObject *self)
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
+static PyTypeObject MemInfoType;
+
+/* Wrap *meminfo* into a new MemInfoObject, stealing a reference to it. */
+static MemInfoObject *
+MemInfo_wrap(NRT_MemInfo *meminfo)
+{
+    MemInfoObject *miobj = PyObject_New(MemInfoObject, &MemInfoType);
+    if (miobj != NULL)
+        miobj->meminfo = meminfo;
+    return miobj;
+}
+
 static PyMethodDef MemInfo_methods[] = {
     {"acquire", (PyCFunction)MemInfo_acquire, METH_NOARGS,
      "Increment the reference count"
@@ -367,7 +379,6 @@ NRT_adapt_ndarray_to_python_acqref(arystruct_t* arystruct, PyTypeObject *retty,
 {
     PyArrayObject *array;
     MemInfoObject *miobj = NULL;
-    PyObject *args;
     npy_intp *shape, *strides;
     int flags = 0;
 
@@ -377,6 +388,12 @@ NRT_adapt_ndarray_to_python_acqref(arystruct_t* arystruct, PyTypeObject *retty,
         return NULL;
     }
 
+    if (retty == NULL) {
+        PyErr_Format(PyExc_RuntimeError,
+                     "In 'NRT_adapt_ndarray_to_python', 'retty' is NULL");
+        return NULL;
+    }
+
     if (!NUMBA_PyArray_DescrCheck(descr)) {
         PyErr_Format(PyExc_TypeError,
                      "expected dtype object, got '%.200s'",
@@ -393,21 +410,15 @@ NRT_adapt_ndarray_to_python_acqref(arystruct_t* arystruct, PyTypeObject *retty,
 
     if (arystruct->meminfo) {
         /* wrap into MemInfoObject */
-        miobj = PyObject_New(MemInfoObject, &MemInfoType);
-        args = PyTuple_New(1);
-        /* SETITEM steals reference */
-        PyTuple_SET_ITEM(args, 0, PyLong_FromVoidPtr(arystruct->meminfo));
         NRT_Debug(nrt_debug_print("NRT_adapt_ndarray_to_python arystruct->meminfo=%p\n", arystruct->meminfo));
-        /*  Note: MemInfo_init() does not incref.  This function steals the
+        /*  Note: MemInfo_wrap() does not incref.  This function steals the
          *        NRT reference, which we need to acquire.
          */
+        miobj = MemInfo_wrap(arystruct->meminfo);
+        if (miobj == NULL)
+            return NULL;
         NRT_Debug(nrt_debug_print("NRT_adapt_ndarray_to_python_acqref created MemInfo=%p\n", miobj));
         NRT_MemInfo_acquire(arystruct->meminfo);
-        if (MemInfo_init(miobj, args, NULL)) {
-            NRT_Debug(nrt_debug_print("MemInfo_init failed.\n"));
-            return NULL;
-        }
-        Py_DECREF(args);
     }
 
     shape = arystruct->shape_and_strides;
@@ -417,8 +428,10 @@ NRT_adapt_ndarray_to_python_acqref(arystruct_t* arystruct, PyTypeObject *retty,
                                                    shape, strides, arystruct->data,
                                                    flags, (PyObject *) miobj);
 
-    if (array == NULL)
+    if (array == NULL) {
+        Py_XDECREF(miobj);
         return NULL;
+    }
 
     /* Set writable */
 #if NPY_API_VERSION >= 0x00000007
@@ -462,8 +475,18 @@ NRT_adapt_buffer_from_python(Py_buffer *buf, arystruct_t *arystruct)
     npy_intp *p;
 
     if (buf->obj) {
-        /* Allocate new MemInfo only if the buffer has a parent */
-        arystruct->meminfo = NRT_meminfo_new_from_pyobject((void*)buf->buf, buf->obj);
+        /* Allocate new MemInfo only if the buffer has a parent.  The MemInfo
+           owns a memoryview rather than the exporter itself, so that the
+           memory stays exported (e.g. a bytearray can't be resized) for as
+           long as the native array or an array boxed from it lives. */
+        PyObject *owner = PyMemoryView_FromObject(buf->obj);
+        if (owner == NULL) {
+            PyErr_Clear();
+            owner = buf->obj;
+            Py_INCREF(owner);
+        }
+        arystruct->meminfo = NRT_meminfo_new_from_pyobject((void*)buf->buf, owner);
+        Py_DECREF(owner);
     }
     arystruct->data = buf->buf;
     arystruct->itemsize = buf->itemsize;
@@ -474,8 +497,18 @@ NRT_adapt_buffer_from_python(Py_buffer *buf, arystruct_t *arystruct)
         *p = buf->shape[i];
         arystruct->nitems *= buf->shape[i];
     }
-    for (i = 0; i < buf->ndim; i++, p++) {
-        *p = buf->strides[i];
+    if (buf->strides != NULL) {
+        for (i = 0; i < buf->ndim; i++, p++) {
+            *p = buf->strides[i];
+        }
+    }
+    else {
+        /* The exporter may omit the strides of a C-contiguous buffer */
+        npy_intp stride = buf->itemsize;
+        for (i = buf->ndim - 1; i >= 0; i--) {
+            p[i] = stride;
+            stride *= buf->shape[i];
+        }
     }
 }
 
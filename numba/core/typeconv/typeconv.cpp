@@ -11,6 +11,18 @@
 TCCMap::TCCMap()
     : nb_records(0)
 {
+    for (size_t i = 0; i < TCCMAP_SIZE; ++i) {
+        records[i].store(NULL, std::memory_order_relaxed);
+    }
+}
+
+TCCMap::~TCCMap() {
+    for (size_t i = 0; i < TCCMAP_SIZE; ++i) {
+        delete records[i].load(std::memory_order_relaxed);
+    }
+    for (size_t i = 0; i < retired.size(); ++i) {
+        delete retired[i];
+    }
 }
 
 size_t TCCMap::hash(const TypePair &key) const {
@@ -20,23 +32,36 @@ size_t TCCMap::hash(const TypePair &key) const {
 
 void TCCMap::insert(const TypePair &key, TypeCompatibleCode val) {
     size_t i = hash(key) & (TCCMAP_SIZE - 1);
-    TCCMapBin &bin = records[i];
-    for (unsigned int j = 0; j < bin.size(); ++j) {
-        if (bin[j].key == key) {
-            bin[j].val = val;
-            return;
+    std::lock_guard<std::mutex> guard(write_lock);
+    const TCCMapBin *old = records[i].load(std::memory_order_relaxed);
+    TCCMapBin *bin = old ? new TCCMapBin(*old) : new TCCMapBin();
+    bool found = false;
+    for (unsigned int j = 0; j < bin->size(); ++j) {
+        if ((*bin)[j].key == key) {
+            (*bin)[j].val = val;
+            found = true;
+            break;
         }
     }
-    bin.push_back({key, val});
-    nb_records++;
+    if (!found) {
+        bin->push_back({key, val});
+        nb_records++;
+    }
+    records[i].store(bin, std::memory_order_release);
+    if (old) {
+        retired.push_back(old);
+    }
 }
 
 TypeCompatibleCode TCCMap::find(const TypePair &key) const {
     size_t i = hash(key) & (TCCMAP_SIZE - 1);
-    const TCCMapBin &bin = records[i];
-    for (unsigned int j = 0; j < bin.size(); ++j) {
-        if (bin[j].key == key) {
-            return bin[j].val;
+    const TCCMapBin *bin = records[i].load(std::memory_order_acquire);
+    if (bin == NULL) {
+        return TCC_FALSE;
+    }
+    for (unsigned int j = 0; j < bin->size(); ++j) {
+        if ((*bin)[j].key == key) {
+            return (*bin)[j].val;
         }
     }
     return TCC_FALSE;
@@ -1,5 +1,7 @@
 #ifndef NUMBA_TYPECONV_HPP_
 #define NUMBA_TYPECONV_HPP_
+#include <atomic>
+#include <mutex>
 #include <string>
 #include <vector>
 
@@ -32,18 +34,33 @@ struct TCCRecord {
 
 typedef std::vector<TCCRecord> TCCMapBin;
 
+/*
+ * A fixed-size hash map of type conversion codes.
+ *
+ * Lookups are lock-free so that overload resolution can run concurrently
+ * on free-threaded builds: a bin is never modified in place, insert()
+ * publishes an updated copy instead.  Superseded bins are kept alive until
+ * the map is destroyed, as readers may still be iterating over them
+ * (conversions are only registered a bounded number of times, at import).
+ */
 class TCCMap {
 public:
     TCCMap();
+    ~TCCMap();
 
     void insert(const TypePair &key, TypeCompatibleCode val);
     TypeCompatibleCode find(const TypePair &key) const;
 private:
+    TCCMap(const TCCMap &);
+    TCCMap &operator=(const TCCMap &);
+
     size_t hash(const TypePair &key) const;
 
     /* Must be a power of two */
     static const size_t TCCMAP_SIZE = 512;
-    TCCMapBin records[TCCMAP_SIZE];
+    std::atomic<const TCCMapBin *> records[TCCMAP_SIZE];
+    std::vector<const TCCMapBin *> retired;
+    std::mutex write_lock;
     int nb_records;
 };
 
@@ -3,6 +3,7 @@ Typing support for the buffer protocol (PEP 3118).
 """
 
 import array
+import sys
 
 from numba.core import types, config
 from numba.core.errors import NumbaValueError
@@ -12,6 +13,7 @@ _pep3118_int_types = set('bBhHiIlLqQnN')
 
 if config.USE_LEGACY_TYPE_SYSTEM: # Old type system
     _pep3118_scalar_map = {
+        '?': types.boolean,
         'f': types.float32,
         'd': types.float64,
         'Zf': types.complex64,
@@ -22,12 +24,21 @@ else: # New type system
         # TODO: FIXME We need to modify the following Map to use Python Types.
         # However currently here's nothing in Python types that maps
         # to a float32 or a complex64
+        '?': types.py_bool,
         # 'f': types.np_float32,
         'd': types.py_float, # 64-bit float
         # 'Zf': types.np_complex64,
         'Zd': types.py_complex, # 128-bit complex
         }
 
+# Byte order prefixes denoting the native byte order.  Exporters such as
+# ctypes arrays always give an explicit byte order.
+_pep3118_native_orders = set('@=')
+if sys.byteorder == 'little':
+    _pep3118_native_orders.add('<')
+else:
+    _pep3118_native_orders.update('>!')
+
 _type_map = {
     bytearray: types.ByteArray,
     array.array: types.PyArray,
@@ -43,6 +54,8 @@ def decode_pep3118_format(fmt, itemsize):
     *itemsize* (in bytes).
     """
     # XXX reuse _dtype_from_pep3118() from np.core._internal?
+    if fmt[:1] in _pep3118_native_orders:
+        fmt = fmt[1:]
     if fmt in _pep3118_int_types:
         # Determine int width and signedness
         name = 'int%d' % (itemsize * 8,)
@@ -50,10 +63,7 @@ def decode_pep3118_format(fmt, itemsize):
             name = 'u' + name
         return types.Integer(name)
     try:
-        # For the hard-coded types above, consider "=" the same as "@"
-        # (the default).  This is because Numpy sometimes adds "="
-        # in front of the PEP 3118 format string.
-        return _pep3118_scalar_map[fmt.lstrip('=')]
+        return _pep3118_scalar_map[fmt]
     except KeyError:
         raise NumbaValueError("unsupported PEP 3118 format %r" % (fmt,))
 
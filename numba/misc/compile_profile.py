@@ -0,0 +1,214 @@
+"""
+Profiling of the time spent compiling, broken down by compiled function, by
+compiler pass and by LLVM pass.
+"""
+
+import json
+import re
+import tracemalloc
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager, ExitStack
+from timeit import default_timer as timer
+
+from numba.core import config, event as ev
+
+
+# A profile record.  *kind* is "compile" for the compilation of a function as
+# a whole, "pass" for a compiler pass and "llvm" for an LLVM pass, *name*
+# is the pass name.  *time* includes the compilation of the other functions
+# the compiled function depends on, *self_time* excludes it.  *memory* is the
+# net amount of memory allocated by Python, or None when not measured.
+ProfileRecord = namedtuple(
+    "ProfileRecord",
+    ["function", "signature", "kind", "name", "time", "self_time", "memory"],
+)
+
+
+class _Frame(object):
+    __slots__ = ("function", "signature", "kind", "name", "start",
+                 "start_memory", "nested_time")
+
+    def __init__(self, function, signature, kind, name, start_memory):
+        self.function = function
+        self.signature = signature
+        self.kind = kind
+        self.name = name
+        self.start_memory = start_memory
+        self.nested_time = 0.0
+        self.start = timer()
+
+
+class _ProfileListener(ev.Listener):
+    """Turn the compile and pass events into profile records.
+    """
+
+    def __init__(self, profile, memory):
+        self._profile = profile
+        self._memory = memory
+        self._stack = []
+
+    def _traced_memory(self):
+        if self._memory:
+            return tracemalloc.get_traced_memory()[0]
+
+    def on_start(self, event):
+        data = event.data
+        if event.kind == "numba:compile":
+            py_func = data["dispatcher"].py_func
+            function = "%s.%s" % (py_func.__module__, py_func.__qualname__)
+            frame = _Frame(function, str(tuple(data["args"])), "compile", "",
+                           self._traced_memory())
+        else:
+            function = "%s.%s" % (data["module"], data["qualname"])
+            # Strip the " [qualname]" suffix of the event name
+            name = data["name"].rsplit(" [", 1)[0]
+            frame = _Frame(function, data["args"], "pass", name,
+                           self._traced_memory())
+        self._stack.append(frame)
+
+    def on_end(self, event):
+        frame = self._stack.pop()
+        duration = timer() - frame.start
+        memory = None
+        if self._memory:
+            memory = self._traced_memory() - frame.start_memory
+        records = self._profile.records
+        records.append(ProfileRecord(frame.function, frame.signature,
+                                     frame.kind, frame.name, duration,
+                                     duration - frame.nested_time, memory))
+        if event.kind == "numba:compile":
+            records.extend(self._llvm_records(frame, event.data))
+        # Exclude the time compiling this function from the self time of
+        # the function depending on it.
+        if self._stack and self._stack[-1].function != frame.function:
+            function = self._stack[-1].function
+            for parent in reversed(self._stack):
+                if parent.function != function:
+                    break
+                parent.nested_time += duration
+
+    def _llvm_records(self, frame, data):
+        cres = data["dispatcher"].overloads.get(tuple(data["args"]))
+        if cres is None or not cres.metadata:
+            return []
+        wall_times = defaultdict(float)
+        for named in cres.metadata.get("llvm_pass_timings") or ():
+            for rec in named.timings.list_records():
+                if rec.pass_name == "Total":
+                    continue
+                # Strip the instance number of passes run several times
+                name = re.sub(r" #\d+$", "", rec.pass_name)
+                wall_times[name] += rec.wall_time
+        return [ProfileRecord(frame.function, frame.signature, "llvm", name,
+                              wall_time, wall_time, None)
+                for name, wall_time in wall_times.items()]
+
+
+class CompilationProfile(object):
+    """The profile collected by ``profile_compilation()``.  The ``records``
+    attribute is the list of ``ProfileRecord`` instances, in completion
+    order.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def functions(self):
+        """Return a list of ``(function, signature, time, self_time)``
+        tuples, one per compiled overload, longest self time first.
+        """
+        compiled = {}
+        passes = defaultdict(lambda: [0.0, 0.0])
+        for rec in self.records:
+            key = rec.function, rec.signature
+            if rec.kind == "compile":
+                # Recompilations with other flags (e.g. object mode
+                # fallback) add up
+                time, self_time = compiled.get(key, (0.0, 0.0))
+                compiled[key] = time + rec.time, self_time + rec.self_time
+            elif rec.kind == "pass":
+                passes[key][0] += rec.time
+                passes[key][1] += rec.self_time
+        # Functions compiled outside of a dispatcher (e.g. inlined overloads)
+        # only have pass records.
+        for key, times in passes.items():
+            compiled.setdefault(key, tuple(times))
+        res = [key + times for key, times in compiled.items()]
+        return sorted(res, key=lambda row: row[3], reverse=True)
+
+    def passes(self):
+        """Return a list of ``(kind, name, self_time, count)`` tuples, one
+        per compiler or LLVM pass, longest total self time first.
+        """
+        totals = defaultdict(lambda: [0.0, 0])
+        for rec in self.records:
+            if rec.kind != "compile":
+                totals[rec.kind, rec.name][0] += rec.self_time
+                totals[rec.kind, rec.name][1] += 1
+        res = [key + tuple(total) for key, total in totals.items()]
+        return sorted(res, key=lambda row: row[2], reverse=True)
+
+    def table(self, by="function", limit=None):
+        """Return the profile as a text table, with one row per function if
+        *by* is "function", or one row per pass if *by* is "pass".  Only the
+        *limit* most expensive rows are shown, if given.
+        """
+        if by == "function":
+            header = ("Function", "Signature", "Time (s)", "Self (s)")
+            rows = [(fn, sig, "%.4f" % time, "%.4f" % self_time)
+                    for fn, sig, time, self_time in self.functions()]
+        elif by == "pass":
+            header = ("Kind", "Pass", "Self (s)", "Count")
+            rows = [(kind, name, "%.4f" % self_time, str(count))
+                    for kind, name, self_time, count in self.passes()]
+        else:
+            raise ValueError("by must be 'function' or 'pass', got %r"
+                             % (by,))
+        rows = [header] + rows[:limit]
+        widths = [max(len(row[i]) for row in rows)
+                  for i in range(len(header))]
+        lines = ["  ".join(cell.ljust(width)
+                           for cell, width in zip(row, widths)).rstrip()
+                 for row in rows]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def to_json(self):
+        """Return the profile records as a JSON string.
+        """
+        return json.dumps([rec._asdict() for rec in self.records], indent=1)
+
+    def __str__(self):
+        return self.table()
+
+
+@contextmanager
+def profile_compilation(memory=False, llvm_passes=True):
+    """Profile the compilations happening in the context, including the
+    nested compilations of the functions they depend on.  Yields a
+    ``CompilationProfile``, which is filled in as compilations complete.
+
+    If *memory* is true, the memory allocated by Python during each
+    compilation and pass is measured with ``tracemalloc``, which slows down
+    compilation.  If *llvm_passes* is true, the time of each LLVM pass is
+    also recorded, as with ``NUMBA_LLVM_PASS_TIMINGS``.
+
+    Example::
+
+        with numba.profile_compilation() as profile:
+            warm_up()
+        print(profile.table(limit=20))
+        print(profile.table(by="pass", limit=20))
+    """
+    profile = CompilationProfile()
+    listener = _ProfileListener(profile, memory)
+    with ExitStack() as scope:
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            scope.callback(tracemalloc.stop)
+        if llvm_passes and not config.LLVM_PASS_TIMINGS:
+            config.LLVM_PASS_TIMINGS = 1
+            scope.callback(setattr, config, "LLVM_PASS_TIMINGS", 0)
+        scope.enter_context(ev.install_listener("numba:compile", listener))
+        scope.enter_context(ev.install_listener("numba:run_pass", listener))
+        yield profile
@@ -8,6 +8,25 @@ from .numba_sysinfo import display_sysinfo, get_sysinfo
 from .numba_gdbinfo import display_gdbinfo
 
 
+_size_units = {'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30, 'T': 2 ** 40}
+
+
+def parse_size(text):
+    """Parse a size in bytes with an optional K, M, G or T suffix."""
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in _size_units:
+        return int(float(text[:-1]) * _size_units[text[-1]])
+    return int(text)
+
+
+def default_cache_dir():
+    from numba.core import config
+    from numba.misc.appdirs import AppDirs
+    if config.CACHE_DIR:
+        return config.CACHE_DIR
+    return AppDirs(appname="numba", appauthor=False).user_cache_dir
+
+
 def make_parser():
     parser = argparse.ArgumentParser()
     parser.add_argument('--annotate', help='Annotate source',
@@ -26,6 +45,22 @@ def make_parser():
                         help='Output system information about gdb')
     parser.add_argument('--sys-json', nargs=1,
                         help='Saves the system info dict as a json file')
+    parser.add_argument('--cache-gc', nargs='?', const='',
+                        metavar='CACHE_DIR',
+                        help='Remove the obsolete files from the cache '
+                             'directory (default: NUMBA_CACHE_DIR or the '
+                             'user-wide cache directory)')
+    parser.add_argument('--cache-max-size', type=parse_size, metavar='SIZE',
+                        help='With --cache-gc, evict the least recently '
+                             'used cache entries until the cache is smaller '
+                             'than SIZE bytes (K, M, G suffixes allowed)')
+    parser.add_argument('--precompile', metavar='PROFILE',
+                        help='Compile and cache the overloads recorded in '
+                             'the type profile PROFILE (see '
+                             'NUMBA_TYPE_PROFILE)')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='With --precompile, the number of worker '
+                             'processes (default: the number of CPUs)')
     parser.add_argument('filename', nargs='?', help='Python source filename')
     return parser
 
@@ -34,6 +69,9 @@ def main():
     parser = make_parser()
     args = parser.parse_args()
 
+    if args.cache_max_size is not None and args.cache_gc is None:
+        parser.error("--cache-max-size requires --cache-gc")
+
     if args.sysinfo:
         print("System info:")
         display_sysinfo()
@@ -45,6 +83,24 @@ def main():
     if args.sysinfo or args.gdbinfo:
         sys.exit(0)
 
+    if args.cache_gc is not None:
+        from numba.core.caching import CacheManager
+        manager = CacheManager(args.cache_gc or default_cache_dir())
+        removed = manager.gc(max_size=args.cache_max_size)
+        for path in removed:
+            print("removed %s" % path)
+        print("Cache %s: %d files removed, %d bytes remaining"
+              % (manager.path, len(removed), manager.size()))
+        sys.exit(0)
+
+    if args.precompile:
+        from numba.core.caching import precompile
+        items = precompile(args.precompile, workers=args.workers)
+        for disp, sig in items:
+            print("compiled %s.%s%s" % (disp.py_func.__module__,
+                                        disp.py_func.__qualname__, sig))
+        sys.exit(0)
+
     if args.sys_json:
         info = get_sysinfo()
         info.update({'Start': info['Start'].isoformat()})
@@ -12,6 +12,13 @@
 #include <stdint.h>
 #include "gufunc_scheduler.h"
 
+#if defined(_WIN32)
+#include <windows.h>
+#elif defined(__linux__)
+#include <pthread.h>
+#include <sched.h>
+#endif
+
 #ifdef _MSC_VER
 #define THREAD_LOCAL(ty) __declspec(thread) ty
 #else
@@ -21,6 +28,13 @@
 
 // Default 0 value means one evenly-sized chunk of work per worker thread.
 static THREAD_LOCAL(uintp) parallel_chunksize = 0;
+// The policy used by parallel_for() to distribute the schedule entries
+// among the threads.
+static THREAD_LOCAL(int) parallel_schedule = PARALLEL_SCHEDULE_STATIC;
+
+// The CPU each thread of the pool is pinned to, indexed by thread number.
+// Empty when the threads are not pinned.
+static std::vector<int> thread_cpus;
 
 // round not available on VS2010.
 double guround (double number) {
@@ -110,13 +124,63 @@ extern "C" uintp get_parallel_chunksize() {
     return parallel_chunksize;
 }
 
+extern "C" int set_parallel_schedule(int schedule) {
+    int orig = parallel_schedule;
+    parallel_schedule = schedule;
+    return orig;
+}
+
+extern "C" int get_parallel_schedule() {
+    return parallel_schedule;
+}
+
+extern "C" void set_thread_affinity(int *cpus, int count) {
+    thread_cpus.assign(cpus, cpus + count);
+}
+
+extern "C" int has_thread_affinity() {
+    return !thread_cpus.empty();
+}
+
+// Pins the calling thread to the CPU of thread number index, the CPU list
+// wraps around if there are more threads than CPUs.  Returns 0 on success.
+extern "C" int pin_thread(int index) {
+    if (thread_cpus.empty()) {
+        return 0;
+    }
+    int cpu = thread_cpus[index % thread_cpus.size()];
+#if defined(_WIN32)
+    if (cpu >= (int)(sizeof(DWORD_PTR) * 8)) {
+        return -1;
+    }
+    DWORD_PTR mask = (DWORD_PTR)1 << cpu;
+    return SetThreadAffinityMask(GetCurrentThread(), mask) == 0 ? -1 : 0;
+#elif defined(__linux__)
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    CPU_SET(cpu, &set);
+    return pthread_setaffinity_np(pthread_self(), sizeof(set), &set);
+#else
+    // Thread affinity is not supported on this platform
+    return -1;
+#endif
+}
+
 extern "C" uintp get_sched_size(uintp num_threads, uintp num_dim, intp *starts, intp *ends) {
-    if (parallel_chunksize == 0) {
+    if (parallel_chunksize == 0 && parallel_schedule == PARALLEL_SCHEDULE_STATIC) {
         return num_threads;
     }
     RangeActual ra(num_dim, starts, ends);
     uintp total_work_size = ra.total_size();
-    uintp num_divisions = total_work_size / parallel_chunksize;
+    uintp num_divisions;
+    if (parallel_chunksize == 0) {
+        // Dynamic policies need more entries than threads to balance the
+        // load, but not more than there are iterations.
+        num_divisions = std::min(total_work_size,
+                                 num_threads * DYNAMIC_DIVISIONS_PER_THREAD);
+    } else {
+        num_divisions = total_work_size / parallel_chunksize;
+    }
     return num_divisions < num_threads ? num_threads : num_divisions;
 }
 
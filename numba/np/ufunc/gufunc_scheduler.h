@@ -33,6 +33,17 @@
     #define uintp unsigned
 #endif
 
+/* Policies for distributing the schedule entries among the threads, see
+   set_parallel_schedule().  The values must be kept in sync with
+   PARALLEL_SCHEDULES in numba/core/cpu_options.py. */
+#define PARALLEL_SCHEDULE_STATIC 0
+#define PARALLEL_SCHEDULE_DYNAMIC 1
+#define PARALLEL_SCHEDULE_GUIDED 2
+
+/* Number of schedule entries per thread for the dynamic policies, when no
+   chunksize is set */
+#define DYNAMIC_DIVISIONS_PER_THREAD 16
+
 #ifdef __cplusplus
 extern "C"
 {
@@ -42,9 +53,14 @@ void do_scheduling_signed(uintp num_dim, intp *starts, intp *ends, uintp num_thr
 void do_scheduling_unsigned(uintp num_dim, intp *starts, intp *ends, uintp num_threads, uintp *sched, intp debug);
 uintp set_parallel_chunksize(uintp);
 uintp get_parallel_chunksize(void);
+int set_parallel_schedule(int);
+int get_parallel_schedule(void);
 uintp get_sched_size(uintp num_threads, uintp num_dim, intp *starts, intp *ends);
 intp * allocate_sched(uintp sched_size);
 void deallocate_sched(intp * sched);
+void set_thread_affinity(int *cpus, int count);
+int has_thread_affinity(void);
+int pin_thread(int index);
 
 #ifdef __cplusplus
 }
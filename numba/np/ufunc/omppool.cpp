@@ -136,6 +136,9 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     // but present to force thinking about the scope of validity
     int agreed_nthreads = num_threads;
 
+    // take the policy of this region, nested regions default to static
+    const int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
+
     if(_DEBUG)
     {
         printf("inner_ndim: %zu\n",inner_ndim);
@@ -153,6 +156,15 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
         printf("\n");
     }
 
+    // A region with a single schedule entry outside of any OpenMP region is
+    // not worth waking the team for, the caller is thread 0 so run it here.
+    if (size == 1 && omp_get_level() == 0)
+    {
+        func(args, dimensions, steps, data);
+        set_parallel_schedule(schedule);
+        return;
+    }
+
     // Set the thread mask on the pragma such that the state is scope limited
     // and passed via a register on the OMP region call site, this limiting
     // global state and racing
@@ -164,8 +176,8 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
         // tell the active thread team about the number of threads
         set_num_threads(agreed_nthreads);
 
-        #pragma omp for
-        for(ptrdiff_t r = 0; r < size; r++)
+        // Runs the schedule entry r
+        auto run_entry = [&](ptrdiff_t r)
         {
             memcpy(count_space, dimensions, arg_len * sizeof(size_t));
             count_space[0] = 1;
@@ -203,8 +215,30 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
                 printf("\n");
             }
             func(array_arg_space, count_space, steps, data);
+        };
+
+        if (schedule == PARALLEL_SCHEDULE_DYNAMIC)
+        {
+            #pragma omp for schedule(dynamic)
+            for(ptrdiff_t r = 0; r < size; r++)
+                run_entry(r);
+        }
+        else if (schedule == PARALLEL_SCHEDULE_GUIDED)
+        {
+            #pragma omp for schedule(guided)
+            for(ptrdiff_t r = 0; r < size; r++)
+                run_entry(r);
+        }
+        else
+        {
+            // Explicitly static so that the same entries go to the same
+            // thread numbers in consecutive regions
+            #pragma omp for schedule(static)
+            for(ptrdiff_t r = 0; r < size; r++)
+                run_entry(r);
         }
     }
+    set_parallel_schedule(schedule);
 }
 
 static void launch_threads(int count)
@@ -227,6 +261,19 @@ static void launch_threads(int count)
     omp_set_num_threads(count);
     omp_set_nested(0x1); // enable nesting, control depth with OMP env var
     _INIT_NUM_THREADS = count;
+
+    // Pin the threads of the team, OpenMP keeps the same threads for the
+    // same thread numbers across regions.  The calling thread (number 0) is
+    // left alone, it belongs to the application.
+    if (has_thread_affinity())
+    {
+        #pragma omp parallel num_threads(count)
+        {
+            int tid = omp_get_thread_num();
+            if (tid != 0)
+                pin_thread(tid);
+        }
+    }
 }
 
 static void synchronize(void)
@@ -256,9 +303,12 @@ MOD_INIT(omppool)
     SetAttrStringFromVoidPointer(m, get_thread_id);
     SetAttrStringFromVoidPointer(m, set_parallel_chunksize);
     SetAttrStringFromVoidPointer(m, get_parallel_chunksize);
+    SetAttrStringFromVoidPointer(m, set_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, get_parallel_schedule);
     SetAttrStringFromVoidPointer(m, get_sched_size);
     SetAttrStringFromVoidPointer(m, allocate_sched);
     SetAttrStringFromVoidPointer(m, deallocate_sched);
+    SetAttrStringFromVoidPointer(m, set_thread_affinity);
 
     PyObject *tmp = PyString_FromString(_OMP_VENDOR);
     PyObject_SetAttrString(m, "openmp_vendor", tmp);
@@ -378,6 +378,116 @@ def _check_tbb_version_compatible():
         raise ImportError("Problem with TBB. Reason: %s" % e)
 
 
+def _parse_cpu_list(spec):
+    """
+    Parses a list of CPUs such as "0,2,4-7" into a list of CPU numbers.
+    """
+    cpus = []
+    for item in spec.split(','):
+        bounds = item.strip().split('-')
+        try:
+            if len(bounds) == 1:
+                cpus.append(int(bounds[0]))
+            elif len(bounds) == 2:
+                cpus.extend(range(int(bounds[0]), int(bounds[1]) + 1))
+            else:
+                raise ValueError
+        except ValueError:
+            msg = "Invalid CPU list entry %r in %r" % (item, spec)
+            raise ValueError(msg) from None
+    if any(cpu < 0 for cpu in cpus):
+        raise ValueError("Invalid CPU list %r, CPUs must be >= 0" % spec)
+    return cpus
+
+
+def _available_cpus():
+    """
+    Returns the sorted CPUs this process may run on.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _cpu_topology(cpu):
+    """
+    Returns the (package, core) of the given CPU, as reported by Linux, or
+    (0, cpu) when the topology is unknown.
+    """
+    path = '/sys/devices/system/cpu/cpu%d/topology' % cpu
+    try:
+        with open(os.path.join(path, 'physical_package_id')) as f:
+            package = int(f.read())
+        with open(os.path.join(path, 'core_id')) as f:
+            core = int(f.read())
+    except (OSError, ValueError):
+        return 0, cpu
+    return package, core
+
+
+def _get_thread_affinity(spec, num_threads):
+    """
+    Returns the CPU each of the *num_threads* threads is pinned to for the
+    NUMBA_THREAD_AFFINITY value *spec*, or None if threads are not pinned.
+
+    * "compact" fills the cores of a package before moving to the next one.
+    * "scatter" spreads consecutive threads over the packages, and over the
+      cores of a package before using their other hardware threads.
+    * an explicit list of CPUs such as "0,2,4-7".
+
+    In all cases the CPUs are reused if there are more threads than CPUs.
+    """
+    spec = spec.strip().lower()
+    if not spec:
+        return None
+    available = _available_cpus()
+    if spec in ('compact', 'scatter'):
+        topology = {cpu: _cpu_topology(cpu) for cpu in available}
+        if spec == 'compact':
+            cpus = sorted(available, key=lambda cpu: topology[cpu] + (cpu,))
+        else:
+            # Rank of each CPU among the hardware threads of its core
+            rank = {}
+            seen = {}
+            for cpu in available:
+                rank[cpu] = seen.get(topology[cpu], 0)
+                seen[topology[cpu]] = rank[cpu] + 1
+            packages = {}
+            for cpu in sorted(available,
+                              key=lambda cpu: (rank[cpu], topology[cpu][1])):
+                packages.setdefault(topology[cpu][0], []).append(cpu)
+            # Round robin over the packages
+            groups = [packages[k] for k in sorted(packages)]
+            cpus = [group[i] for i in range(max(map(len, groups)))
+                    for group in groups if i < len(group)]
+    else:
+        cpus = _parse_cpu_list(spec)
+        unavailable = sorted(set(cpus) - set(available))
+        if unavailable:
+            msg = ("NUMBA_THREAD_AFFINITY lists CPUs %s that this process "
+                   "cannot run on, available CPUs are %s")
+            raise ValueError(msg % (unavailable, available))
+    return [cpus[i % len(cpus)] for i in range(num_threads)]
+
+
+def _set_thread_affinity(lib):
+    """
+    Passes the CPUs to pin the threads to, from NUMBA_THREAD_AFFINITY, to the
+    threading layer *lib*, before it launches its threads.
+    """
+    cpus = _get_thread_affinity(config.THREAD_AFFINITY, NUM_THREADS)
+    if cpus is None:
+        return
+    if not (_IS_LINUX or _IS_WINDOWS):
+        msg = ("NUMBA_THREAD_AFFINITY is not supported on this platform, "
+               "threads will not be pinned.")
+        warnings.warn(msg, errors.NumbaWarning)
+        return
+    set_thread_affinity = CFUNCTYPE(None, POINTER(c_int),
+                                    c_int)(lib.set_thread_affinity)
+    set_thread_affinity((c_int * len(cpus))(*cpus), len(cpus))
+
+
 def _launch_threads():
     if not _backend_init_process_lock:
         _set_init_process_lock()
@@ -520,6 +630,12 @@ def _launch_threads():
             ll.add_symbol('allocate_sched', lib.allocate_sched)
             ll.add_symbol('deallocate_sched', lib.deallocate_sched)
 
+            if libname == 'workqueue':
+                set_spin_count = CFUNCTYPE(None, c_int)(lib.set_spin_count)
+                set_spin_count(config.WORKQUEUE_SPIN_COUNT)
+
+            _set_thread_affinity(lib)
+
             launch_threads = CFUNCTYPE(None, c_int)(lib.launch_threads)
             launch_threads(NUM_THREADS)
 
@@ -550,6 +666,7 @@ def _load_threading_functions(lib):
     ll.add_symbol('set_parallel_chunksize', lib.set_parallel_chunksize)
     ll.add_symbol('get_parallel_chunksize', lib.get_parallel_chunksize)
     ll.add_symbol('get_sched_size', lib.get_sched_size)
+    ll.add_symbol('set_parallel_schedule', lib.set_parallel_schedule)
     global _set_parallel_chunksize
     _set_parallel_chunksize = CFUNCTYPE(c_uint,
                                         c_uint)(lib.set_parallel_chunksize)
@@ -17,6 +17,7 @@ Implement parallel vectorize workqueue on top of Intel TBB.
 #include <string.h>
 #include <stdio.h>
 #include <thread>
+#include <atomic>
 #include "workqueue.h"
 
 #include "gufunc_scheduler.h"
@@ -99,6 +100,30 @@ void fix_tls_observer::on_scheduler_entry(bool worker) {
     set_num_threads(mask_val);
 }
 
+// watch all the arenas, pin each worker thread to a CPU the first time it
+// joins one, in order of arrival. Number 0 is the calling thread, which is
+// left alone as it belongs to the application.
+class pin_threads_observer: public tbb::task_scheduler_observer {
+    std::atomic<int> next_index{1};
+    void on_scheduler_entry( bool is_worker ) override;
+public:
+    pin_threads_observer() : tbb::task_scheduler_observer()
+    {
+        observe(true);
+    }
+};
+
+static THREAD_LOCAL(bool) thread_is_pinned = false;
+static pin_threads_observer *pin_observer = NULL;
+
+void pin_threads_observer::on_scheduler_entry(bool worker) {
+    if (worker && !thread_is_pinned)
+    {
+        pin_thread(next_index++);
+        thread_is_pinned = true;
+    }
+}
+
 static void
 add_task(void *fn, void *args, void *dims, void *steps, void *data)
 {
@@ -144,6 +169,19 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
         printf("\n");
     }
 
+    // A region with a single schedule entry outside of any task_arena is not
+    // worth creating an arena for, the caller has thread id 0 so run it here.
+    if (dimensions[0] == 1 &&
+        tbb::this_task_arena::current_thread_index() ==
+            tbb::task_arena::not_initialized)
+    {
+        const int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
+        auto func = reinterpret_cast<void (*)(char **args, size_t *dims, size_t *steps, void *data)>(fn);
+        func(args, dimensions, steps, data);
+        set_parallel_schedule(schedule);
+        return;
+    }
+
     // This is making the assumption that the calling thread knows the truth
     // about num_threads, which should be correct via the following:
     // program starts/reinits and the threadpool launches, num_threads TLS is
@@ -155,12 +193,16 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     // doing any work. Any further call to query the TLS slot value made by any
     // thread in the arena is then safe and were any thread to create a nested
     // parallel region the same logic applies as per program start/reinit.
+
     tbb::task_arena limited(num_threads);
     fix_tls_observer observer(limited, num_threads);
 
+    // take the policy of this region, nested regions default to static
+    const int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
+
     limited.execute([&]{
         using range_t = tbb::blocked_range<size_t>;
-        tbb::parallel_for(range_t(0, dimensions[0]), [=](const range_t &range)
+        auto run_range = [=](const range_t &range)
         {
             size_t * count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
             char ** array_arg_space = (char**)alloca(sizeof(char*) * array_count);
@@ -201,8 +243,29 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
             }
             auto func = reinterpret_cast<void (*)(char **args, size_t *dims, size_t *steps, void *data)>(fn);
             func(array_arg_space, count_space, steps, data);
-        });
+        };
+        if (schedule == PARALLEL_SCHEDULE_DYNAMIC)
+        {
+            // One task per schedule entry, balanced by work stealing
+            tbb::parallel_for(range_t(0, dimensions[0], 1), run_range,
+                              tbb::simple_partitioner());
+        }
+        else if (schedule == PARALLEL_SCHEDULE_STATIC &&
+                 has_thread_affinity())
+        {
+            // With pinned threads, favour the same subranges going to the
+            // same threads in consecutive regions over load balancing.
+            tbb::parallel_for(range_t(0, dimensions[0]), run_range,
+                              tbb::static_partitioner());
+        }
+        else
+        {
+            // The auto partitioner already adapts the task sizes to the
+            // load, which is what the guided policy asks for.
+            tbb::parallel_for(range_t(0, dimensions[0]), run_range);
+        }
     });
+    set_parallel_schedule(schedule);
 }
 
 static std::thread::id init_thread_id;
@@ -296,6 +359,11 @@ static void launch_threads(int count)
     tsh = tbb::attach();
     tsh_was_initialized = true;
 
+    if (has_thread_affinity() && !pin_observer)
+    {
+        pin_observer = new pin_threads_observer; // this memory will leak
+    }
+
     tg = new tbb::task_group;
     tg->run([] {}); // start creating threads asynchronously
 
@@ -341,9 +409,12 @@ MOD_INIT(tbbpool)
     SetAttrStringFromVoidPointer(m, get_thread_id);
     SetAttrStringFromVoidPointer(m, set_parallel_chunksize);
     SetAttrStringFromVoidPointer(m, get_parallel_chunksize);
+    SetAttrStringFromVoidPointer(m, set_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, get_parallel_schedule);
     SetAttrStringFromVoidPointer(m, get_sched_size);
     SetAttrStringFromVoidPointer(m, allocate_sched);
     SetAttrStringFromVoidPointer(m, deallocate_sched);
+    SetAttrStringFromVoidPointer(m, set_thread_affinity);
 
     return MOD_SUCCESS_VAL(m);
 }
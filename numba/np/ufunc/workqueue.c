@@ -52,8 +52,10 @@ race conditions.
  * states.
  */
 /* This variable is the nesting level, it's incremented at the start of each
- * parallel region and decremented at the end, if parallel regions are nested
- * on entry the value == 1 and workqueue will abort (this in preference to just
+ * parallel region and decremented at the end. Parallel regions nested in
+ * another one are run serially by the worker thread that launches them, so if
+ * the value == 1 on entry from any other thread, the thread pool is being
+ * accessed concurrently and workqueue will abort (this in preference to just
  * hanging or segfaulting).
  */
 static int _nesting_level = 0;
@@ -63,7 +65,8 @@ static int _nesting_level = 0;
 static void reset_after_fork(void);
 
 static void
-add_task_internal(void *fn, void *args, void *dims, void *steps, void *data, int tid);
+add_task_internal(void *fn, void *args, void *dims, void *steps, void *data,
+                  int tid, int num_threads);
 
 /* PThread */
 #ifdef NUMBA_PTHREAD
@@ -157,6 +160,40 @@ platform_launch(void)
     pthread_key_create(&tidkey, NULL);
 }
 
+static size_t
+atomic_fetch_add_size(size_t *ptr, size_t val)
+{
+    return __atomic_fetch_add(ptr, val, __ATOMIC_RELAXED);
+}
+
+static size_t
+atomic_load_size(size_t *ptr)
+{
+    return __atomic_load_n(ptr, __ATOMIC_RELAXED);
+}
+
+static int
+atomic_load_int(int *ptr)
+{
+    return __atomic_load_n(ptr, __ATOMIC_ACQUIRE);
+}
+
+static void
+atomic_store_int(int *ptr, int val)
+{
+    __atomic_store_n(ptr, val, __ATOMIC_RELEASE);
+}
+
+static void
+cpu_relax(void)
+{
+#if defined(__x86_64__) || defined(__i386__)
+    __builtin_ia32_pause();
+#elif defined(__aarch64__) || defined(__arm__)
+    __asm__ __volatile__("yield");
+#endif
+}
+
 #endif /* pthread threading */
 
 /* Win Thread */
@@ -262,6 +299,42 @@ platform_launch(void)
     tidkey = TlsAlloc();
 }
 
+static size_t
+atomic_fetch_add_size(size_t *ptr, size_t val)
+{
+#ifdef _WIN64
+    return (size_t)InterlockedExchangeAdd64((volatile LONG64 *)ptr,
+                                            (LONG64)val);
+#else
+    return (size_t)InterlockedExchangeAdd((volatile LONG *)ptr, (LONG)val);
+#endif
+}
+
+static size_t
+atomic_load_size(size_t *ptr)
+{
+    /* Aligned loads are atomic on Windows platforms */
+    return *(volatile size_t *)ptr;
+}
+
+static int
+atomic_load_int(int *ptr)
+{
+    return InterlockedCompareExchange((volatile LONG *)ptr, 0, 0);
+}
+
+static void
+atomic_store_int(int *ptr, int val)
+{
+    InterlockedExchange((volatile LONG *)ptr, (LONG)val);
+}
+
+static void
+cpu_relax(void)
+{
+    YieldProcessor();
+}
+
 #endif /* Windows threading */
 
 typedef struct Task
@@ -269,6 +342,8 @@ typedef struct Task
     void (*func)(void *args, void *dims, void *steps, void *data);
     void *args, *dims, *steps, *data;
     int tid;
+    // Thread mask of the region the task belongs to, 0 to leave it as is
+    int num_threads;
 } Task;
 
 typedef struct
@@ -284,17 +359,29 @@ static int queue_count;
 static int queue_pivot = 0;
 static int NUM_THREADS = -1;
 
+// Number of times a thread polls a queue state before parking on the
+// condition variable, see set_spin_count().
+static int spin_count = 0;
+
 static void
 queue_state_wait(Queue *queue, int old, int repl)
 {
     queue_condition_t *cond = &queue->cond;
+    int i;
+
+    // Spin first, a state change arriving within the window then costs
+    // neither the sleep nor the wake up of the thread.
+    for (i = 0; i < spin_count && atomic_load_int(&queue->state) != old; i++)
+    {
+        cpu_relax();
+    }
 
     queue_condition_lock(cond);
     while (queue->state != old)
     {
         queue_condition_wait(cond);
     }
-    queue->state = repl;
+    atomic_store_int(&queue->state, repl);
     queue_condition_signal(cond);
     queue_condition_unlock(cond);
 }
@@ -318,6 +405,9 @@ static int _INIT_NUM_THREADS = -1;
 // This is the per-thread thread mask, each thread can carry its own mask.
 static THREAD_LOCAL(int) _TLS_num_threads = 0;
 
+// Whether the current thread is a worker of the thread pool.
+static THREAD_LOCAL(int) _TLS_is_worker = 0;
+
 static void
 set_num_threads(int count)
 {
@@ -349,16 +439,68 @@ get_num_threads(void)
 }
 
 
-// this complies to a launchable function from `add_task` like:
-// add_task(nopfn, NULL, NULL, NULL, NULL)
-// useful if you want to limit the number of threads locally
-// static void nopfn(void *args, void *dims, void *steps, void *data) {};
+static void
+set_spin_count(int count)
+{
+    spin_count = count < 0 ? 0 : count;
+}
 
 
-// synchronize the TLS num_threads slot to value args[0]
-static void sync_tls(void *args, void *dims, void *steps, void *data) {
-    int nthreads = *((int *)(args));
-    _TLS_num_threads = nthreads;
+// State shared by the threads of a parallel_for() using a dynamic policy
+typedef struct
+{
+    void *fn;
+    char **args;
+    size_t *dimensions;
+    size_t *steps;
+    void *data;
+    size_t arg_len;
+    size_t array_count;
+    size_t total;
+    size_t num_threads;
+    int schedule;
+    // Index of the next unclaimed schedule entry
+    size_t next;
+} dynamic_state_t;
+
+// Run by every thread under the dynamic and guided policies: claim schedule
+// entries from the shared counter until they run out, so that threads
+// finishing early take over the remaining work.
+static void dynamic_task(void *args, void *dims, void *steps, void *data) {
+    dynamic_state_t *state = (dynamic_state_t *)args;
+    size_t *count_space = alloca(sizeof(size_t) * state->arg_len);
+    char **array_arg_space = alloca(sizeof(char*) * state->array_count);
+    void (*func)(char **, size_t *, size_t *, void *) = state->fn;
+    size_t start, count, j;
+
+    memcpy(count_space, state->dimensions, state->arg_len * sizeof(size_t));
+    for (;;)
+    {
+        count = 1;
+        if (state->schedule == PARALLEL_SCHEDULE_GUIDED)
+        {
+            // Claim a share of the remaining entries, which decreases as
+            // the loop progresses
+            start = atomic_load_size(&state->next);
+            if (start >= state->total)
+                break;
+            count = (state->total - start) / (2 * state->num_threads);
+            if (count < 1)
+                count = 1;
+        }
+        start = atomic_fetch_add_size(&state->next, count);
+        if (start >= state->total)
+            break;
+        if (count > state->total - start)
+            count = state->total - start;
+
+        count_space[0] = count;
+        for (j = 0; j < state->array_count; j++)
+        {
+            array_arg_space[j] = state->args[j] + state->steps[j] * start;
+        }
+        func(array_arg_space, count_space, state->steps, state->data);
+    }
 };
 
 
@@ -372,17 +514,34 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     //     steps = <ir.Argument '.3' of type i64*>
     //     data = <ir.Argument '.4' of type i8*>
 
-    // check the nesting level, if it's already 1, abort, workqueue cannot
-    // handle nesting.
+    // A region nested in another one is launched by a worker thread while
+    // all the workers are busy with the enclosing region, and a region with a
+    // single schedule entry is not worth waking the workers for: run these
+    // serially on the calling thread, as a team of one thread.
+    if (_TLS_is_worker || dimensions[0] == 1)
+    {
+        int tid = get_thread_id();
+        int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
+        void (*func)(char **, size_t *, size_t *, void *) = fn;
+
+        set_thread_id(0);
+        func(args, dimensions, steps, data);
+        set_thread_id(tid);
+        set_parallel_schedule(schedule);
+        return;
+    }
+
+    // check the nesting level, if it's already 1 the pool is being used by
+    // another thread, abort, workqueue cannot handle concurrent access.
     if (_nesting_level >= 1){
         fprintf(stderr, "%s", "Numba workqueue threading layer is terminating: "
                               "Concurrent access has been detected.\n\n"
                               " - The workqueue threading layer is not "
                               "threadsafe and may not be accessed concurrently "
                               "by multiple threads. Concurrent access "
-                              "typically occurs through a nested parallel "
-                              "region launch or by calling Numba parallel=True "
-                              "functions from multiple Python threads.\n"
+                              "typically occurs by calling Numba "
+                              "parallel=True functions from multiple Python "
+                              "threads.\n"
                               " - Try using the TBB threading layer as an "
                               "alternative, as it is, itself, threadsafe. "
                               "Docs: https://numba.readthedocs.io/en/stable/user/threading-layer.html\n\n");
@@ -393,6 +552,10 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     // increment the nest level
     _nesting_level += 1;
 
+    // take the policy of this region, nested regions default to static
+    int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
+    dynamic_state_t dynamic_state;
+
     size_t * count_space = NULL;
     char ** array_arg_space = NULL;
     const size_t arg_len = (inner_ndim + 1);
@@ -439,85 +602,101 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
         }
     }
 
-    // sync the thread pool TLS slots, sync all slots, we don't know which
-    // threads will end up running.
-    for (i = 0; i < NUM_THREADS; i++)
-    {
-        add_task_internal(sync_tls, (void *)(&num_threads), NULL, NULL, NULL, i);
-    }
-    ready();
-    synchronize();
-
     // This backend isn't threadsafe so just mutate the global
     old_queue_count = queue_count;
     queue_count = num_threads;
 
-    for (i = 0; i < num_threads; i++)
+    if (schedule != PARALLEL_SCHEDULE_STATIC)
     {
-        count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
-        memcpy(count_space, dimensions, arg_len * sizeof(size_t));
-        if(i == num_threads - 1)
+        dynamic_state.fn = fn;
+        dynamic_state.args = args;
+        dynamic_state.dimensions = dimensions;
+        dynamic_state.steps = steps;
+        dynamic_state.data = data;
+        dynamic_state.arg_len = arg_len;
+        dynamic_state.array_count = array_count;
+        dynamic_state.total = total;
+        dynamic_state.num_threads = num_threads;
+        dynamic_state.schedule = schedule;
+        dynamic_state.next = 0;
+        for (i = 0; i < num_threads; i++)
         {
-            // Last thread takes all leftover
-            count_space[0] = remain;
+            add_task_internal(dynamic_task, (void *)&dynamic_state, NULL, NULL,
+                              NULL, i, num_threads);
         }
-        else
-        {
-            count_space[0] = count;
-            remain = remain - count;
-        }
-
-        if(_DEBUG)
+    }
+    else
+    {
+        for (i = 0; i < num_threads; i++)
         {
-            printf("\n=================== THREAD %d ===================\n", i);
-            printf("\ncount_space: ");
-            for(j = 0; j < arg_len; j++)
+            count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
+            memcpy(count_space, dimensions, arg_len * sizeof(size_t));
+            if(i == num_threads - 1)
             {
-                printf("%zd, ", count_space[j]);
+                // Last thread takes all leftover
+                count_space[0] = remain;
+            }
+            else
+            {
+                count_space[0] = count;
+                remain = remain - count;
             }
-            printf("\n");
-        }
-
-        array_arg_space = alloca(sizeof(char*) * array_count);
-
-        for(j = 0; j < array_count; j++)
-        {
-            base = args[j];
-            step = steps[j];
-            offset = step * count * i;
-            array_arg_space[j] = (char *)(base + offset);
 
             if(_DEBUG)
             {
-                printf("Index %zd\n", j);
-                printf("-->Got base %p\n", (void *)base);
-                printf("-->Got step %zd\n", step);
-                printf("-->Got offset %td\n", offset);
-                printf("-->Got addr %p\n", (void *)array_arg_space[j]);
+                printf("\n=================== THREAD %d ===================\n", i);
+                printf("\ncount_space: ");
+                for(j = 0; j < arg_len; j++)
+                {
+                    printf("%zd, ", count_space[j]);
+                }
+                printf("\n");
             }
-        }
 
-        if(_DEBUG)
-        {
-            printf("\narray_arg_space: ");
+            array_arg_space = alloca(sizeof(char*) * array_count);
+
             for(j = 0; j < array_count; j++)
             {
-                printf("%p, ", (void *)array_arg_space[j]);
+                base = args[j];
+                step = steps[j];
+                offset = step * count * i;
+                array_arg_space[j] = (char *)(base + offset);
+
+                if(_DEBUG)
+                {
+                    printf("Index %zd\n", j);
+                    printf("-->Got base %p\n", (void *)base);
+                    printf("-->Got step %zd\n", step);
+                    printf("-->Got offset %td\n", offset);
+                    printf("-->Got addr %p\n", (void *)array_arg_space[j]);
+                }
+            }
+
+            if(_DEBUG)
+            {
+                printf("\narray_arg_space: ");
+                for(j = 0; j < array_count; j++)
+                {
+                    printf("%p, ", (void *)array_arg_space[j]);
+                }
             }
+            add_task_internal(fn, (void *)array_arg_space, (void *)count_space,
+                              steps, data, i, num_threads);
         }
-        add_task_internal(fn, (void *)array_arg_space, (void *)count_space, steps, data, i);
     }
 
     ready();
     synchronize();
 
     queue_count = old_queue_count;
+    set_parallel_schedule(schedule);
     // decrement the nest level
     _nesting_level -= 1;
 }
 
 static void
-add_task_internal(void *fn, void *args, void *dims, void *steps, void *data, int tid)
+add_task_internal(void *fn, void *args, void *dims, void *steps, void *data,
+                  int tid, int num_threads)
 {
     void (*func)(void *args, void *dims, void *steps, void *data) = fn;
 
@@ -535,6 +714,7 @@ add_task_internal(void *fn, void *args, void *dims, void *steps, void *data, int
     task->steps = steps;
     task->data = data;
     task->tid = tid;
+    task->num_threads = num_threads;
 
     /* Move pivot */
     if ( ++queue_pivot == queue_count )
@@ -546,7 +726,7 @@ add_task_internal(void *fn, void *args, void *dims, void *steps, void *data, int
 static void
 add_task(void *fn, void *args, void *dims, void *steps, void *data)
 {
-    add_task_internal(fn, args, dims, steps, data, 0);
+    add_task_internal(fn, args, dims, steps, data, 0, 0);
 }
 
 static
@@ -555,6 +735,10 @@ void thread_worker(void *arg)
     Queue *queue = (Queue*)arg;
     Task *task;
 
+    _TLS_is_worker = 1;
+    // Worker i always runs thread number i of the static schedule, keep it
+    // on the same CPU
+    pin_thread((int)(queue - queues));
     while (1)
     {
         /* Wait for the queue to be in READY state (i.e. for some task
@@ -564,6 +748,11 @@ void thread_worker(void *arg)
 
         task = &queue->task;
         set_thread_id(task->tid);
+        // sync the TLS num_threads slot with the thread mask of the region
+        if (task->num_threads > 0)
+        {
+            _TLS_num_threads = task->num_threads;
+        }
         task->func(task->args, task->dims, task->steps, task->data);
 
         /* Task is done. */
@@ -655,11 +844,15 @@ MOD_INIT(workqueue)
     SetAttrStringFromVoidPointer(m, set_num_threads);
     SetAttrStringFromVoidPointer(m, get_num_threads);
     SetAttrStringFromVoidPointer(m, get_thread_id);
+    SetAttrStringFromVoidPointer(m, set_spin_count);
     SetAttrStringFromVoidPointer(m, set_parallel_chunksize);
     SetAttrStringFromVoidPointer(m, get_parallel_chunksize);
+    SetAttrStringFromVoidPointer(m, set_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, get_parallel_schedule);
     SetAttrStringFromVoidPointer(m, get_sched_size);
     SetAttrStringFromVoidPointer(m, allocate_sched);
     SetAttrStringFromVoidPointer(m, deallocate_sched);
+    SetAttrStringFromVoidPointer(m, set_thread_affinity);
 
     return MOD_SUCCESS_VAL(m);
 }
@@ -447,6 +447,76 @@ def linspace_parallel_impl(return_type, *args):
     else:
         raise ValueError("parallel linspace with types {}".format(args))
 
+def _scan_parallel_impl(return_type, arg, multiply, skipnan):
+    """Parallel cumulative sum (or product if *multiply*) of the flattened
+    array, ignoring NaNs if *skipnan*.  The array is split into one block per
+    thread, each block is scanned in parallel, the block totals are scanned
+    serially and then added (or multiplied) into the blocks in parallel.
+    """
+    if arg.ndim == 0:
+        return None
+    dtype = as_dtype(return_type.dtype)
+    init = return_type.dtype(1 if multiply else 0)
+    flatten = arg.ndim > 1
+
+    def scan_1(in_arr):
+        numba.parfors.parfor.init_prange()
+        if flatten:
+            arr = in_arr.ravel()
+        else:
+            arr = in_arr
+        n = len(arr)
+        out = np.empty(n, dtype)
+        nblocks = max(min(n, numba.get_num_threads()), 1)
+        blocksize = (n + nblocks - 1) // nblocks
+        totals = np.empty(nblocks, dtype)
+        for b in numba.parfors.parfor.internal_prange(nblocks):
+            start = b * blocksize
+            stop = min(start + blocksize, n)
+            acc = init
+            for i in range(start, stop):
+                v = arr[i]
+                # v != v only holds for NaN
+                if not (skipnan and v != v):
+                    if multiply:
+                        acc *= v
+                    else:
+                        acc += v
+                out[i] = acc
+            totals[b] = acc
+        # exclusive scan of the block totals
+        running = init
+        for j in range(nblocks):
+            total = totals[j]
+            totals[j] = running
+            if multiply:
+                running *= total
+            else:
+                running += total
+        for k in numba.parfors.parfor.internal_prange(1, nblocks):
+            first = k * blocksize
+            last = min(first + blocksize, n)
+            offset = totals[k]
+            for m in range(first, last):
+                if multiply:
+                    out[m] *= offset
+                else:
+                    out[m] += offset
+        return out
+    return scan_1
+
+def cumsum_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, False, False)
+
+def cumprod_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, True, False)
+
+def nancumsum_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, False, True)
+
+def nancumprod_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, True, True)
+
 swap_functions_map = {
     ('argmin', 'numpy'): lambda r,a: argmin_parallel_impl,
     ('argmax', 'numpy'): lambda r,a: argmax_parallel_impl,
@@ -462,6 +532,10 @@ swap_functions_map = {
     ('dot', 'numpy'): dot_parallel_impl,
     ('arange', 'numpy'): arange_parallel_impl,
     ('linspace', 'numpy'): linspace_parallel_impl,
+    ('cumsum', 'numpy'): cumsum_parallel_impl,
+    ('cumprod', 'numpy'): cumprod_parallel_impl,
+    ('nancumsum', 'numpy'): nancumsum_parallel_impl,
+    ('nancumprod', 'numpy'): nancumprod_parallel_impl,
 }
 
 def fill_parallel_impl(return_type, arr, val):
@@ -1525,12 +1599,11 @@ class PreParforPass(object):
                                             typs, self.typemap, self.calltypes, work_list)
                             call_table = get_call_table(new_blocks, topological_ordering=False)
 
-                            # find the prange in the new blocks and record it for use in diagnostics
+                            # find the pranges in the new blocks and record them for use in diagnostics
                             for call in call_table:
                                 for k, v in call.items():
                                     if v[0] == 'internal_prange':
                                         swapped[k] = [callname, repl_func.__name__, func_def, block.body[i].loc]
-                                        break
                             return True
                         if guard(replace_func):
                             self.stats['replaced_func'] += 1
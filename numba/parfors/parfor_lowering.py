@@ -36,6 +36,7 @@ from numba.core.ir_utils import (
 from numba.core.typing import signature
 from numba.core import lowering
 from numba.parfors.parfor import ensure_parallel_support
+from numba.core.cpu_options import PARALLEL_SCHEDULES
 from numba.core.errors import (
     NumbaParallelSafetyWarning, NotDefinedError, CompilerError, InternalError,
 )
@@ -1794,6 +1795,12 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
         llvmlite.ir.FunctionType(llvmlite.ir.IntType(types.intp.bitwidth), []),
         "get_num_threads")
 
+    set_schedule = cgutils.get_or_insert_function(
+        builder.module,
+        llvmlite.ir.FunctionType(llvmlite.ir.IntType(32),
+                                 [llvmlite.ir.IntType(32)]),
+        name="set_parallel_schedule")
+
     # Get the current number of threads.
     num_threads = builder.call(get_num_threads, [])
     # Get the current chunksize so we can use it and restore the value later.
@@ -1806,6 +1813,13 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
                                                   ("Invalid number of threads. "
                                                    "This likely indicates a bug in Numba.",))
 
+    # Select the scheduling policy of this parallel region, which also
+    # determines the schedule size.  It is taken by the backend's parallel_for
+    # and restored after the region.
+    schedule = PARALLEL_SCHEDULES.index(lowerer.flags.auto_parallel.schedule)
+    current_schedule = builder.call(
+        set_schedule, [llvmlite.ir.Constant(llvmlite.ir.IntType(32), schedule)])
+
     # Call get_sched_size from gufunc_scheduler.cpp that incorporates the size of the work,
     # the number of threads and the selected chunk size.  This will tell us how many entries
     # in the schedule we will need.
@@ -1818,6 +1832,22 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
                                                   context.get_constant(types.uintp, num_dim),
                                                   dim_starts,
                                                   dim_stops])
+    # A region with fewer iterations than the configured minimum is not worth
+    # waking the threads for, give it a single schedule entry so that the
+    # threading layer runs it serially on the calling thread.
+    min_iterations = config.PARALLEL_MIN_ITERATIONS
+    if min_iterations > 0:
+        total = one
+        for i in range(num_dim):
+            idx = context.get_constant(types.uintp, i)
+            start = builder.load(builder.gep(dim_starts, [idx]))
+            stop = builder.load(builder.gep(dim_stops, [idx]))
+            count = builder.add(builder.sub(stop, start), one)
+            empty = builder.icmp_signed('<', count, zero)
+            total = builder.mul(total, builder.select(empty, zero, count))
+        is_small = builder.icmp_signed('<', total,
+                                       one_type(min_iterations))
+        num_divisions = builder.select(is_small, one, num_divisions)
     # Set the chunksize to zero so that any nested calls get the default chunk size behavior.
     builder.call(set_chunksize, [zero])
 
@@ -2051,6 +2081,7 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
         cgutils.printf(builder, "after calling kernel %p\n", fn)
 
     builder.call(set_chunksize, [current_chunksize])
+    builder.call(set_schedule, [current_schedule])
 
     # Deallocate the schedule's memory.
     dealloc_sched_fnty = llvmlite.ir.FunctionType(llvmlite.ir.VoidType(), [sched_ptr_type])
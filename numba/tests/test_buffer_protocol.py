@@ -1,4 +1,8 @@
 import array
+import ctypes
+import gc
+import mmap
+import tempfile
 
 import numpy as np
 
@@ -37,6 +41,16 @@ def iter_usecase(buf):
     return res
 
 
+@jit(nopython=True)
+def identity_usecase(buf):
+    return buf
+
+
+@jit(nopython=True)
+def getslice_return_usecase(buf, i, j):
+    return buf[i:j]
+
+
 def attrgetter(attr):
     code = """def func(x):
         return x.%(attr)s
@@ -219,6 +233,56 @@ class TestBufferProtocol(MemoryLeakMixin, TestCase):
             self.check_getitem(buf)
 
 
+    def test_generic_exporters(self):
+        # ctypes arrays have an explicit byte order and no strides
+        arr = (ctypes.c_double * 4)(1.5, 2.5, 3.5, 4.5)
+        self.check_len(arr)
+        self.check_getitem(arr)
+        self.check_iter(arr)
+        self.check_setitem((ctypes.c_int32 * 4)(1, 2, 3, 4))
+        self.check_getitem((ctypes.c_bool * 2)(True, False))
+        # A read-only memory map
+        with tempfile.TemporaryFile() as f:
+            f.write(b"abcdefghi")
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.check_len(m)
+                self.check_getitem(m)
+                with self.assertTypingError():
+                    self.check_setitem(m)
+
+    def test_return(self):
+        # Returned buffers are memoryviews sharing the memory
+        for obj in [bytearray(b"abcd"), memoryview(b"abcd"),
+                    array.array('d', [1.5, 2.5]),
+                    (ctypes.c_int16 * 3)(1, 2, 3)]:
+            got = identity_usecase(obj)
+            self.assertIsInstance(got, memoryview)
+            expected = memoryview(obj)
+            self.assertEqual(got.tolist(), list(obj))
+            self.assertEqual(got.readonly, expected.readonly)
+            self.assertEqual(got.itemsize, expected.itemsize)
+        buf = bytearray(b"abcdef")
+        got = getslice_return_usecase(memoryview(buf), 1, 4)
+        self.assertEqual(got.tobytes(), b"bcd")
+        got[0] = ord("x")
+        self.assertEqual(buf, bytearray(b"axcdef"))
+
+    def test_return_lifetime(self):
+        buf = bytearray(b"abcd")
+        got = identity_usecase(buf)
+        # The memory stays exported while the result is alive
+        with self.assertRaises(BufferError):
+            buf.extend(b"ef")
+        del got
+        gc.collect()
+        buf.extend(b"ef")
+        # The result keeps the memory alive
+        got = identity_usecase(bytearray(b"abcd"))
+        gc.collect()
+        self.assertEqual(got.tobytes(), b"abcd")
+
+
 class TestMemoryView(MemoryLeakMixin, TestCase):
     """
     Test memoryview-specific attributes and operations.
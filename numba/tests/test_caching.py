@@ -1,11 +1,14 @@
 import importlib
 import inspect
+import json
 import multiprocessing
 import os
+import pickle
 import shutil
 import stat
 import subprocess
 import sys
+import time
 import traceback
 import unittest
 import warnings
@@ -16,14 +19,26 @@ import llvmlite.binding as ll
 import numpy as np
 from math import floor
 
-from numba import njit
-from numba.core import codegen
+import numba
+from numba import compile_many, njit, typeof
+from numba.core import codegen, types
 from numba.core.caching import (
+    _ARCHIVE_HEADER,
+    _ArchiveReader,
+    ArchiveCacheFile,
+    CacheManager,
     UserWideCacheLocator,
     ZipCacheLocator,
     FunctionCache,
     InTreeCacheLocator,
     InTreeCacheLocatorFsAgnostic,
+    InTreeContentHashCacheLocator,
+    TypeProfileRecorder,
+    _format_profile_types,
+    _parse_profile_types,
+    load_type_profile,
+    precompile,
+    warmup,
 )
 from numba.core.errors import NumbaWarning
 from numba.parfors import parfor
@@ -248,7 +263,7 @@ class BaseCacheTest(TestCase):
     def cache_contents(self):
         try:
             return [fn for fn in os.listdir(self.cache_dir)
-                    if not fn.endswith(('.pyc', ".pyo"))]
+                    if not fn.endswith(('.pyc', '.pyo', '.lock'))]
         except FileNotFoundError:
             return []
 
@@ -719,6 +734,624 @@ class TestCache(DispatcherCacheUsecasesTest):
         self.assertIn("cache hits = 1", err.strip())
 
 
+class TestCacheArchive(DispatcherCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def import_module(self):
+        with override_env_config("NUMBA_CACHE_FORMAT", "archive"):
+            return super().import_module()
+
+    def test_caching(self):
+        self.check_pycache(0)
+        mod = self.import_module()
+        self.check_pycache(0)
+
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_pycache(1)  # 1 archive
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 0, 2)
+
+        f = mod.add_objmode_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 0, 2)
+
+        f = mod.record_return
+        rec = f(mod.aligned_arr, 1)
+        self.assertPreciseEqual(tuple(rec), (2, 43.5))
+        self.check_pycache(1)
+        [archive] = self.cache_contents()
+        self.assertTrue(archive.endswith(".nba"), archive)
+
+        # Check the code runs ok from another process
+        self.run_in_separate_process(
+            envvars={"NUMBA_CACHE_FORMAT": "archive"})
+
+    def test_cache_reuse(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+        mtimes = self.get_cache_mtimes()
+
+        mod2 = self.import_module()
+        f = mod2.add_usecase
+        f(2, 3)
+        self.check_hits(f, 1, 0)
+        f(2.5, 3.5)
+        self.check_hits(f, 2, 0)
+        f = mod2.add_objmode_usecase
+        f(2, 3)
+        self.check_hits(f, 1, 0)
+
+        # The archive hasn't changed
+        self.assertEqual(self.get_cache_mtimes(), mtimes)
+
+    def test_cache_invalidate(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        # This should change the functions' results
+        with open(self.modfile, "a") as f:
+            f.write("\nZ = 10\n")
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+        self.check_hits(f, 0, 1)
+
+    def get_archive(self):
+        [archive] = self.cache_contents()
+        return os.path.join(self.cache_dir, archive)
+
+    def test_append(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        path = self.get_archive()
+        with open(path, "rb") as f:
+            before = f.read()
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+        with open(path, "rb") as f:
+            after = f.read()
+        # Only the header, which locates the table of contents, changed
+        header_size = _ARCHIVE_HEADER.size
+        self.assertGreater(len(after), len(before))
+        self.assertEqual(after[header_size:len(before)],
+                         before[header_size:])
+        reader = _ArchiveReader.open(path, numba.__version__)
+        self.assertEqual(reader.depth, 3)
+
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+        self.check_hits(mod.add_usecase, 2, 0)
+        self.check_hits(mod.add_objmode_usecase, 1, 0)
+
+    def test_compaction(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+        path = self.get_archive()
+        size = os.path.getsize(path)
+        CacheManager(self.cache_dir).gc()
+        reader = _ArchiveReader.open(path, numba.__version__)
+        self.assertEqual(reader.depth, 1)
+        self.assertLess(os.path.getsize(path), size)
+
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+        self.check_hits(mod.add_usecase, 2, 0)
+        self.check_hits(mod.add_objmode_usecase, 1, 0)
+
+    def test_concurrent_processes(self):
+        # Two processes save many entries of different functions to the
+        # same archive at the same time, none of them must be lost.
+        code = """if 1:
+            import sys
+            from numba.core.caching import ArchiveCacheFile
+
+            which = sys.argv[1]
+            for i in range(%(n)d):
+                cache_file = ArchiveCacheFile(%(cache_dir)r, '%%s-%%d'
+                                              %% (which, i), 'mod.nba', 1)
+                cache_file.save(('key', i), (which, i))
+            """ % dict(cache_dir=self.tempdir, n=300)
+        procs = [subprocess.Popen([sys.executable, "-c", code, which],
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.PIPE)
+                 for which in ('a', 'b')]
+        for popen in procs:
+            out, err = popen.communicate(timeout=600)
+            self.assertEqual(popen.returncode, 0,
+                             "process failed with:\n%s" % err.decode())
+
+        for which in ('a', 'b'):
+            for i in range(300):
+                cache_file = ArchiveCacheFile(self.tempdir,
+                                              '%s-%d' % (which, i),
+                                              'mod.nba', 1)
+                self.assertEqual(cache_file.load(('key', i)), (which, i))
+
+    def test_unknown_format(self):
+        def mock_func():
+            return 42
+
+        with override_env_config("NUMBA_CACHE_FORMAT", "foo"):
+            with self.assertRaises(RuntimeError) as raises:
+                FunctionCache(mock_func)
+        self.assertIn("Unknown cache format: 'foo'", str(raises.exception))
+
+
+class TestCacheWarmup(DispatcherCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def test_warmup(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+
+        mod = self.import_module()
+        report = warmup([mod], workers=2)
+        loaded = sorted((disp.__name__, str(sig))
+                        for disp, sig in report.hits)
+        self.assertEqual(loaded, [('add_objmode_usecase', '(int64, int64)'),
+                                  ('add_usecase', '(float64, float64)'),
+                                  ('add_usecase', '(int64, int64)')])
+        self.assertEqual(report.misses, [])
+        self.assertEqual(report.stale, [])
+
+        f = mod.add_usecase
+        self.assertEqual(len(f.overloads), 2)
+        self.check_hits(f, 2, 0)
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3.5), 7.0)
+        # The calls don't touch the cache anymore
+        self.check_hits(f, 2, 0)
+
+        # Warming up again has nothing left to load
+        report = warmup([self.modname])
+        self.assertEqual(report, ([], [], []))
+
+    def test_warmup_stale(self):
+        # Populate the cache for other CPU features
+        self.run_in_separate_process(
+            envvars={'NUMBA_CPU_FEATURES': '-sse;-avx'})
+        mod = self.import_module()
+        report = warmup([mod])
+        self.assertEqual(report.hits, [])
+        self.assertIn((mod.add_usecase, (types.int64, types.int64)),
+                      report.stale)
+        self.check_hits(mod.add_usecase, 0, 0)
+
+
+class TestCompileMany(DispatcherCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def test_compile_many(self):
+        mod = self.import_module()
+        i8, f8 = types.int64, types.float64
+        items = [(mod.add_usecase, (i8, i8)),
+                 (mod.add_usecase, (f8, f8)),
+                 (mod.outer, (i8, i8)),
+                 (mod.add_nocache_usecase, (i8, i8))]
+        entry_points = compile_many(items, workers=2)
+        self.assertEqual(len(entry_points), 4)
+        self.assertPreciseEqual(entry_points[0](2, 3), 6)
+        self.assertPreciseEqual(entry_points[1](2.5, 3.5), 7.0)
+        # The cacheable functions were compiled by the worker processes
+        self.check_hits(mod.add_usecase, 2, 0)
+        self.check_hits(mod.outer, 1, 0)
+        self.check_hits(mod.add_nocache_usecase, 0, 1)
+        self.assertPreciseEqual(mod.add_nocache_usecase(2, 3), 6)
+
+        # Existing overloads are returned as-is
+        self.assertEqual(compile_many(items[:1]), entry_points[:1])
+
+    def test_compile_many_in_process(self):
+        mod = self.import_module()
+        i8 = types.int64
+        [entry_point] = compile_many([(mod.add_usecase, (i8, i8))])
+        self.assertPreciseEqual(entry_point(2, 3), 6)
+        # A single dispatcher isn't worth a worker process
+        self.check_hits(mod.add_usecase, 0, 1)
+
+
+class TestTypeProfile(DispatcherCacheUsecasesTest):
+
+    def record(self):
+        mod = self.import_module()
+        profile = os.path.join(self.tempdir, 'profile.json')
+        with TypeProfileRecorder(profile) as recorder:
+            mod.add_usecase(2, 3)
+            mod.add_usecase(2.5, 3.5)
+            mod.add_usecase(4, 5)
+            mod.add_nocache_usecase(2, 3)
+            mod.make_closure(3)(4)
+        # Overloads compiled after recording stopped are left out
+        mod.add_usecase(1j, 2j)
+        i8, f8 = types.int64, types.float64
+        self.assertEqual(recorder.entries(), [
+            (self.modname, 'add_usecase', (i8, i8)),
+            (self.modname, 'add_usecase', (f8, f8)),
+            (self.modname, 'add_nocache_usecase', (i8, i8)),
+            (self.modname, 'make_closure.<locals>.closure', (i8,)),
+        ])
+        return profile
+
+    def test_record(self):
+        profile = self.record()
+        i8, f8 = types.int64, types.float64
+        # The closure can't be found again by name
+        self.assertEqual(load_type_profile(profile), [
+            (self.modname, 'add_usecase', (i8, i8)),
+            (self.modname, 'add_usecase', (f8, f8)),
+            (self.modname, 'add_nocache_usecase', (i8, i8)),
+        ])
+
+    def test_precompile(self):
+        profile = self.record()
+        shutil.rmtree(self.cache_dir)
+        mod = self.import_module()
+        with self.assertWarns(NumbaWarning) as w:
+            items = precompile(profile, workers=1)
+        self.assertIn("add_nocache_usecase is not cached", str(w.warning))
+        self.assertEqual(items, [
+            (mod.add_usecase, (types.int64, types.int64)),
+            (mod.add_usecase, (types.float64, types.float64)),
+        ])
+        self.check_hits(mod.add_usecase, 0, 2)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3.5), 7.0)
+        self.check_hits(f, 2, 0)
+
+    def test_signature_roundtrip(self):
+        rec = np.dtype([('a', np.float64), ('b', np.int32)])
+        argtys = [
+            (),
+            (types.int64, types.boolean, types.unicode_type, types.none),
+            (types.float64[:, ::1], types.Array(types.int8, 1, 'A',
+                                                readonly=True)),
+            (types.UniTuple(types.int64, 3),
+             types.Tuple((types.int64, types.complex128))),
+            (types.ListType(types.int64),
+             types.DictType(types.unicode_type, types.float64),
+             types.List(types.intp, reflected=True)),
+            (typeof(np.zeros(3, dtype=rec)),),
+        ]
+        for args in argtys:
+            with self.subTest(args=args):
+                text = _format_profile_types(args)
+                self.assertIsInstance(text, str)
+                self.assertEqual(_parse_profile_types(text), args)
+        # Types whose repr() isn't a constructor expression can't be stored
+        self.assertIsNone(_format_profile_types((types.NPDatetime('s'),)))
+
+    def test_load_rejects_code(self):
+        profile = os.path.join(self.tempdir, 'profile.json')
+        marker = os.path.join(self.tempdir, 'marker')
+        bad_signatures = [
+            "(__import__('os').mkdir(%r),)" % marker,
+            "(int64.__class__.__subclasses__(),)",
+            "(Array(float64, 1, 'C') if 1 else int64,)",
+            "(array(float64, 1d, C),)",
+            "int64",
+        ]
+        for signature in bad_signatures:
+            with self.subTest(signature=signature):
+                with open(profile, 'w') as f:
+                    json.dump({'version': 2, 'entries': [
+                        {'module': 'mod', 'qualname': 'func',
+                         'signature': signature}]}, f)
+                with self.assertRaises(ValueError) as raises:
+                    load_type_profile(profile)
+                self.assertIn("invalid signature %r for mod.func"
+                              % (signature,), str(raises.exception))
+        self.assertFalse(os.path.exists(marker))
+
+
+class TestCacheManager(DispatcherCacheUsecasesTest):
+
+    def populate(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+        self.check_pycache(5)  # 2 index, 3 data
+        return mod
+
+    def test_remove_obsolete(self):
+        mod = self.populate()
+        index_name = mod.add_usecase._cache._cache_file._index_name
+        orphan = index_name[:-len('.nbi')] + '.7.nbc'
+        old_tmp = index_name + '.tmp.0123456789abcdef'
+        new_tmp = index_name + '.tmp.fedcba9876543210'
+        other_index = 'foo-1.py39.nbi'
+        other_data = 'foo-1.py39.1.nbc'
+        for fn in (orphan, old_tmp, new_tmp, other_data):
+            with open(os.path.join(self.cache_dir, fn), 'wb') as f:
+                f.write(b'x' * 10)
+        with open(os.path.join(self.cache_dir, other_index), 'wb') as f:
+            pickle.dump('0.0.0', f)
+            f.write(b'garbage')
+        os.utime(os.path.join(self.cache_dir, old_tmp), (0, 0))
+
+        manager = CacheManager(self.tempdir)
+        removed = manager.remove_obsolete()
+        self.assertEqual(sorted(os.path.basename(fn) for fn in removed),
+                         sorted([orphan, old_tmp, other_index, other_data]))
+        self.assertIn(new_tmp, self.cache_contents())
+        self.check_pycache(6)
+
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_objmode_usecase(2, 3)
+        self.check_hits(mod.add_usecase, 1, 0)
+        self.check_hits(mod.add_objmode_usecase, 1, 0)
+
+    def test_evict(self):
+        mod = self.populate()
+        manager = CacheManager(self.cache_dir)
+        size = manager.size()
+        self.assertEqual(manager.evict(size), [])
+
+        # Make all data files recently used, but one
+        data_files = sorted(fn for fn in self.cache_contents()
+                            if fn.endswith('.nbc'))
+        now = time.time()
+        for fn in data_files:
+            path = os.path.join(self.cache_dir, fn)
+            os.utime(path, (now, os.path.getmtime(path)))
+        cache_file = mod.add_objmode_usecase._cache._cache_file
+        index_name = cache_file._index_name
+        [lru] = [fn for fn in data_files
+                 if fn.startswith(index_name[:-len('.nbi')])]
+        path = os.path.join(self.cache_dir, lru)
+        os.utime(path, (0, os.path.getmtime(path)))
+
+        removed = manager.evict(size - 1)
+        # The index is removed along with its only data file
+        self.assertEqual(sorted(os.path.basename(fn) for fn in removed),
+                         sorted([lru, index_name]))
+        self.check_pycache(3)
+
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_objmode_usecase(2, 3)
+        self.check_hits(mod.add_usecase, 1, 0)
+        self.check_hits(mod.add_objmode_usecase, 0, 1)
+
+    def test_load_marks_used(self):
+        mod = self.populate()
+        data_files = [os.path.join(self.cache_dir, fn)
+                      for fn in self.cache_contents() if fn.endswith('.nbc')]
+        for path in data_files:
+            os.utime(path, (0, os.path.getmtime(path)))
+        mtimes = self.get_cache_mtimes()
+
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        self.check_hits(mod.add_usecase, 1, 0)
+        atimes = [os.path.getatime(path) for path in data_files]
+        self.assertEqual(sum(1 for atime in atimes if atime > 0), 1)
+        self.assertEqual(self.get_cache_mtimes(), mtimes)
+
+    def test_command_line(self):
+        self.populate()
+        cmd = [sys.executable, "-m", "numba", "--cache-gc", self.tempdir,
+               "--cache-max-size", "0"]
+        subp_env = os.environ.copy()
+        out = subprocess.check_output(cmd, env=subp_env).decode()
+        self.assertIn("5 files removed, 0 bytes remaining", out)
+        self.check_pycache(0)
+
+        # --cache-max-size is only meaningful together with --cache-gc
+        self.populate()
+        cmd = [sys.executable, "-m", "numba", "--cache-max-size", "0"]
+        popen = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE, env=subp_env)
+        _, err = popen.communicate()
+        self.assertEqual(popen.returncode, 2)
+        self.assertIn("--cache-max-size requires --cache-gc", err.decode())
+        self.check_pycache(5)
+
+
+class TestContentHashCacheLocator(DispatcherCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    locator_env = {"NUMBA_CACHE_LOCATOR_CLASSES":
+                   "InTreeContentHashCacheLocator"}
+
+    def import_module(self):
+        [(name, value)] = self.locator_env.items()
+        with override_env_config(name, value):
+            return super().import_module()
+
+    def rewrite_module(self, old=None, new=None):
+        with open(self.modfile) as f:
+            source = f.read()
+        if old is not None:
+            self.assertIn(old, source)
+            source = source.replace(old, new)
+        with open(self.modfile, "w") as f:
+            f.write(source)
+        # Make sure the timestamp changes
+        st = os.stat(self.modfile)
+        os.utime(self.modfile, (st.st_atime + 100, st.st_mtime + 100))
+
+    def test_caching(self):
+        mod = self.import_module()
+        self.assertIsInstance(mod.add_usecase._cache._impl.locator,
+                              InTreeContentHashCacheLocator)
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_pycache(2)  # 1 index, 1 data
+        self.check_hits(f, 0, 1)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 1, 0)
+
+        self.run_in_separate_process(envvars=self.locator_env)
+
+    def test_source_rewrite(self):
+        # Rewriting the source file doesn't invalidate the cache
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.outer(2, 3)
+        self.rewrite_module()
+
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.outer(2, 3)
+        self.check_hits(mod.add_usecase, 1, 0)
+        self.check_hits(mod.outer, 1, 0)
+
+    def test_callee_change(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        self.assertPreciseEqual(mod.outer(2, 3), 0)
+        self.rewrite_module("def inner(x, y):\n    return x + y + Z",
+                            "def inner(x, y):\n    return x + y - Z")
+
+        # The caller is invalidated along with its callee
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        self.assertPreciseEqual(mod.outer(2, 3), -2)
+        self.check_hits(mod.add_usecase, 1, 0)
+        self.check_hits(mod.outer, 0, 1)
+
+    def test_option_change(self):
+        with open(self.modfile, "a") as f:
+            f.write("\n@jit(cache=True, nopython=True, error_model='python')"
+                    "\ndef div_usecase(x):\n    return 1.0 / x\n")
+        mod = self.import_module()
+        with self.assertRaises(ZeroDivisionError):
+            mod.div_usecase(0.0)
+        mod.add_usecase(2, 3)
+        mod.outer(2, 3)
+        # Only the decorator options change
+        self.rewrite_module("error_model='python'", "error_model='numpy'")
+        self.rewrite_module("@jit(cache=True, nopython=True)\ndef inner",
+                            "@jit(cache=True, nopython=True, boundscheck=True)"
+                            "\ndef inner")
+
+        mod = self.import_module()
+        self.assertPreciseEqual(mod.div_usecase(0.0), np.inf)
+        self.check_hits(mod.div_usecase, 0, 1)
+        mod.add_usecase(2, 3)
+        mod.outer(2, 3)
+        self.check_hits(mod.add_usecase, 1, 0)
+        # The caller is invalidated along with its callee
+        self.check_hits(mod.outer, 0, 1)
+
+    def test_global_change(self):
+        mod = self.import_module()
+        self.assertPreciseEqual(mod.add_usecase(2, 3), 6)
+        with open(self.modfile, "a") as f:
+            f.write("\nZ = 10\n")
+
+        mod = self.import_module()
+        self.assertPreciseEqual(mod.add_usecase(2, 3), 15)
+        self.check_hits(mod.add_usecase, 0, 1)
+
+    def test_stamp_stable_across_processes(self):
+        mod = self.import_module()
+        locator = mod.outer._cache._impl.locator
+        code = """if 1:
+            import sys
+            sys.path.insert(0, %(tempdir)r)
+            mod = __import__(%(modname)r)
+            print(mod.outer._cache._impl.locator.get_source_stamp())
+            """ % dict(tempdir=self.tempdir, modname=self.modname)
+        subp_env = os.environ.copy()
+        subp_env.update(self.locator_env)
+        subp_env["PYTHONHASHSEED"] = "random"
+        out = subprocess.check_output([sys.executable, "-c", code],
+                                      env=subp_env)
+        self.assertEqual(out.decode().strip(), locator.get_source_stamp())
+
+
+class TestCacheSharedTier(DispatcherCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def setUp(self):
+        super().setUp()
+        self.shared_dir = os.path.join(self.tempdir, "shared")
+
+    def populate_shared(self):
+        # Compile a single signature into the shared tier, as an image build
+        # would do
+        code = """if 1:
+            import sys
+            sys.path.insert(0, %(tempdir)r)
+            mod = __import__(%(modname)r)
+            mod.add_usecase(2, 3)
+            """ % dict(tempdir=self.tempdir, modname=self.modname)
+        subp_env = os.environ.copy()
+        subp_env["NUMBA_CACHE_DIR"] = self.shared_dir
+        subprocess.check_call([sys.executable, "-c", code], env=subp_env)
+        self.check_pycache(0)
+
+    def import_module(self):
+        with override_env_config("NUMBA_CACHE_SHARED_DIR", self.shared_dir):
+            return super().import_module()
+
+    def shared_contents(self):
+        return sorted(fn for _, _, filenames in os.walk(self.shared_dir)
+                      for fn in filenames)
+
+    def test_shared_tier(self):
+        self.populate_shared()
+        shared_contents = self.shared_contents()
+        self.assertEqual(len(shared_contents), 2)  # 1 index, 1 data
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 1, 0)
+        # Nothing is written for the entries found in the shared tier
+        self.check_pycache(0)
+
+        # Misses are compiled into the local overlay
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 1, 1)
+        self.check_pycache(2)
+        self.assertEqual(self.shared_contents(), shared_contents)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        f(2, 3)
+        f(2.5, 3)
+        self.check_hits(f, 2, 0)
+
+        report = warmup([self.import_module()])
+        self.assertEqual(len(report.hits), 2)
+
+    def test_no_shared_tier(self):
+        self.populate_shared()
+        mod = super().import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 0, 1)
+
+
 class TestCacheZip(DispatcherCacheUsecasesTest):
 
     def setUp(self):
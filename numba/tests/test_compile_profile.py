@@ -0,0 +1,90 @@
+import json
+import unittest
+
+from numba import njit, profile_compilation
+from numba.core import config, event as ev
+from numba.tests.support import TestCase
+
+
+class TestProfileCompilation(TestCase):
+
+    def setUp(self):
+        # Trigger compilation to ensure all listeners are initialized
+        njit(lambda: None)()
+        self.__registered_listeners = len(ev._registered)
+
+    def tearDown(self):
+        # Check there is no lingering listeners
+        self.assertEqual(len(ev._registered), self.__registered_listeners)
+
+    def compile_nested(self, **kwargs):
+        @njit
+        def callee(x):
+            return x * 2
+
+        @njit
+        def caller(x):
+            return callee(x) + 1
+
+        with profile_compilation(**kwargs) as profile:
+            caller(1)
+        return profile
+
+    def test_functions(self):
+        profile = self.compile_nested()
+        functions = {fn.rsplit('.', 1)[-1]: (sig, time, self_time)
+                     for fn, sig, time, self_time in profile.functions()}
+        self.assertEqual(sorted(functions), ['callee', 'caller'])
+        sig, caller_time, caller_self = functions['caller']
+        self.assertEqual(sig, '(int64,)')
+        _, callee_time, callee_self = functions['callee']
+        # The callee is compiled while typing the caller
+        self.assertEqual(callee_time, callee_self)
+        self.assertPreciseEqual(caller_self, caller_time - callee_time)
+        self.assertGreater(caller_self, 0)
+
+    def test_passes(self):
+        profile = self.compile_nested()
+        passes = {(kind, name): count
+                  for kind, name, _, count in profile.passes()}
+        self.assertEqual(passes['pass', 'nopython_type_inference'], 2)
+        self.assertEqual(passes['pass', 'native_lowering'], 2)
+        self.assertIn(('llvm', 'InstCombinePass'), passes)
+        # The self time of the caller's type inference excludes the callee
+        [typing] = [rec for rec in profile.records
+                    if rec.name == 'nopython_type_inference'
+                    and rec.function.endswith('caller')]
+        self.assertLess(typing.self_time, typing.time)
+        # LLVM pass timings are only recorded while profiling
+        self.assertFalse(config.LLVM_PASS_TIMINGS)
+
+    def test_no_llvm_passes(self):
+        profile = self.compile_nested(llvm_passes=False)
+        kinds = {rec.kind for rec in profile.records}
+        self.assertEqual(kinds, {'compile', 'pass'})
+
+    def test_memory(self):
+        profile = self.compile_nested()
+        self.assertTrue(all(rec.memory is None for rec in profile.records))
+        profile = self.compile_nested(memory=True)
+        for rec in profile.records:
+            if rec.kind != 'llvm':
+                self.assertIsInstance(rec.memory, int)
+
+    def test_table_and_json(self):
+        profile = self.compile_nested()
+        lines = profile.table(limit=1).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0].split()[:2], ['Function', 'Signature'])
+        self.assertRegex(lines[2], 'caller|callee')
+        self.assertIn('native_lowering', profile.table(by='pass'))
+        with self.assertRaises(ValueError):
+            profile.table(by='module')
+
+        records = json.loads(profile.to_json())
+        self.assertEqual(len(records), len(profile.records))
+        self.assertEqual(records[0], profile.records[0]._asdict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,14 +10,16 @@ import numpy as np
 
 from numba import njit, jit, typeof, vectorize
 from numba.core import types, errors
+from numba.core.compiler_lock import global_compiler_lock
 from numba import _dispatcher
-from numba.tests.support import TestCase, captured_stdout
+from numba.tests.support import TestCase, captured_stdout, override_config
 from numba.np.numpy_support import as_dtype
 from numba.core.dispatcher import Dispatcher
 from numba.extending import overload
 from numba.tests.support import needs_lapack, SerialMixin
 from numba.testing.main import _TIMEOUT as _RUNNER_TIMEOUT
 import unittest
+from unittest import mock
 
 _TEST_TIMEOUT = _RUNNER_TIMEOUT - 60.
 
@@ -546,6 +548,47 @@ class TestDispatcher(BaseTest):
         expected_sigs = [(types.complex128,)]
         self.assertEqual(jitfoo.signatures, expected_sigs)
 
+    def test_inline_cache(self):
+        def foo(x):
+            return x
+
+        def check_stats(f, hits, misses):
+            st = f.stats
+            self.assertEqual((st.inline_cache_hits, st.inline_cache_misses),
+                             (hits, misses))
+
+        jitfoo = jit(nopython=True)(foo)
+        check_stats(jitfoo, 0, 0)
+        jitfoo(1)
+        check_stats(jitfoo, 0, 1)
+        # Compiling the new overload invalidated the cache
+        jitfoo(2)
+        jitfoo(3)
+        check_stats(jitfoo, 1, 2)
+        # More argument types than cache entries: int64 gets evicted
+        for arg in (1.5, 1j, np.int32(1), np.float32(1)):
+            for _ in range(3):
+                jitfoo(arg)
+        check_stats(jitfoo, 5, 10)
+        self.assertPreciseEqual(jitfoo(4), 4)
+        check_stats(jitfoo, 5, 11)
+        self.assertPreciseEqual(jitfoo(np.float32(2)), np.float32(2))
+        check_stats(jitfoo, 6, 11)
+
+        # Resolutions with conversions are cached too, but not reused once
+        # exact matches are required
+        jitfoo = jit([(types.float64,)], nopython=True)(foo)
+        self.assertPreciseEqual(jitfoo(1), 1.0)
+        self.assertPreciseEqual(jitfoo(1), 1.0)
+        check_stats(jitfoo, 1, 1)
+        jitfoo._can_compile = True
+        self.assertPreciseEqual(jitfoo(1), 1)
+        jitfoo._can_compile = False
+        # The new overload is a better match
+        self.assertPreciseEqual(jitfoo(1), 1)
+        self.assertPreciseEqual(jitfoo(1.5), 1.5)
+        self.assertEqual(len(jitfoo.signatures), 2)
+
     def test_dispatcher_raises_for_invalid_decoration(self):
         # For context see https://github.com/numba/numba/issues/4750.
 
@@ -646,6 +689,23 @@ class TestSignatureHandling(BaseTest):
             f(4, x=6)
         self.assertIn("some keyword arguments unexpected", str(cm.exception))
 
+    def test_call_protocols(self):
+        """
+        Test the vectorcall and tp_call entry points agree.
+        """
+        f, check = self.compile_func(addsub_defaults)
+        # Py_TPFLAGS_HAVE_VECTORCALL
+        self.assertTrue(type(f).__flags__ & (1 << 11))
+        tp_call = type(f).__call__
+        for args, kwargs in [((3, 4, 10), {}), ((3,), {}), ((3, 4), {}),
+                             ((3,), dict(z=10)), ((), dict(x=3, y=4))]:
+            self.assertPreciseEqual(tp_call(f, *args, **kwargs),
+                                    f(*args, **kwargs))
+        with self.assertRaises(TypeError) as cm:
+            tp_call(f)
+        self.assertIn("not enough arguments: expected at least 1, got 0",
+                      str(cm.exception))
+
 
 class TestSignatureHandlingObjectMode(TestSignatureHandling):
     """
@@ -657,6 +717,64 @@ class TestSignatureHandlingObjectMode(TestSignatureHandling):
 
 class TestDispatcherMethods(TestCase):
 
+    def test_bind(self):
+        @jit(nopython=True)
+        def foo(x, y=2):
+            return x + y
+
+        i8 = types.int64
+        bound = foo.bind((i8, i8))
+        self.assertEqual(foo.signatures, [(i8, i8)])
+        self.assertIs(foo.bind("int64(int64, int64)"), bound)
+        self.assertPreciseEqual(bound(1, 2), 3)
+        # Arguments are converted to the signature's types
+        self.assertPreciseEqual(bound(np.int32(3), 4.5), 7)
+        with self.assertRaises(TypeError):
+            bound(1)
+        with self.assertRaises(TypeError):
+            bound(1, None)
+        # The dispatcher itself isn't affected
+        self.assertPreciseEqual(foo(1.5), 3.5)
+
+        foo.disable_compile()
+        with self.assertRaises(TypeError) as raises:
+            foo.bind((types.float32, i8))
+        self.assertIn("No matching definition for signature",
+                      str(raises.exception))
+
+    def test_map(self):
+        @jit(nopython=True)
+        def foo(x, y=2):
+            return x + y
+
+        self.assertEqual(foo.starmap([(1, 2), [3, 4], (5,)]), [3, 7, 7])
+        self.assertEqual(foo.map([1, 2.5], [10, 20]), [11, 22.5])
+        self.assertEqual(foo.map(range(3)), [2, 3, 4])
+        self.assertEqual(foo.starmap(iter([])), [])
+        # Each call is dispatched on its own argument types
+        self.assertEqual([type(r) for r in foo.map([1, 1.5])], [int, float])
+
+        out = np.zeros(3)
+        self.assertIs(foo.map(range(3), out=out), out)
+        self.assertPreciseEqual(out, np.array([2., 3., 4.]))
+        with self.assertRaises(ValueError) as raises:
+            foo.map(range(4), out=out)
+        self.assertIn("more results than the output length 3",
+                      str(raises.exception))
+        with self.assertRaises(ValueError) as raises:
+            foo.map(range(2), out=out)
+        self.assertIn("2 results for an output of length 3",
+                      str(raises.exception))
+
+        # Errors propagate
+        with self.assertRaises(TypeError):
+            foo.starmap([(1, 2), (1, 2, 3)])
+        with self.assertRaises(TypeError):
+            foo.starmap([1])
+        foo.disable_compile()
+        with self.assertRaises(TypeError):
+            foo.map([1j])
+
     def test_recompile(self):
         closure = 1
 
@@ -1168,6 +1286,165 @@ class TestMultiprocessingDefaultParameters(SerialMixin, unittest.TestCase):
         self.run_fc_multiproc(add_func)
 
 
+class TestBackgroundCompilation(TestCase):
+
+    def wait_compiled(self, f):
+        for future in list(f._background_futures.values()):
+            future.exception()
+
+    def test_python_fallback(self):
+        def pyfunc(x, y=2, *args):
+            return x * y + len(args)
+
+        f = jit(compile='background')(pyfunc)
+        # Hold the compiler lock so that the background compilation can't
+        # complete before the call
+        with global_compiler_lock:
+            self.assertEqual(f(3), 6)
+            self.assertEqual(f(3, 4, 5, 6), 14)
+            self.assertEqual(f.signatures, [])
+        self.wait_compiled(f)
+        self.assertEqual(len(f.signatures), 2)
+        self.assertEqual(f(3), 6)
+        self.assertEqual(f(3, 4, 5, 6), 14)
+        self.assertEqual(len(f.signatures), 2)
+        self.assertEqual(f._background_futures, {})
+
+    def test_compatible_overload_fallback(self):
+        f = jit(compile='background')(lambda x: x * 2)
+        f.compile((types.int64,))
+        with global_compiler_lock:
+            # Runs the int64 overload rather than the Python function (which
+            # would return a NumPy scalar)
+            res = f(np.int32(3))
+        self.assertEqual(res, 6)
+        self.assertIs(type(res), int)
+        self.wait_compiled(f)
+        self.assertEqual(f.signatures, [(types.int64,), (types.int32,)])
+
+    def test_compilation_error(self):
+        def pyfunc(x):
+            return object()
+
+        f = jit(compile='background')(pyfunc)
+        with global_compiler_lock:
+            self.assertIs(type(f(1)), object)
+        self.wait_compiled(f)
+        # The failed compilation is dropped, and the error is reported by the
+        # next calls
+        self.assertEqual(f._background_futures, {})
+        for _ in range(2):
+            with self.assertRaises(errors.TypingError):
+                f(1)
+
+    def test_compilation_retried(self):
+        f = jit(compile='background')(lambda x: x + 1)
+        compile_core = f._compiler._compile_core
+        failure = RuntimeError("transient failure")
+        with mock.patch.object(f._compiler, '_compile_core',
+                               side_effect=failure):
+            self.assertEqual(f(1), 2)
+            self.wait_compiled(f)
+            self.assertEqual(f._background_futures, {})
+            # The next call compiles synchronously and raises the error
+            with self.assertRaises(RuntimeError) as raises:
+                f(1)
+            self.assertIs(raises.exception, failure)
+        # ...and then retries the compilation
+        with mock.patch.object(f._compiler, '_compile_core',
+                               side_effect=compile_core) as patched:
+            self.assertEqual(f(1), 2)
+        patched.assert_called_once()
+        self.assertEqual(f.signatures, [(types.int64,)])
+
+    def test_invalid_option(self):
+        with self.assertRaises(ValueError) as raises:
+            jit(compile='later')(lambda x: x)
+        self.assertIn("compile option must be 'sync' or 'background'",
+                      str(raises.exception))
+
+
+def make_adder(c):
+    @njit
+    def add(x):
+        return x + c
+    return add
+
+
+def make_caller(callee):
+    @njit
+    def caller(x):
+        return callee(x) + 1
+    return caller
+
+
+class TestCompileMemo(TestCase):
+
+    def overload(self, f):
+        [cres] = f.overloads.values()
+        return cres
+
+    def test_identical_closures(self):
+        with override_config('COMPILE_MEMO', 1):
+            f, g, h = make_adder(1), make_adder(1), make_adder(2)
+            self.assertEqual(f(2), 3)
+            self.assertEqual(g(2), 3)
+            self.assertEqual(h(2), 4)
+        self.assertIs(self.overload(f), self.overload(g))
+        self.assertIsNot(self.overload(f), self.overload(h))
+        # The memo is only used when enabled
+        f = make_adder(1)
+        f(2)
+        self.assertIsNot(self.overload(f), self.overload(g))
+
+    def test_changed_callee(self):
+        def double(x):
+            return x * 2
+
+        def triple(x):
+            return x * 3
+
+        with override_config('COMPILE_MEMO', 1):
+            callee = njit(double)
+            f = make_caller(callee)
+            self.assertEqual(f(2), 5)
+            # Identical callee
+            other_callee = njit(double)
+            self.assertEqual(other_callee(2), 4)
+            self.assertIs(self.overload(other_callee), self.overload(callee))
+            g = make_caller(other_callee)
+            self.assertEqual(g(2), 5)
+            self.assertIs(self.overload(g), self.overload(f))
+            # Changed callee
+            h = make_caller(njit(triple))
+            self.assertEqual(h(2), 7)
+            self.assertIsNot(self.overload(h), self.overload(f))
+
+    def test_changed_callee_options(self):
+        def div(x):
+            return 1.0 / x
+
+        with override_config('COMPILE_MEMO', 1):
+            f = make_caller(njit(error_model='python')(div))
+            with self.assertRaises(ZeroDivisionError):
+                f(0.0)
+            # Only the callee's options differ
+            g = make_caller(njit(error_model='numpy')(div))
+            self.assertEqual(g(0.0), np.inf)
+            self.assertIsNot(self.overload(g), self.overload(f))
+
+    def test_unhashable_content(self):
+        lock = threading.Lock()
+
+        @njit
+        def f(x):
+            lock
+            return x
+
+        with override_config('COMPILE_MEMO', 1):
+            self.assertIsNone(f._compile_memo_key((types.int64,), None))
+
+
 class TestVectorizeDifferentTargets(unittest.TestCase):
     """Test that vectorize can be reapplied if the target is different
     """
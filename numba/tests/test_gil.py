@@ -180,5 +180,56 @@ class TestGILRelease(TestCase):
         self.run_in_threads(cfunc, 2)
 
 
+def scaling_kernel(a, n):
+    # A few tens of microseconds of work on a small array
+    res = 0.0
+    for i in range(n):
+        for x in a:
+            res += (x * i) % 7.0
+    return res
+
+
+class TestGILScaling(TestCase):
+    """
+    Check concurrent calls to a nogil function from Python threads, which
+    only hold the GIL for the dispatch, argument unboxing and result boxing.
+    """
+
+    # Runs many threads, don't compete with other tests
+    _numba_parallel_test_ = False
+
+    def check_concurrent_calls(self, func, args):
+        expected = func(*args)
+        n_threads = min(os.cpu_count() or 1, 8) * 2
+        n_calls = 200
+        barrier = threading.Barrier(n_threads)
+        results = [[] for _ in range(n_threads)]
+
+        def worker(res):
+            barrier.wait()
+            for _ in range(n_calls):
+                res.append(func(*args))
+
+        threads = [threading.Thread(target=worker, args=(res,))
+                   for res in results]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for res in results:
+            self.assertEqual(res, [expected] * n_calls)
+
+    @TestCase.run_test_in_subprocess
+    def test_nogil_call_concurrent(self):
+        cfunc = jit(nopython=True, nogil=True)(scaling_kernel)
+        self.check_concurrent_calls(cfunc, (np.arange(50.0), 20))
+
+    @TestCase.run_test_in_subprocess
+    def test_bound_nogil_call_concurrent(self):
+        cfunc = jit(nopython=True, nogil=True)(scaling_kernel)
+        bound = cfunc.bind("float64(float64[::1], intp)")
+        self.check_concurrent_calls(bound, (np.arange(50.0), 20))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -776,6 +776,17 @@ class TestUnboxing(MemoryLeakMixin, TestCase):
         check([1, 2])
         check([1j, 2.5j])
 
+    def test_mixed_scalar_types(self):
+        # Items of another Python type but the same Numba type are accepted
+        check = self.check_unary(unbox_usecase)
+        check([1.5, np.float64(2.5), 3.5])
+        check([True, np.bool_(False)])
+        check([np.int64(1), 2, 3])
+        # Out-of-range integers can't be unboxed
+        cfunc = jit(nopython=True)(unbox_usecase)
+        with self.assertRaises(OverflowError):
+            cfunc([1, 2 ** 63])
+
     def test_tuples(self):
         check = self.check_unary(unbox_usecase2)
         check([(1, 2), (3, 4)])
@@ -264,14 +264,11 @@ class TestNumThreads(TestCase):
             self.check_mask(mask, out)
             self.check_mask(mask, len(np.unique(x)))
 
-    # this test can only run on OpenMP (providing OMP_MAX_ACTIVE_LEVELS is not
-    # set or >= 2) and TBB backends
+    # on OpenMP this test needs OMP_MAX_ACTIVE_LEVELS to be unset or >= 2,
+    # workqueue runs the nested regions serially
     @skip_parfors_unsupported
     @unittest.skipIf(config.NUMBA_NUM_THREADS < 2, "Not enough CPU cores")
     def _test_nested_parallelism_1(self):
-        if threading_layer() == 'workqueue':
-            self.skipTest("workqueue is not threadsafe")
-
         # check that get_num_threads is ok in nesting
         mask = config.NUMBA_NUM_THREADS - 1
 
@@ -353,14 +350,11 @@ class TestNumThreads(TestCase):
                 math_arr[i, :] = i
             np.testing.assert_equal(math_arr, got_arr)
 
-    # this test can only run on OpenMP (providing OMP_MAX_ACTIVE_LEVELS is not
-    # set or >= 2) and TBB backends
+    # on OpenMP this test needs OMP_MAX_ACTIVE_LEVELS to be unset or >= 2,
+    # workqueue runs the nested regions serially
     @skip_parfors_unsupported
     @unittest.skipIf(config.NUMBA_NUM_THREADS < 2, "Not enough CPU cores")
     def _test_nested_parallelism_2(self):
-        if threading_layer() == 'workqueue':
-            self.skipTest("workqueue is not threadsafe")
-
         # check that get_num_threads is ok in nesting
 
         N = config.NUMBA_NUM_THREADS + 1
@@ -464,7 +458,7 @@ class TestNumThreads(TestCase):
     @unittest.skipIf(config.NUMBA_NUM_THREADS < 3, "Not enough CPU cores")
     def _test_nested_parallelism_3(self):
         if threading_layer() == 'workqueue':
-            self.skipTest("workqueue is not threadsafe")
+            self.skipTest("workqueue runs nested regions serially")
 
         # check that the right number of threads are present in nesting
         # this relies on there being a load of cores present
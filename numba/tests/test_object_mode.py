@@ -6,10 +6,11 @@ Testing object mode specifics.
 import numpy as np
 
 import unittest
-from numba import jit, types
+from numba import jit, njit, objmode, types
 from numba.core import utils
+from numba.core.withcontexts import call_context
 from numba.core.utils import PYVERSION
-from numba.tests.support import TestCase
+from numba.tests.support import TestCase, override_config
 
 
 def complex_constant(n):
@@ -39,6 +40,27 @@ def array_of_object(x):
     return x
 
 
+def lifted_loop_usecase(n):
+    obj = object()
+    acc = 0
+    for i in range(n):
+        acc += i
+    return acc, obj
+
+
+def objmode_block_usecase(x, lst):
+    with objmode(y='intp'):
+        y = len(str(x))
+    return y + len(lst)
+
+
+def lifted_with_usecase(x, st):
+    y = len(st)
+    with call_context:
+        y += x
+    return y
+
+
 class TestObjectMode(TestCase):
 
     def test_complex_constant(self):
@@ -210,5 +232,70 @@ class TestObjectModeInvalidRewrite(TestCase):
         self.assertEqual(lifted.signatures, [(types.Tuple(()),)])
 
 
+class TestObjectModeReport(TestCase):
+
+    def check_line(self, region, source):
+        with open(region.filename) as f:
+            lines = f.readlines()
+        self.assertIn(source, lines[region.line - 1])
+
+    def check_lifted_loop(self, count_calls):
+        with override_config('COUNT_OBJMODE_CALLS', count_calls):
+            cfunc = jit(forceobj=True)(lifted_loop_usecase)
+            for _ in range(3):
+                cfunc(5)
+        func, loop = cfunc.object_mode_report()
+        self.assertEqual(func.kind, 'function')
+        self.assertEqual(func.qualname, 'lifted_loop_usecase')
+        self.assertTrue(func.objectmode)
+        self.check_line(func, 'def lifted_loop_usecase')
+        self.assertEqual(func.calls, 3 if count_calls else None)
+        self.assertEqual(loop.kind, 'lifted_loop')
+        self.assertFalse(loop.objectmode)
+        self.assertIsNone(loop.calls)
+        self.check_line(loop, 'for i in range(n)')
+
+    def test_lifted_loop(self):
+        self.check_lifted_loop(False)
+
+    def test_lifted_loop_call_counts(self):
+        self.check_lifted_loop(True)
+
+    def test_objmode_block_and_reflected_list(self):
+        with override_config('COUNT_OBJMODE_CALLS', True):
+            cfunc = njit(objmode_block_usecase)
+            for _ in range(4):
+                cfunc(12, [1, 2])
+        sig = cfunc.signatures[0]
+        report = cfunc.object_mode_report(sig)
+        self.assertEqual([r.kind for r in report],
+                         ['reflected_list', 'objmode_block'])
+        reflected, block = report
+        self.assertEqual(reflected.detail, "argument 'lst'")
+        self.assertFalse(reflected.objectmode)
+        self.assertEqual(reflected.signature, cfunc.overloads[sig].signature)
+        self.assertEqual(block.calls, 4)
+        self.assertTrue(block.objectmode)
+        self.check_line(block, 'with objmode')
+
+    def test_lifted_with_and_reflected_set(self):
+        cfunc = njit(lifted_with_usecase)
+        self.assertEqual(cfunc(3, {1, 2}), 5)
+        report = cfunc.object_mode_report()
+        self.assertEqual([r.kind for r in report],
+                         ['reflected_set', 'lifted_with'])
+        reflected, block = report
+        self.assertEqual(reflected.detail, "argument 'st'")
+        self.assertFalse(block.objectmode)
+        self.assertIsNotNone(block.signature)
+        self.assertIsNone(block.calls)
+        self.check_line(block, 'with call_context')
+
+    def test_nopython(self):
+        cfunc = njit(array_of_object)
+        cfunc(np.arange(3))
+        self.assertEqual(cfunc.object_mode_report(), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,6 +14,7 @@ import sys
 import textwrap
 import threading
 import unittest
+from unittest import mock
 
 import numpy as np
 
@@ -655,12 +656,142 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
         env['NUMBA_NUM_THREADS'] = "1"
         self.run_cmd(cmdline, env=env)
 
-    def test_workqueue_aborts_on_nested_parallelism(self):
+    def test_parallel_min_iterations(self):
         """
-        Tests workqueue raises sigabrt if a nested parallel call is performed
+        Tests parallel regions with fewer iterations than
+        NUMBA_PARALLEL_MIN_ITERATIONS run serially on the calling thread and
+        larger ones still run in parallel.
         """
         runme = """if 1:
-            from numba import njit, prange
+            from numba import njit, prange, get_thread_id, threading_layer
+            import numpy as np
+
+            @njit(parallel=True)
+            def foo(n):
+                tids = np.zeros(n, dtype=np.int64)
+                acc = 0
+                for i in prange(n):
+                    tids[i] = get_thread_id()
+                    acc += i
+                return acc, tids
+
+            acc, tids = foo(63)
+            assert acc == 63 * 62 // 2, acc
+            assert np.all(tids == 0), tids
+            acc, tids = foo(64)
+            assert acc == 64 * 63 // 2, acc
+            assert len(np.unique(tids)) {distinct}, np.unique(tids)
+            acc, tids = foo(0)
+            assert acc == 0, acc
+            assert threading_layer() == "{layer}", threading_layer()
+        """
+        backends = ['workqueue']
+        if _HAVE_OMP_POOL:
+            backends.append('omp')
+        if _HAVE_TBB_POOL:
+            backends.append('tbb')
+        for backend in backends:
+            with self.subTest(backend=backend):
+                # TBB's partitioner may run several schedule entries on the
+                # same arena thread, so only check that more than one ran
+                distinct = '> 1' if backend == 'tbb' else '== 4'
+                cmdline = [sys.executable, '-c',
+                           runme.format(layer=backend, distinct=distinct)]
+                env = os.environ.copy()
+                env['NUMBA_THREADING_LAYER'] = backend
+                env['NUMBA_NUM_THREADS'] = "4"
+                env['NUMBA_PARALLEL_MIN_ITERATIONS'] = "64"
+                out, err = self.run_cmd(cmdline, env=env)
+                if self._DEBUG:
+                    print(out, err)
+
+    def test_parallel_schedules(self):
+        """
+        Tests the dynamic and guided schedules on each threading layer, with
+        various chunk sizes and thread counts.
+        """
+        runme = """if 1:
+            from numba import (njit, prange, threading_layer, set_num_threads,
+                               parallel_chunksize)
+            import numpy as np
+
+            def reduce_and_write(a, res):
+                s = 0.0
+                for i in prange(a.shape[0]):
+                    # Count the visits to check that each iteration runs once
+                    res[i] += a[i]
+                    s += a[i]
+                return s
+
+            for schedule in ('dynamic', 'guided'):
+                cfunc = njit(parallel={{'schedule': schedule}})(
+                    reduce_and_write)
+                for nthreads in (4, 2):
+                    set_num_threads(nthreads)
+                    for n in (0, 1, 7, 997):
+                        for cs in (0, 1, 13):
+                            a = np.arange(n, dtype=np.float64)
+                            res = np.zeros(n)
+                            with parallel_chunksize(cs):
+                                s = cfunc(a, res)
+                            assert s == a.sum(), (schedule, n, cs, s)
+                            assert np.all(res == a), (schedule, n, cs, res)
+            assert threading_layer() == "{}", threading_layer()
+        """
+        backends = ['workqueue']
+        if _HAVE_OMP_POOL:
+            backends.append('omp')
+        if _HAVE_TBB_POOL:
+            backends.append('tbb')
+        for backend in backends:
+            with self.subTest(backend=backend):
+                cmdline = [sys.executable, '-c', runme.format(backend)]
+                env = os.environ.copy()
+                env['NUMBA_THREADING_LAYER'] = backend
+                env['NUMBA_NUM_THREADS'] = "4"
+                out, err = self.run_cmd(cmdline, env=env)
+                if self._DEBUG:
+                    print(out, err)
+
+    def test_workqueue_spin_count(self):
+        """
+        Tests workqueue gives correct results with idle threads spinning
+        before they park.
+        """
+        runme = """if 1:
+            from numba import njit, prange, threading_layer
+            import numpy as np
+
+            @njit(parallel=True)
+            def foo(x):
+                acc = 0.
+                for i in prange(x.size):
+                    acc += x[i]
+                return acc
+
+            x = np.arange(1000.)
+            for i in range(200):
+                assert foo(x) == x.sum()
+            assert threading_layer() == "workqueue", threading_layer()
+        """
+        cmdline = [sys.executable, '-c', runme]
+        env = os.environ.copy()
+        env['NUMBA_THREADING_LAYER'] = "workqueue"
+        env['NUMBA_NUM_THREADS'] = "4"
+        env['NUMBA_WORKQUEUE_SPIN_COUNT'] = "1000"
+        out, err = self.run_cmd(cmdline, env=env)
+        if self._DEBUG:
+            print(out, err)
+
+    def test_workqueue_nested_parallelism(self):
+        """
+        Tests workqueue runs nested parallel regions serially on the calling
+        worker, through several levels of nesting and with thread masks set
+        inside the enclosing region.
+        """
+        runme = """if 1:
+            from numba import njit, prange, set_num_threads, get_num_threads
+            from numba import threading_layer
             import numpy as np
 
             @njit(parallel=True)
@@ -668,7 +799,6 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
                 for i in prange(len(x)):
                     x[i] += 1
 
-
             @njit(parallel=True)
             def main():
                 Z = np.zeros((5, 10))
@@ -676,25 +806,59 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
                     nested(Z[i])
                 return Z
 
-            main()
+            @njit(parallel=True)
+            def level3(x):
+                acc = 0
+                for i in prange(len(x)):
+                    acc += x[i]
+                return acc
+
+            @njit(parallel=True)
+            def level2(x):
+                out = np.zeros(x.shape[0])
+                for i in prange(x.shape[0]):
+                    out[i] = level3(x[i])
+                return out
+
+            @njit(parallel=True)
+            def level1(x):
+                out = np.zeros(x.shape[0])
+                for i in prange(x.shape[0]):
+                    out[i] = level2(x[i]).sum()
+                return out
+
+            @njit(parallel=True)
+            def masked(n):
+                out = np.zeros((n, 2), dtype=np.int64)
+                for i in prange(n):
+                    set_num_threads(2)
+                    acc = 0
+                    for j in prange(10):
+                        acc += j
+                    out[i, 0] = acc
+                    out[i, 1] = get_num_threads()
+                return out
+
+            Z = main()
+            assert threading_layer() == "workqueue", threading_layer()
+            np.testing.assert_equal(Z, np.ones((5, 10)))
+
+            X = np.arange(4 * 3 * 7.).reshape((4, 3, 7))
+            np.testing.assert_equal(level1(X), X.sum(axis=(1, 2)))
+
+            set_num_threads(3)
+            M = masked(12)
+            np.testing.assert_equal(M[:, 0], 45)
+            np.testing.assert_equal(M[:, 1], 2)
+            assert get_num_threads() == 3
         """
         cmdline = [sys.executable, '-c', runme]
         env = os.environ.copy()
         env['NUMBA_THREADING_LAYER'] = "workqueue"
         env['NUMBA_NUM_THREADS'] = "4"
-
-        try:
-            out, err = self.run_cmd(cmdline, env=env)
-        except AssertionError as e:
-            if self._DEBUG:
-                print(out, err)
-            e_msg = str(e)
-            self.assertIn("failed with code", e_msg)
-            # raised a SIGABRT, but the value is platform specific so just check
-            # the error message
-            expected = ("Numba workqueue threading layer is terminating: "
-                        "Concurrent access has been detected.")
-            self.assertIn(expected, e_msg)
+        out, err = self.run_cmd(cmdline, env=env)
+        if self._DEBUG:
+            print(out, err)
 
     @unittest.skipUnless(_HAVE_OS_FORK, "Test needs fork(2)")
     def test_workqueue_handles_fork_from_non_main_thread(self):
@@ -738,6 +902,116 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
         self.run_cmd(cmdline, env=env)
 
 
+class TestThreadAffinity(ThreadLayerTestHelper):
+    """
+    Checks the placement of the threads from NUMBA_THREAD_AFFINITY
+    """
+    _DEBUG = False
+
+    # Two packages of two cores with two hardware threads each, numbered the
+    # way Linux usually does
+    _topology = {0: (0, 0), 1: (0, 1), 2: (1, 0), 3: (1, 1),
+                 4: (0, 0), 5: (0, 1), 6: (1, 0), 7: (1, 1)}
+
+    def get_thread_affinity(self, spec, num_threads):
+        from numba.np.ufunc import parallel
+        with mock.patch.object(parallel, '_available_cpus',
+                               lambda: list(range(8))), \
+                mock.patch.object(parallel, '_cpu_topology',
+                                  self._topology.__getitem__):
+            return parallel._get_thread_affinity(spec, num_threads)
+
+    def test_unset(self):
+        self.assertIsNone(self.get_thread_affinity('', 4))
+
+    def test_compact(self):
+        self.assertEqual(self.get_thread_affinity('compact', 8),
+                         [0, 4, 1, 5, 2, 6, 3, 7])
+        self.assertEqual(self.get_thread_affinity('Compact', 10),
+                         [0, 4, 1, 5, 2, 6, 3, 7, 0, 4])
+
+    def test_scatter(self):
+        self.assertEqual(self.get_thread_affinity('scatter', 8),
+                         [0, 2, 1, 3, 4, 6, 5, 7])
+        self.assertEqual(self.get_thread_affinity('scatter', 2), [0, 2])
+
+    def test_explicit(self):
+        self.assertEqual(self.get_thread_affinity('0,2,4-6', 6),
+                         [0, 2, 4, 5, 6, 0])
+        self.assertEqual(self.get_thread_affinity(' 7 ', 2), [7, 7])
+
+    def test_invalid(self):
+        for spec in ('0,a', '1-2-3', '-1', 'compactish'):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError) as raises:
+                    self.get_thread_affinity(spec, 2)
+                self.assertIn(repr(spec), str(raises.exception))
+        with self.assertRaises(ValueError) as raises:
+            self.get_thread_affinity('4-9', 2)
+        self.assertIn("cannot run on", str(raises.exception))
+
+    @skip_parfors_unsupported
+    @linux_only
+    def test_pinning_and_static_schedule(self):
+        """
+        Tests the worker threads are pinned and that the static schedule runs
+        the same iterations on the same threads in consecutive regions.
+        """
+        runme = """if 1:
+            import ctypes, os
+            import numpy as np
+            from numba import njit, prange, threading_layer
+
+            libc = ctypes.CDLL(None)
+            pthread_self = libc.pthread_self
+            pthread_self.restype = ctypes.c_ulong
+            pthread_self.argtypes = ()
+
+            @njit(parallel=True)
+            def first_touch(n):
+                out = np.empty(n, dtype=np.uint64)
+                for i in prange(n):
+                    out[i] = pthread_self()
+                return out
+
+            @njit(parallel=True)
+            def compute(x):
+                out = np.empty_like(x)
+                for i in prange(x.size):
+                    out[i] = pthread_self()
+                return out
+
+            main_affinity = os.sched_getaffinity(0)
+            cpu = min(main_affinity)
+            expected = first_touch(1000)
+            assert len(np.unique(expected)) == 4, np.unique(expected)
+            for _ in range(10):
+                np.testing.assert_equal(compute(expected), expected)
+                np.testing.assert_equal(first_touch(1000), expected)
+
+            pinned = [tid for tid in os.listdir('/proc/self/task')
+                      if os.sched_getaffinity(int(tid)) == {cpu}]
+            # workqueue pins its 4 workers, the others the 3 workers that are
+            # not the calling thread
+            assert len(pinned) >= 3, pinned
+            assert os.sched_getaffinity(0) == main_affinity
+            assert threading_layer() == "%s", threading_layer()
+        """
+        backends = ['workqueue']
+        if _HAVE_OMP_POOL:
+            backends.append('omp')
+        for backend in backends:
+            with self.subTest(backend=backend):
+                cmdline = [sys.executable, '-c', runme % backend]
+                env = os.environ.copy()
+                env['NUMBA_THREADING_LAYER'] = backend
+                env['NUMBA_NUM_THREADS'] = "4"
+                env['NUMBA_THREAD_AFFINITY'] = str(min(os.sched_getaffinity(0)))
+                out, err = self.run_cmd(cmdline, env=env)
+                if self._DEBUG:
+                    print(out, err)
+
+
 # 32bit or windows py27 (not that this runs on windows)
 @skip_parfors_unsupported
 @skip_unless_gnu_omp
@@ -1014,6 +1014,77 @@ class TestParforNumPy(TestParforsBase):
         self.check_variants(test_impl, data_gen)
         self.count_parfors_variants(test_impl, data_gen)
 
+    def test_cumsum(self):
+        def test_impl1(A):
+            return A.cumsum()
+
+        def test_impl2(A):
+            return np.cumsum(A)
+
+        N = 1001
+        A = np.random.ranf(N)
+        B = np.random.randint(10, size=(N, 3))
+        C = A + 1j * A
+        D = np.arange(3.)  # fewer elements than threads
+        E = np.empty(0)
+        for impl in (test_impl1, test_impl2):
+            self.check(impl, A)
+            self.check(impl, B)
+            self.check(impl, C)
+            self.check(impl, D)
+            self.check(impl, E)
+            self.check(impl, B.T)
+            self.check(impl, A[::3])
+            argty = (types.Array(types.float64, 1, 'C'),)
+            self.assertEqual(countParfors(impl, argty), 2)
+
+        # Test variants
+        data_gen = lambda: self.gen_linspace_variants(1)
+        self.check_variants(test_impl2, data_gen)
+        self.count_parfors_variants(test_impl2, data_gen)
+
+    def test_cumprod(self):
+        def test_impl1(A):
+            return A.cumprod()
+
+        def test_impl2(A):
+            return np.cumprod(A)
+
+        N = 101
+        # keep the running product close to 1
+        A = 1 + (np.random.ranf(N) - 0.5) / 10
+        B = np.random.randint(1, 3, size=(5, 4))
+        C = A + 0.01j * A
+        D = np.arange(1., 4.)
+        for impl in (test_impl1, test_impl2):
+            self.check(impl, A)
+            self.check(impl, B)
+            self.check(impl, C)
+            self.check(impl, D)
+            argty = (types.Array(types.float64, 1, 'C'),)
+            self.assertEqual(countParfors(impl, argty), 2)
+
+    def test_nancumsum_nancumprod(self):
+        def test_impl1(A):
+            return np.nancumsum(A)
+
+        def test_impl2(A):
+            return np.nancumprod(A)
+
+        N = 101
+        A = 1 + (np.random.ranf(N) - 0.5) / 10
+        A[::7] = np.nan
+        B = A.reshape(1, N)
+        C = np.random.randint(1, 3, size=(5, 4))
+        D = np.full(5, np.nan)
+        for impl in (test_impl1, test_impl2):
+            self.check(impl, A)
+            self.check(impl, B)
+            self.check(impl, C)
+            self.check(impl, D)
+            argty = (types.Array(types.float64, 1, 'C'),)
+            self.assertEqual(countParfors(impl, argty), 2)
+
     def test_random_parfor(self):
         """
         Test function with only a random call to make sure a random function
@@ -4682,6 +4753,68 @@ class TestParforChunksizing(TestCase):
         self.assertIn(msg, str(raised.exception))
 
 
+
+@skip_parfors_unsupported
+class TestParforScheduling(TestCase):
+    """
+    Tests the scheduling policies of the parallel option.
+    """
+    _numba_parallel_test_ = False
+
+    def compile_usecases(self, schedule):
+        @njit(parallel={'schedule': schedule})
+        def reduce_and_write(a, res):
+            s = 0.0
+            for i in prange(a.shape[0]):
+                # Count the visits to check that each iteration runs once
+                res[i] += a[i]
+                s += a[i]
+            return s
+
+        @njit(parallel={'schedule': schedule})
+        def nested_2d(m):
+            out = np.zeros_like(m)
+            for i in prange(m.shape[0]):
+                for j in prange(m.shape[1]):
+                    out[i, j] = m[i, j] * 2
+            return out
+
+        return reduce_and_write, nested_2d
+
+    def check_schedule(self, schedule):
+        reduce_and_write, nested_2d = self.compile_usecases(schedule)
+        for n in (0, 1, 7, 100, 997):
+            for cs in (0, 1, 13):
+                a = np.arange(n, dtype=np.float64)
+                res = np.zeros(n)
+                with parallel_chunksize(cs):
+                    s = reduce_and_write(a, res)
+                self.assertPreciseEqual(s, a.sum())
+                self.assertPreciseEqual(res, a)
+        m = np.arange(35.).reshape((5, 7))
+        self.assertPreciseEqual(nested_2d(m), m * 2)
+        self.assertEqual(get_parallel_chunksize(), 0)
+
+    def test_static(self):
+        self.check_schedule('static')
+
+    def test_dynamic(self):
+        self.check_schedule('dynamic')
+
+    def test_guided(self):
+        self.check_schedule('guided')
+
+    def test_invalid_schedule(self):
+        with self.assertRaises(ValueError) as raised:
+            @njit(parallel={'schedule': 'fastest'})
+            def impl(n):
+                return n
+
+            impl(1)
+
+        self.assertIn("Unrecognized parallel schedule 'fastest'",
+                      str(raised.exception))
+
 @skip_parfors_unsupported
 @x86_only
 class TestParforsVectorizer(TestPrangeBase):
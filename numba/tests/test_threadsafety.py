@@ -26,6 +26,10 @@ def gufunc_foo(a, b, out):
     out[0] = a + b
 
 
+def dispatch_foo(x):
+    return x
+
+
 
 class TestThreadSafety(unittest.TestCase):
 
@@ -92,6 +96,38 @@ class TestThreadSafety(unittest.TestCase):
                           self.run_guvectorize(nopython=True, cache=True),
                           self.run_guvectorize(nopython=True)])
 
+    def test_concurrent_dispatch(self):
+        # A single dispatcher shared by all threads: new specializations
+        # are compiled and inserted while other threads dispatch to (and
+        # populate the type caches for) the existing ones.
+        cfunc = jit(nopython=True)(dispatch_foo)
+        values = [1, 2.5, 1j, True, (1, 2.5), (1j, 2)]
+        for dtype in (np.int8, np.int32, np.float32, np.float64):
+            values.append(np.arange(4, dtype=dtype))
+            values.append(np.arange(6, dtype=dtype).reshape((2, 3)))
+            values.append(np.arange(6, dtype=dtype).reshape((2, 3)).T)
+        errors = []
+
+        def dispatcher():
+            try:
+                for _ in range(20):
+                    for value in random.sample(values, len(values)):
+                        got = cfunc(value)
+                        if isinstance(value, np.ndarray):
+                            np.testing.assert_equal(got, value)
+                        else:
+                            self.assertEqual(got, value)
+            except BaseException as e:
+                errors.append(e)
+
+        ths = [threading.Thread(target=dispatcher) for i in range(4)]
+        for th in ths:
+            th.start()
+        for th in ths:
+            th.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(cfunc.overloads), len(values))
+
 
 if __name__ == '__main__':
     unittest.main()